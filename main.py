@@ -3,27 +3,23 @@
 from __future__ import annotations
 
 import argparse
-import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple
 
+import orjson
 from dotenv import load_dotenv
 
-from src.layer1.cleaning import clean_text
-from src.layer1.deduplicator import DeduplicationConfig, deduplicate_reviews
-from src.layer1.pii_detector import PIIDetector
-from src.layer1.scraper import GrowwReviewScraper, ReviewRecord, ScraperConfig
-from src.layer1.validator import ReviewModel, validate_reviews
-from src.layer2.theme_classifier import GeminiThemeClassifier, ThemeClassifierConfig
-from src.layer2.theme_discovery import ThemeDiscovery
-from src.layer2.theme_mapper import ThemeMapper
-from src.layer2.theme_config import FIXED_THEMES
-from src.layer2.weekly_aggregator import WeeklyThemeAggregator
-from src.layer3 import Layer3Config, WeeklyPulsePipeline
-from src.layer4 import Layer4Config, WeeklyEmailPipeline
+# Layer modules pull in bs4/pydantic/google-generativeai/etc.; they are imported
+# inside the functions that use them so `--help` and arg errors stay instant.
+if TYPE_CHECKING:
+    from src.layer1.scraper import GrowwReviewScraper, ReviewRecord, ScraperConfig
+    from src.layer1.validator import ReviewModel
 
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(name)s - %(message)s")
 LOGGER = logging.getLogger("pipeline")
@@ -104,6 +100,16 @@ def parse_args() -> argparse.Namespace:
 
 
 def run_pipeline(args: Optional[argparse.Namespace] = None) -> None:
+    from src.layer1.deduplicator import DeduplicationConfig, deduplicate_reviews
+    from src.layer1.pii_detector import PIIDetector
+    from src.layer1.scraper import GrowwReviewScraper
+    from src.layer1.validator import ValidationSummary, iter_validated_reviews
+    from src.layer2.theme_classifier import ClassificationBatch, GeminiThemeClassifier, ThemeClassifierConfig
+    from src.layer2.theme_config import FIXED_THEMES
+    from src.layer2.theme_discovery import ThemeDiscovery
+    from src.layer2.theme_mapper import ThemeMapper
+    from src.layer2.weekly_aggregator import WeeklyThemeAggregator
+
     load_dotenv()
     args = args or parse_args()
     if getattr(args, "cron_tag", None):
@@ -121,54 +127,52 @@ def run_pipeline(args: Optional[argparse.Namespace] = None) -> None:
     consolidated_window = {"start_date": window_slices[0][0], "end_date": window_slices[-1][1]}
     scraper.save_reviews(raw_reviews, **consolidated_window)
 
-    validated, validation_summary = validate_reviews(raw_reviews)
-    LOGGER.info("Validated %s/%s reviews", validation_summary.accepted, validation_summary.total)
-
-    sanitized_models = [
-        model.model_copy(
-            update={
-                "title": _clean_or_fallback(model.title),
-                "text": _clean_or_fallback(model.text),
-            }
-        )
-        for model in validated
-    ]
-
+    # Validation, cleaning, PII redaction and the short-text filter run as one
+    # streaming pass feeding the deduplicator (the only stage needing global state).
+    min_text_length = 10
+    validation_summary = ValidationSummary(total=0, accepted=0, rejected=0)
     pii_detector = PIIDetector(enable_presidio=False)
-    redacted_models = [
-        model.model_copy(
-            update={
-                "title": pii_detector.redact(model.title),
-                "text": pii_detector.redact(model.text),
-            }
-        )
-        for model in sanitized_models
-    ]
+    short_dropped = 0
+
+    def _preprocess() -> Iterator[ReviewModel]:
+        nonlocal short_dropped
+        for model in iter_validated_reviews(raw_reviews, validation_summary):
+            # ReviewModel skips assignment validation, so sanitise in place.
+            model.title = pii_detector.redact(_clean_or_fallback(model.title))
+            model.text = pii_detector.redact(_clean_or_fallback(model.text))
+            if len(model.text.strip()) < min_text_length:
+                short_dropped += 1
+                continue
+            yield model
+
+    filtered_reviews, dedup_summary = deduplicate_reviews(_preprocess(), DeduplicationConfig())
+    # Release the memoised title/text strings now that sanitisation is done.
+    _clean_or_fallback.cache_clear()
+    pii_detector.clear_cache()
 
-    deduped, dedup_summary = deduplicate_reviews(redacted_models, DeduplicationConfig())
+    LOGGER.info("Validated %s/%s reviews", validation_summary.accepted, validation_summary.total)
+    if short_dropped:
+        LOGGER.info("Filtered out %s reviews with text length < %s characters", short_dropped, min_text_length)
     LOGGER.info("Deduplicated reviews: kept=%s dropped=%s", dedup_summary.kept, dedup_summary.dropped)
 
-    # Filter out extremely short/empty reviews for Layer 2
-    min_text_length = 10
-    filtered_reviews = [r for r in deduped if len(r.text.strip()) >= min_text_length]
-    if len(filtered_reviews) < len(deduped):
-        dropped = len(deduped) - len(filtered_reviews)
-        LOGGER.info("Filtered out %s reviews with text length < %s characters", dropped, min_text_length)
-
     if len(filtered_reviews) == 0:
         LOGGER.warning("No reviews remaining after filtering; skipping Layer 2.")
         return
 
+    processed_dir = Path("data/processed")
+    processed_dir.mkdir(parents=True, exist_ok=True)
+
     # Theme Discovery Phase (before classification)
     discovered_themes = None
-    use_discovery = _env_bool("THEME_DISCOVERY_ENABLED", False)
+    env = _env()
+    use_discovery = env.theme_discovery_enabled
     
     if use_discovery:
         try:
             discovery = ThemeDiscovery()
             mapper = ThemeMapper(FIXED_THEMES)
             
-            sample_size = int(os.getenv("THEME_DISCOVERY_SAMPLE_SIZE", "50"))
+            sample_size = env.theme_discovery_sample_size
             LOGGER.info("Discovering themes from %s reviews (sample size: %s)...", len(filtered_reviews), sample_size)
             
             discovered_raw = discovery.discover_themes(filtered_reviews, sample_size=sample_size)
@@ -194,8 +198,6 @@ def run_pipeline(args: Optional[argparse.Namespace] = None) -> None:
                 LOGGER.info("Discovered %s themes", len(discovered_themes))
                 
                 # Save discovered themes for analysis
-                processed_dir = Path("data/processed")
-                processed_dir.mkdir(parents=True, exist_ok=True)
                 discovery.save_discovered_themes(
                     discovered_themes,
                     processed_dir / "discovered_themes.json"
@@ -208,25 +210,47 @@ def run_pipeline(args: Optional[argparse.Namespace] = None) -> None:
 
     # Layer 2: LLM-based theme classification
     classifier_config = ThemeClassifierConfig(
-        batch_size=int(os.getenv("THEME_CLASSIFIER_BATCH_SIZE", "8")),
-        temperature=float(os.getenv("THEME_CLASSIFIER_TEMPERATURE", "0.1")),
+        batch_size=env.theme_classifier_batch_size,
+        temperature=env.theme_classifier_temperature,
+        cache_path=env.theme_classifier_cache_path,
+        response_cache_path=env.layer2_cache_path,
         use_discovery=use_discovery and discovered_themes is not None,
-        discovery_sample_size=int(os.getenv("THEME_DISCOVERY_SAMPLE_SIZE", "50")),
-        min_discovery_confidence=float(os.getenv("THEME_DISCOVERY_MIN_CONFIDENCE", "0.6")),
-        max_discovered_themes=int(os.getenv("THEME_DISCOVERY_MAX_THEMES", "4")),
+        discovery_sample_size=env.theme_discovery_sample_size,
+        min_discovery_confidence=env.theme_discovery_min_confidence,
+        max_discovered_themes=env.theme_discovery_max_themes,
+        max_concurrency=env.gemini_max_parallel,
+        requests_per_minute=env.gemini_requests_per_minute,
+        max_output_tokens_per_review=env.gemini_max_output_tokens_per_review,
+        use_async=env.gemini_use_async,
+        batch_mode=env.gemini_batch_mode,
+        stream_responses=env.gemini_stream_responses,
+        parallel_models=env.gemini_parallel_models,
+        heuristic_prefilter=env.theme_heuristic_prefilter,
+        self_consistency_samples=env.theme_self_consistency_samples,
     )
+    embedder = None
+    if env.theme_semantic_cache:
+        # sentence-transformers is heavy; only load it when the semantic cache is on.
+        from src.layer2.embeddings import EmbeddingService
+
+        embedder = EmbeddingService()
     classifier = GeminiThemeClassifier(
         config=classifier_config,
-        discovered_themes=discovered_themes
+        discovered_themes=discovered_themes,
+        embedder=embedder,
     )
     
     theme_mode = "discovered" if (use_discovery and discovered_themes) else "predefined"
     LOGGER.info("Classifying %s reviews into %s themes...", len(filtered_reviews), theme_mode)
-    classifications = classifier.classify_reviews(filtered_reviews)
+    try:
+        # Kept column-wise from here on: aggregation and the dump only need the four fields.
+        classifications = ClassificationBatch.from_classifications(classifier.classify_reviews(filtered_reviews))
+        llm_themes = classifier.get_llm_suggested_themes()
+    finally:
+        classifier.close()
     LOGGER.info("Classified %s reviews", len(classifications))
 
     # Save LLM-suggested themes
-    llm_themes = classifier.get_llm_suggested_themes()
     if llm_themes:
         LOGGER.info("LLM suggested %s new themes", len(llm_themes))
         llm_themes_data = {
@@ -241,35 +265,31 @@ def run_pipeline(args: Optional[argparse.Namespace] = None) -> None:
                 for theme in llm_themes.values()
             ]
         }
-        processed_dir = Path("data/processed")
-        processed_dir.mkdir(parents=True, exist_ok=True)
-        with (processed_dir / "llm_suggested_themes.json").open("w", encoding="utf-8") as fh:
-            json.dump(llm_themes_data, fh, indent=2, ensure_ascii=False)
+        _write_json_atomic(processed_dir / "llm_suggested_themes.json", llm_themes_data)
         LOGGER.info("Saved LLM-suggested themes to llm_suggested_themes.json")
 
     # Aggregate by week
-    output_dir = Path(os.getenv("SCRAPER_OUTPUT_DIR", "data/raw"))
+    output_dir = env.scraper_output_dir
     weekly_dir = _resolve_weekly_dir(args, output_dir)
     aggregator = WeeklyThemeAggregator()
     aggregation_result = aggregator.aggregate(filtered_reviews, classifications, weekly_dir)
 
     # Save results
-    processed_dir = Path("data/processed")
-    processed_dir.mkdir(parents=True, exist_ok=True)
     aggregator.save_aggregation(aggregation_result, processed_dir / "theme_aggregation.json")
 
-    # Also save classifications for reference
-    classifications_data = [
-        {
-            "review_id": c.review_id,
-            "theme_id": c.theme_id,
-            "theme_name": c.theme_name,
-            "reason": c.reason,
-        }
-        for c in classifications
-    ]
-    with (processed_dir / "review_classifications.json").open("w", encoding="utf-8") as fh:
-        json.dump(classifications_data, fh, ensure_ascii=False, indent=2)
+    # Also save classifications for reference (streamed, one record per line)
+    _write_json_array_atomic(
+        processed_dir / "review_classifications.json",
+        (
+            {"review_id": review_id, "theme_id": theme_id, "theme_name": theme_name, "reason": reason}
+            for review_id, theme_id, theme_name, reason in zip(
+                classifications.review_ids,
+                classifications.theme_ids,
+                classifications.theme_names,
+                classifications.reasons,
+            )
+        ),
+    )
 
     LOGGER.info(
         "Theme aggregation complete. Top themes: %s",
@@ -280,55 +300,48 @@ def run_pipeline(args: Optional[argparse.Namespace] = None) -> None:
     notes = _run_layer3(weekly_dir, processed_dir)
 
     # Layer 4: Email drafting/sending
-    email_single_latest = getattr(args, "email_single_latest", False) or _env_bool(
-        "EMAIL_SINGLE_LATEST", False
-    )
+    email_single_latest = getattr(args, "email_single_latest", False) or env.email_single_latest
     _run_layer4(notes, email_single_latest=email_single_latest)
 
 
 def _build_scraper_config(args: argparse.Namespace) -> ScraperConfig:
-    output_dir = Path(os.getenv("SCRAPER_OUTPUT_DIR", "data/raw"))
+    from src.layer1.scraper import ScraperConfig
+
+    env = _env()
+    output_dir = env.scraper_output_dir
     weekly_dir = _resolve_weekly_dir(args, output_dir)
-    headless = _env_bool("PLAYWRIGHT_HEADLESS", True)
+    headless = env.playwright_headless
     if getattr(args, "headed", False):
         headless = False
 
-    fallback_env = os.getenv("PLAY_STORE_SORT_FALLBACKS", "")
     fallback_modes = tuple(
         mode.strip()
-        for mode in fallback_env.split(",")
+        for mode in env.sort_fallbacks.split(",")
         if mode.strip()
     )
-    enable_filters = _env_bool("SCRAPER_ENABLE_RATING_FILTERS", False)
+    enable_filters = env.scraper_enable_rating_filters
     if getattr(args, "enable_rating_filters", False):
         enable_filters = True
     if getattr(args, "disable_rating_filters", False):
         enable_filters = False
-    rating_order_value = getattr(args, "rating_filter_order", None) or os.getenv(
-        "SCRAPER_RATING_FILTER_SEQUENCE"
-    )
+    rating_order_value = getattr(args, "rating_filter_order", None) or env.scraper_rating_filter_sequence
     rating_order = _parse_rating_sequence(rating_order_value) if rating_order_value else None
 
     return ScraperConfig(
-        app_id=getattr(args, "app_id", None) or os.getenv("PLAY_STORE_APP_ID", "com.nextbillion.groww"),
-        locale=getattr(args, "locale", None) or os.getenv("PLAY_STORE_LOCALE", "en"),
-        country=getattr(args, "country", None) or os.getenv("PLAY_STORE_COUNTRY", "in"),
-        lookback_days=getattr(args, "lookback_days", None)
-        or int(os.getenv("REVIEW_LOOKBACK_DAYS", "28")),
-        min_offset_days=getattr(args, "min_offset_days", None)
-        or int(os.getenv("REVIEW_MIN_OFFSET_DAYS", "7")),
-        max_reviews=getattr(args, "max_reviews", None) or int(os.getenv("SCRAPER_MAX_REVIEWS", "2000")),
-        max_scroll_iterations=getattr(args, "max_scrolls", None)
-        or int(os.getenv("SCRAPER_MAX_SCROLLS", "1000")),
-        scroll_wait_ms=getattr(args, "scroll_wait_ms", None)
-        or int(os.getenv("SCRAPER_SCROLL_WAIT_MS", "1500")),
-        per_rating_target=getattr(args, "per_rating_target", None)
-        or int(os.getenv("SCRAPER_PER_RATING_TARGET", "20")),
+        app_id=getattr(args, "app_id", None) or env.play_store_app_id,
+        locale=getattr(args, "locale", None) or env.play_store_locale,
+        country=getattr(args, "country", None) or env.play_store_country,
+        lookback_days=getattr(args, "lookback_days", None) or env.review_lookback_days,
+        min_offset_days=getattr(args, "min_offset_days", None) or env.review_min_offset_days,
+        max_reviews=getattr(args, "max_reviews", None) or env.scraper_max_reviews,
+        max_scroll_iterations=getattr(args, "max_scrolls", None) or env.scraper_max_scrolls,
+        scroll_wait_ms=getattr(args, "scroll_wait_ms", None) or env.scraper_scroll_wait_ms,
+        per_rating_target=getattr(args, "per_rating_target", None) or env.scraper_per_rating_target,
         output_dir=output_dir,
         weekly_output_dir=weekly_dir,
         headless=headless,
-        playwright_browser=getattr(args, "browser", None) or os.getenv("PLAYWRIGHT_BROWSER", "chromium"),
-        sort_mode=getattr(args, "sort_mode", None) or os.getenv("PLAY_STORE_SORT_MODE", "newest"),
+        playwright_browser=getattr(args, "browser", None) or env.playwright_browser,
+        sort_mode=getattr(args, "sort_mode", None) or env.play_store_sort_mode,
         fallback_sort_modes=fallback_modes,
         enable_rating_filters=enable_filters,
         rating_filter_order=rating_order or (5, 4, 3, 2, 1),
@@ -338,7 +351,7 @@ def _build_scraper_config(args: argparse.Namespace) -> ScraperConfig:
 def _resolve_weekly_dir(args: argparse.Namespace, output_dir: Path) -> Path:
     if getattr(args, "weekly_output_dir", None):
         return Path(args.weekly_output_dir)
-    weekly_env = os.getenv("SCRAPER_WEEKLY_DIR")
+    weekly_env = _env().scraper_weekly_dir
     if weekly_env:
         return Path(weekly_env)
     return output_dir / "weekly"
@@ -357,14 +370,16 @@ def _build_window_slices(args: argparse.Namespace, config: ScraperConfig) -> Lis
         start_date=start_override,
         end_date=end_override,
     )
-    slice_days = getattr(args, "slice_days", None) or int(os.getenv("SCRAPER_SLICE_DAYS", "7"))
+    slice_days = getattr(args, "slice_days", None) or _env().scraper_slice_days
     slice_days = max(1, slice_days)
     return _split_into_slices(window_start, window_end, slice_days=slice_days)
 
 
 def _run_layer3(weekly_dir: Path, processed_dir: Path):
+    from src.layer3 import Layer3Config, WeeklyPulsePipeline
+
     try:
-        layer3_output_dir = Path(os.getenv("LAYER3_OUTPUT_DIR", "data/processed/weekly_pulse"))
+        layer3_output_dir = _env().layer3_output_dir
         layer3_config = Layer3Config(
             weekly_dir=weekly_dir,
             classifications_path=processed_dir / "review_classifications.json",
@@ -383,6 +398,8 @@ def _run_layer3(weekly_dir: Path, processed_dir: Path):
 
 
 def _run_layer4(notes, email_single_latest: bool = False) -> None:
+    from src.layer4 import Layer4Config, WeeklyEmailPipeline
+
     if not notes:
         LOGGER.warning("Skipping Layer 4 (no weekly notes). Email will not be sent.")
         return
@@ -440,34 +457,67 @@ def _parse_rating_sequence(raw: str) -> Tuple[int, ...]:
 
 def _split_into_slices(start: datetime, end: datetime, slice_days: int = 7) -> List[tuple[datetime, datetime]]:
     """Split a window into evenly sized slices (default weekly)."""
-    slices: List[tuple[datetime, datetime]] = []
-    cursor = start
-    step = timedelta(days=slice_days - 1)
-    while cursor <= end:
-        slice_end = min(cursor + step, end)
-        slices.append((cursor, slice_end))
-        cursor = slice_end + timedelta(days=1)
-    return slices
+    if start > end:
+        return []
+    count = (end - start).days // slice_days + 1
+    return [
+        (
+            start + timedelta(days=idx * slice_days),
+            min(start + timedelta(days=(idx + 1) * slice_days - 1), end),
+        )
+        for idx in range(count)
+    ]
 
 
 def _fetch_multi_window(
     scraper: GrowwReviewScraper,
     window_slices: List[tuple[datetime, datetime]],
 ) -> List[ReviewRecord]:
-    combined: dict[str, ReviewRecord] = {}
-    for idx, (start, end) in enumerate(window_slices, start=1):
-        LOGGER.info("Fetching slice %s/%s: %s -> %s", idx, len(window_slices), start.date(), end.date())
-        segment = scraper.fetch_reviews(start_date=start, end_date=end)
+    """Fetch every slice (concurrently when allowed) and union them by review id."""
+    from src.layer1.scraper import GrowwReviewScraper
+
+    max_parallel = _env().scraper_max_parallel
+    total = len(window_slices)
+
+    def _fetch_slice(indexed: tuple[int, tuple[datetime, datetime]]) -> List[ReviewRecord]:
+        idx, (start, end) = indexed
+        LOGGER.info("Fetching slice %s/%s: %s -> %s", idx, total, start.date(), end.date())
+        # Each worker gets its own scraper so HTTP sessions are never shared across threads.
+        worker = scraper if max_parallel == 1 else GrowwReviewScraper(scraper.config)
+        segment = worker.fetch_reviews(start_date=start, end_date=end)
         LOGGER.info("Slice %s yielded %s reviews.", idx, len(segment))
+        return segment
+
+    indexed_slices = list(enumerate(window_slices, start=1))
+    if max_parallel == 1 or total <= 1:
+        segments = [_fetch_slice(item) for item in indexed_slices]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_parallel, total)) as executor:
+            segments = list(executor.map(_fetch_slice, indexed_slices))
+
+    # Slices cover disjoint date ranges, so a repeated id is the same review;
+    # keep the first occurrence (in slice order) and skip the rest.
+    seen: set[str] = set()
+    combined: List[ReviewRecord] = []
+    for segment in segments:
         for record in segment:
-            combined[record.review_id] = record
-    LOGGER.info("Combined %s unique reviews across %s slices.", len(combined), len(window_slices))
-    return list(combined.values())
+            if record.review_id in seen:
+                continue
+            seen.add(record.review_id)
+            combined.append(record)
+    LOGGER.info("Combined %s unique reviews across %s slices.", len(combined), total)
+    return combined
 
 
 def _parse_cli_date(value: Optional[str]) -> Optional[datetime]:
     if not value:
         return None
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        # Fast path for the common YYYY-MM-DD form: already UTC midnight, no tz conversion.
+        try:
+            return datetime(int(value[:4]), int(value[5:7]), int(value[8:10]), tzinfo=timezone.utc)
+        except ValueError:
+            raise SystemExit(f"Invalid date format '{value}'. Use YYYY-MM-DD.")
     try:
         parsed = datetime.fromisoformat(value)
     except ValueError:
@@ -477,11 +527,107 @@ def _parse_cli_date(value: Optional[str]) -> Optional[datetime]:
     return parsed.astimezone(timezone.utc)
 
 
+@lru_cache(maxsize=8192)
 def _clean_or_fallback(value: str) -> str:
+    from src.layer1.cleaning import clean_text
+
     cleaned = clean_text(value)
     return cleaned or value
 
 
+@dataclass(frozen=True, slots=True)
+class _PipelineEnv:
+    """Environment-driven pipeline settings, parsed once per process."""
+
+    scraper_output_dir: Path
+    scraper_weekly_dir: Optional[str]
+    scraper_max_parallel: int
+    scraper_slice_days: int
+    scraper_max_reviews: int
+    scraper_max_scrolls: int
+    scraper_scroll_wait_ms: int
+    scraper_per_rating_target: int
+    scraper_enable_rating_filters: bool
+    scraper_rating_filter_sequence: Optional[str]
+    review_lookback_days: int
+    review_min_offset_days: int
+    play_store_app_id: str
+    play_store_locale: str
+    play_store_country: str
+    play_store_sort_mode: str
+    sort_fallbacks: str
+    playwright_headless: bool
+    playwright_browser: str
+    theme_discovery_enabled: bool
+    theme_discovery_sample_size: int
+    theme_discovery_min_confidence: float
+    theme_discovery_max_themes: int
+    theme_classifier_batch_size: int
+    theme_classifier_temperature: float
+    theme_classifier_cache_path: str | None
+    layer2_cache_path: str | None
+    theme_semantic_cache: bool
+    gemini_max_parallel: int
+    gemini_requests_per_minute: int
+    gemini_max_output_tokens_per_review: int
+    gemini_use_async: bool
+    gemini_batch_mode: bool
+    gemini_stream_responses: bool
+    gemini_parallel_models: Tuple[str, ...]
+    theme_heuristic_prefilter: bool
+    theme_self_consistency_samples: int
+    layer3_output_dir: Path
+    email_single_latest: bool
+
+
+@lru_cache(maxsize=1)
+def _env() -> _PipelineEnv:
+    """Read pipeline env vars once (after load_dotenv); call ``_env.cache_clear()`` to re-read."""
+    return _PipelineEnv(
+        scraper_output_dir=Path(os.getenv("SCRAPER_OUTPUT_DIR", "data/raw")),
+        scraper_weekly_dir=os.getenv("SCRAPER_WEEKLY_DIR"),
+        scraper_max_parallel=max(1, int(os.getenv("SCRAPER_MAX_PARALLEL", "3"))),
+        scraper_slice_days=int(os.getenv("SCRAPER_SLICE_DAYS", "7")),
+        scraper_max_reviews=int(os.getenv("SCRAPER_MAX_REVIEWS", "2000")),
+        scraper_max_scrolls=int(os.getenv("SCRAPER_MAX_SCROLLS", "1000")),
+        scraper_scroll_wait_ms=int(os.getenv("SCRAPER_SCROLL_WAIT_MS", "1500")),
+        scraper_per_rating_target=int(os.getenv("SCRAPER_PER_RATING_TARGET", "20")),
+        scraper_enable_rating_filters=_env_bool("SCRAPER_ENABLE_RATING_FILTERS", False),
+        scraper_rating_filter_sequence=os.getenv("SCRAPER_RATING_FILTER_SEQUENCE"),
+        review_lookback_days=int(os.getenv("REVIEW_LOOKBACK_DAYS", "28")),
+        review_min_offset_days=int(os.getenv("REVIEW_MIN_OFFSET_DAYS", "7")),
+        play_store_app_id=os.getenv("PLAY_STORE_APP_ID", "com.nextbillion.groww"),
+        play_store_locale=os.getenv("PLAY_STORE_LOCALE", "en"),
+        play_store_country=os.getenv("PLAY_STORE_COUNTRY", "in"),
+        play_store_sort_mode=os.getenv("PLAY_STORE_SORT_MODE", "newest"),
+        sort_fallbacks=os.getenv("PLAY_STORE_SORT_FALLBACKS", ""),
+        playwright_headless=_env_bool("PLAYWRIGHT_HEADLESS", True),
+        playwright_browser=os.getenv("PLAYWRIGHT_BROWSER", "chromium"),
+        theme_discovery_enabled=_env_bool("THEME_DISCOVERY_ENABLED", False),
+        theme_discovery_sample_size=int(os.getenv("THEME_DISCOVERY_SAMPLE_SIZE", "50")),
+        theme_discovery_min_confidence=float(os.getenv("THEME_DISCOVERY_MIN_CONFIDENCE", "0.6")),
+        theme_discovery_max_themes=int(os.getenv("THEME_DISCOVERY_MAX_THEMES", "4")),
+        theme_classifier_batch_size=int(os.getenv("THEME_CLASSIFIER_BATCH_SIZE", "24")),
+        theme_classifier_temperature=float(os.getenv("THEME_CLASSIFIER_TEMPERATURE", "0.1")),
+        theme_classifier_cache_path=os.getenv("THEME_CLASSIFIER_CACHE_PATH") or None,
+        layer2_cache_path=os.getenv("LAYER2_CACHE_PATH") or None,
+        theme_semantic_cache=_env_bool("THEME_SEMANTIC_CACHE", False),
+        gemini_max_parallel=max(1, int(os.getenv("GEMINI_MAX_PARALLEL", "4"))),
+        gemini_requests_per_minute=max(0, int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "0"))),
+        gemini_max_output_tokens_per_review=max(0, int(os.getenv("GEMINI_MAX_OUTPUT_TOKENS_PER_REVIEW", "0"))),
+        gemini_use_async=_env_bool("GEMINI_USE_ASYNC", False),
+        gemini_batch_mode=_env_bool("GEMINI_BATCH_MODE", False),
+        gemini_stream_responses=_env_bool("GEMINI_STREAM_RESPONSES", False),
+        gemini_parallel_models=tuple(
+            name.strip() for name in os.getenv("GEMINI_PARALLEL_MODELS", "").split(",") if name.strip()
+        ),
+        theme_heuristic_prefilter=_env_bool("THEME_HEURISTIC_PREFILTER", False),
+        theme_self_consistency_samples=max(0, int(os.getenv("THEME_SELF_CONSISTENCY_SAMPLES", "0"))),
+        layer3_output_dir=Path(os.getenv("LAYER3_OUTPUT_DIR", "data/processed/weekly_pulse")),
+        email_single_latest=_env_bool("EMAIL_SINGLE_LATEST", False),
+    )
+
+
 def _env_bool(name: str, default: bool) -> bool:
     raw = os.getenv(name)
     if raw is None:
@@ -493,11 +639,29 @@ def _persist_themes(themes) -> None:
     output_dir = Path("data/processed")
     output_dir.mkdir(parents=True, exist_ok=True)
     output_file = output_dir / "themes.json"
-    with output_file.open("w", encoding="utf-8") as fh:
-        json.dump([theme.__dict__ for theme in themes], fh, ensure_ascii=False, indent=2)
+    _write_json_atomic(output_file, [theme.__dict__ for theme in themes])
     LOGGER.info("Saved theme summaries to %s", output_file)
 
 
+def _write_json_atomic(path: Path, data) -> None:
+    """Serialise ``data`` once and swap it into place so readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str))
+    os.replace(tmp_path, path)
+
+
+def _write_json_array_atomic(path: Path, records: Iterable[dict]) -> None:
+    """Stream ``records`` to ``path`` as a JSON array without building the whole payload in memory."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as fh:
+        fh.write(b"[")
+        for idx, record in enumerate(records):
+            fh.write(b",\n  " if idx else b"\n  ")
+            fh.write(orjson.dumps(record, default=str))
+        fh.write(b"\n]")
+    os.replace(tmp_path, path)
+
+
 def main() -> None:
     args = parse_args()
     run_pipeline(args)
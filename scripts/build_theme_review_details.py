@@ -1,39 +1,47 @@
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List
 
+import orjson
+
 
 RAW_WEEKLY_DIR = Path("data/raw/weekly")
 CLASSIFICATIONS_PATH = Path("data/processed/review_classifications.json")
 OUTPUT_PATH = Path("data/processed/theme_review_details.json")
+LOAD_WORKERS = 8
+UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file from raw bytes, stripping a UTF-8 BOM if present."""
+    content = path.read_bytes()
+    if content.startswith(UTF8_BOM):
+        content = content[len(UTF8_BOM):]
+    return orjson.loads(content)
+
+
+def _load_week_file(path: Path) -> List[Dict[str, Any]]:
+    """Read one weekly JSON file; returns [] on failure."""
+    try:
+        return _read_json(path)
+    except Exception as exc:
+        print(f"Failed to load {path}: {exc}")
+        return []
 
 
 def load_raw_reviews() -> Dict[str, Dict[str, Any]]:
     """Load all raw weekly reviews keyed by review_id."""
-    reviews_by_id: Dict[str, Dict[str, Any]] = {}
-
     if not RAW_WEEKLY_DIR.exists():
         print(f"Raw weekly directory not found: {RAW_WEEKLY_DIR}")
-        return reviews_by_id
-
-    for path in sorted(RAW_WEEKLY_DIR.glob("week_*.json")):
-        try:
-            # Read and strip BOM if present
-            content = path.read_text(encoding="utf-8")
-            if content.startswith("\ufeff"):
-                content = content[1:]
-            items = json.loads(content)
-        except Exception as exc:
-            print(f"Failed to load {path}: {exc}")
-            continue
+        return {}
 
-        for item in items:
-            rid = item.get("review_id")
-            if not rid:
-                continue
-            reviews_by_id[rid] = item
+    paths = sorted(RAW_WEEKLY_DIR.glob("week_*.json"))
+    # File reads release the GIL, so overlap them; map() keeps file order for the merge.
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as executor:
+        all_items = list(executor.map(_load_week_file, paths))
 
-    return reviews_by_id
+    return {item["review_id"]: item for items in all_items for item in items if item.get("review_id")}
 
 
 def build_theme_review_details() -> List[Dict[str, Any]]:
@@ -42,11 +50,7 @@ def build_theme_review_details() -> List[Dict[str, Any]]:
         print(f"Classification file not found: {CLASSIFICATIONS_PATH}")
         return []
 
-    # Read and strip BOM if present
-    content = CLASSIFICATIONS_PATH.read_text(encoding="utf-8")
-    if content.startswith("\ufeff"):
-        content = content[1:]
-    classifications = json.loads(content)
+    classifications = _read_json(CLASSIFICATIONS_PATH)
 
     reviews_by_id = load_raw_reviews()
     merged: List[Dict[str, Any]] = []
@@ -83,9 +87,16 @@ def build_theme_review_details() -> List[Dict[str, Any]]:
 def main() -> None:
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     merged = build_theme_review_details()
-    # Write without BOM (utf-8-sig would add BOM, we want plain utf-8)
-    with OUTPUT_PATH.open("w", encoding="utf-8", newline="") as f:
-        json.dump(merged, f, ensure_ascii=False, indent=2)
+    # orjson always emits plain UTF-8 (no BOM). Records are streamed one per line
+    # into a temp file, which is then swapped in atomically.
+    tmp_path = OUTPUT_PATH.with_name(OUTPUT_PATH.name + ".tmp")
+    with tmp_path.open("wb") as fh:
+        fh.write(b"[")
+        for idx, record in enumerate(merged):
+            fh.write(b",\n  " if idx else b"\n  ")
+            fh.write(orjson.dumps(record))
+        fh.write(b"\n]")
+    os.replace(tmp_path, OUTPUT_PATH)
     print(f"Wrote {len(merged)} merged theme review records to {OUTPUT_PATH}")
 
 
@@ -3,24 +3,39 @@
 
 import json
 import os
+import re
 from pathlib import Path
 
+_DIGITS = re.compile(r"(\d+)")
+
+
+def _natural_key(name):
+    """Sort key treating digit runs numerically (pulse_2 < pulse_10)."""
+    return [int(token) if token.isdigit() else token for token in _DIGITS.split(name)]
+
+
 def generate_manifest():
     pulse_dir = Path("frontend/public/data/processed/weekly_pulse")
     if not pulse_dir.exists():
         print(f"Pulse directory not found: {pulse_dir}")
         return
     
-    pulse_files = sorted([f.name for f in pulse_dir.glob("pulse_*.json")])
+    # scandir yields names without a stat per entry (unlike Path.glob)
+    with os.scandir(pulse_dir) as entries:
+        pulse_files = sorted(
+            (entry.name for entry in entries if entry.name.startswith("pulse_") and entry.name.endswith(".json")),
+            key=_natural_key,
+        )
     
     manifest = {
         "files": pulse_files
     }
     
     manifest_path = pulse_dir / "manifest.json"
-    # Write without BOM (utf-8-sig would add BOM, we want plain utf-8)
-    with open(manifest_path, "w", encoding="utf-8", newline="") as f:
-        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    # Serialise once, write plain UTF-8 (no BOM) to a temp file, then swap it in atomically
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    tmp_path.write_bytes(json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8"))
+    os.replace(tmp_path, manifest_path)
     
     print(f"Generated manifest.json with {len(pulse_files)} files")
 
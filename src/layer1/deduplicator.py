@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable, List, Sequence, Tuple
+from typing import Iterable, List, Tuple
 
 from thefuzz import fuzz
 
@@ -30,14 +30,20 @@ class DeduplicationSummary:
 
 
 def deduplicate_reviews(
-    reviews: Sequence[ReviewModel],
+    reviews: Iterable[ReviewModel],
     config: DeduplicationConfig | None = None,
 ) -> Tuple[List[ReviewModel], DeduplicationSummary]:
-    """Remove duplicate reviews by ID and fuzzy text similarity."""
+    """Remove duplicate reviews by ID and fuzzy text similarity.
+
+    ``reviews`` may be any iterable (including a generator); it is consumed once.
+    """
 
     config = config or DeduplicationConfig()
     seen_ids: set[str] = set()
     kept: List[ReviewModel] = []
+    # Only reviews long enough to fuzzy-match are ever compared against, so keep
+    # them in their own pool instead of re-skipping short ones on every candidate.
+    fuzzy_pool: List[ReviewModel] = []
     dropped = 0
 
     for review in reviews:
@@ -46,13 +52,15 @@ def deduplicate_reviews(
             LOGGER.debug("Dropping duplicate review_id=%s", review.review_id)
             continue
 
-        if _is_similar_to_existing(review, kept, config):
+        if _is_similar_to_existing(review, fuzzy_pool, config):
             dropped += 1
             LOGGER.debug("Dropping fuzzy duplicate review_id=%s", review.review_id)
             continue
 
         kept.append(review)
         seen_ids.add(review.review_id)
+        if len(review.text) >= config.min_text_length:
+            fuzzy_pool.append(review)
 
     summary = DeduplicationSummary(kept=len(kept), dropped=dropped)
     LOGGER.info("Deduplication summary: %s", summary)
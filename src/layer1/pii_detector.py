@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable, List, Sequence
 
 try:  # Optional dependency
@@ -16,6 +17,20 @@ EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,}", r
 PHONE_PATTERN = re.compile(r"(?:\\+?\\d{1,3}[-.\\s]?)?(?:\\(\\d{2,4}\\)|\\d{3,5})[-.\\s]?\\d{3}[-.\\s]?\\d{3,4}")
 URL_PATTERN = re.compile(r"https?://\\S+|www\\.\\S+", re.IGNORECASE)
 
+# Single alternation over all regex detectors so each text is scanned once;
+# the named group that matched (``match.lastgroup``) is the finding label.
+PII_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{label}>{pattern.pattern})"
+        for pattern, label in (
+            (EMAIL_PATTERN, "EMAIL"),
+            (PHONE_PATTERN, "PHONE"),
+            (URL_PATTERN, "URL"),
+        )
+    ),
+    re.IGNORECASE,
+)
+
 LOGGER = logging.getLogger(__name__)
 
 @dataclass(slots=True)
@@ -34,6 +49,12 @@ class PIIDetector:
     def __init__(self, enable_presidio: bool = False) -> None:
         self.enable_presidio = enable_presidio and AnalyzerEngine is not None
         self._presidio_engine = AnalyzerEngine() if self.enable_presidio else None
+        # Review titles repeat heavily ("Good", "Nice app"); memoise regex-only redaction per detector.
+        self._redact_cached = lru_cache(maxsize=8192)(_redact_with_regex)
+
+    def clear_cache(self) -> None:
+        """Drop memoised redactions (call once a batch is finished)."""
+        self._redact_cached.cache_clear()
 
     def detect(self, text: str) -> List[PIIFinding]:
         findings = self._detect_with_regex(text)
@@ -50,6 +71,9 @@ class PIIDetector:
         return findings
 
     def redact(self, text: str, mask: str = "[REDACTED]") -> str:
+        if not self._presidio_engine:
+            return self._redact_cached(text, mask)
+
         findings = self.detect(text)
         if not findings:
             return text
@@ -67,15 +91,15 @@ class PIIDetector:
 
     @staticmethod
     def _detect_with_regex(text: str) -> List[PIIFinding]:
-        findings: List[PIIFinding] = []
-        for pattern, label in (
-            (EMAIL_PATTERN, "EMAIL"),
-            (PHONE_PATTERN, "PHONE"),
-            (URL_PATTERN, "URL"),
-        ):
-            for match in pattern.finditer(text):
-                findings.append(PIIFinding(text=match.group(), start=match.start(), end=match.end(), label=label))
-        return findings
+        return [
+            PIIFinding(text=match.group(), start=match.start(), end=match.end(), label=match.lastgroup or "PII")
+            for match in PII_PATTERN.finditer(text)
+        ]
+
+
+def _redact_with_regex(text: str, mask: str) -> str:
+    """Regex-only redaction: one substitution pass over the combined pattern."""
+    return PII_PATTERN.sub(lambda _match: mask, text)
 
 
 def clean_reviews_texts(texts: Iterable[str], detector: PIIDetector | None = None) -> List[str]:
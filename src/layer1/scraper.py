@@ -10,21 +10,40 @@ Primary flow:
 
 from __future__ import annotations
 
-import json
+import heapq
 import logging
 import re
-from collections import defaultdict
-from dataclasses import asdict, dataclass, field
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from itertools import chain
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
 
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from dateutil import parser as date_parser
+from urllib3.util import Retry, make_headers
+
+try:  # Optional dependency: C-backed parser for fixture HTML
+    import lxml  # type: ignore  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover - optional
+    HTML_PARSER = "html.parser"
 
 LOGGER = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+_from_timestamp = datetime.fromtimestamp
+
+# First standalone 1-5 digit in a star-rating aria-label ("Rated 4 stars out of five stars").
+_RATING_RE = re.compile(r"\b([1-5])\b")
+
 
 @dataclass(slots=True)
 class ScraperConfig:
@@ -101,6 +120,11 @@ class ReviewRecord:
     date: datetime
     author: Optional[str] = None
     product_tag: Optional[str] = None
+    # POSIX seconds of ``date``, cached so window filters compare floats, not datetimes.
+    date_ts: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.date_ts = self.date.timestamp()
 
     def week_bucket(self) -> Tuple[datetime, datetime]:
         """Return a tuple of (week_start, week_end) for bucketing downstream."""
@@ -125,9 +149,13 @@ class GrowwReviewScraper:
     and extracts review content without authentication.
     """
 
+    MAX_RATING_WORKERS = 5  # cap concurrent per-rating streams to avoid Play Store throttling
+
     def __init__(self, config: ScraperConfig) -> None:
         self.config = config
         self._fetcher = PlayStoreReviewFetcher(config)
+        # One fetcher (and so one HTTP session) per rating stream; see _fetch_sort_mode.
+        self._rating_fetchers: Dict[int, PlayStoreReviewFetcher] = {}
 
     def fetch_reviews(
         self,
@@ -147,28 +175,33 @@ class GrowwReviewScraper:
         )
 
         sort_sequence = self._build_sort_sequence()
-        combined_records: dict[str, ReviewRecord] = {}
+        start_ts, end_ts = window_start.timestamp(), window_end.timestamp()
+        # Dedupe, window filter and rating counts happen in one pass as records are
+        # merged; the kept list goes straight to the per-rating limiter afterwards.
+        seen_ids: set[str] = set()
+        in_window_records: List[ReviewRecord] = []
         rating_counts = self._empty_rating_counts()
 
         for mode in sort_sequence:
-            stats = self._fetcher.fetch(window_start, window_end, sort_mode=mode)
-            new_records = 0
-            for record in stats.records:
-                if record.review_id not in combined_records:
-                    combined_records[record.review_id] = record
-                    new_records += 1
-                    if len(combined_records) >= self.config.max_reviews:
-                        LOGGER.info("Reached max_reviews (%s); stopping collection.", self.config.max_reviews)
-                        break
-            filtered = self._fetcher._filter_by_window(
-                list(combined_records.values()), window_start, window_end
+            mode_records = chain.from_iterable(
+                stats.records for stats in self._fetch_sort_mode(window_start, window_end, mode)
             )
-            rating_counts = self._fetcher._count_by_rating(filtered)
+            new_records = 0
+            for record in mode_records:
+                if record.review_id in seen_ids or not start_ts <= record.date_ts <= end_ts:
+                    continue
+                seen_ids.add(record.review_id)
+                in_window_records.append(record)
+                rating_counts[min(max(record.rating, 1), 5)] += 1
+                new_records += 1
+                if len(in_window_records) >= self.config.max_reviews:
+                    LOGGER.info("Reached max_reviews (%s); stopping collection.", self.config.max_reviews)
+                    break
             LOGGER.info(
                 "Sort '%s' added %s new reviews (%s total unique). Rating counts=%s",
                 mode,
                 new_records,
-                len(filtered),
+                len(in_window_records),
                 rating_counts,
             )
             if self._fetcher._targets_met(rating_counts):
@@ -177,25 +210,41 @@ class GrowwReviewScraper:
         else:
             LOGGER.warning("Per-rating targets unmet after fallbacks: %s", rating_counts)
 
-        filtered_records = self._fetcher._filter_by_window(
-            list(combined_records.values()), window_start, window_end
-        )
-        limited_records = self._fetcher._limit_per_rating(filtered_records)
+        limited_records = self._fetcher._limit_per_rating(in_window_records)
         LOGGER.info("Collected %s reviews in range.", len(limited_records))
         return sorted(limited_records, key=lambda r: r.date, reverse=True)
 
+    def _fetch_sort_mode(self, window_start: datetime, window_end: datetime, mode: str) -> List[FetchStats]:
+        """Fetch one sort mode, fanning out one stream per star rating when rating filters are enabled."""
+        ratings = list(dict.fromkeys(r for r in self.config.rating_filter_order if r in {1, 2, 3, 4, 5}))
+        if not self.config.enable_rating_filters or not ratings:
+            return [self._fetcher.fetch(window_start, window_end, sort_mode=mode)]
+
+        # Rating streams are independent paginations and run concurrently. Each rating
+        # gets its own fetcher, so HTTP sessions are never shared across threads; the
+        # fetchers are kept, so later sort modes reuse their warm connections.
+        for rating in ratings:
+            if rating not in self._rating_fetchers:
+                self._rating_fetchers[rating] = PlayStoreReviewFetcher(self.config)
+        fetchers = self._rating_fetchers
+
+        def _fetch_rating(rating: int) -> FetchStats:
+            return fetchers[rating].fetch(window_start, window_end, sort_mode=mode, rating_filter=rating)
+
+        # map() keeps rating order.
+        with ThreadPoolExecutor(max_workers=min(self.MAX_RATING_WORKERS, len(ratings))) as executor:
+            return list(executor.map(_fetch_rating, ratings))
+
     def _build_sort_sequence(self) -> List[str]:
-        seen: set[str] = set()
+        # Seeding with "" drops blank entries through the same membership check as repeats.
+        seen: set[str] = {""}
         sequence: List[str] = []
-        for candidate in [self.config.sort_mode, *self.config.fallback_sort_modes]:
+        for candidate in (self.config.sort_mode, *self.config.fallback_sort_modes):
             normalized = (candidate or "").strip().lower()
-            if not normalized or normalized in seen:
-                continue
-            seen.add(normalized)
-            sequence.append(normalized)
-        if not sequence:
-            sequence.append("newest")
-        return sequence
+            if normalized not in seen:
+                seen.add(normalized)
+                sequence.append(normalized)
+        return sequence or ["newest"]
 
     @staticmethod
     def _empty_rating_counts() -> dict[int, int]:
@@ -218,47 +267,46 @@ class GrowwReviewScraper:
             f"groww_reviews_{window_start.date().isoformat()}_{window_end.date().isoformat()}.json"
         )
         output_path = self.config.output_dir / filename
-        payload = [self._serialise_record(record) for record in reviews_list]
-        with output_path.open("w", encoding="utf-8") as fh:
-            json.dump(payload, fh, ensure_ascii=False, indent=2, default=str)
-        LOGGER.info("Saved %s reviews to %s", len(payload), output_path)
+        reviews_list = list(reviews_list)
+        # A run is capped at max_reviews, so encode the whole file and hand it over in one write.
+        output_path.write_bytes(_encode_array(self._serialise_record(record) for record in reviews_list))
+        LOGGER.info("Saved %s reviews to %s", len(reviews_list), output_path)
 
         self._save_weekly_buckets(reviews_list)
         return output_path
 
     def _save_weekly_buckets(self, reviews_list: Iterable[ReviewRecord]) -> None:
-        weekly_groups: defaultdict[str, List[ReviewRecord]] = defaultdict(list)
-        for record in reviews_list:
-            week_start, _ = record.week_bucket()
-            weekly_groups[week_start.date().isoformat()].append(record)
-
+        weekly_groups = _group_by_week(list(reviews_list))
         if not weekly_groups:
             return
 
         weekly_dir = self.config.weekly_output_dir
         weekly_dir.mkdir(parents=True, exist_ok=True)
-        for week_key, records in weekly_groups.items():
-            week_start, week_end = records[0].week_bucket()
-            serialized = []
-            for r in records:
-                payload = self._serialise_record(r)
-                payload["week_start_date"] = week_start.date().isoformat()
-                payload["week_end_date"] = week_end.date().isoformat()
-                serialized.append(payload)
+        for week_start, records in weekly_groups:
+            week_key = week_start.isoformat()
+            week_fields = {
+                "week_start_date": week_key,
+                "week_end_date": (week_start + timedelta(days=6)).isoformat(),
+            }
             file_path = weekly_dir / f"week_{week_key}.json"
-            with file_path.open("w", encoding="utf-8") as fh:
-                json.dump(serialized, fh, ensure_ascii=False, indent=2)
-            LOGGER.info("Wrote %s reviews to %s", len(serialized), file_path)
+            # Weekly buckets are small: encode the whole file and hand it to the OS in one write.
+            file_path.write_bytes(_encode_array({**self._serialise_record(r), **week_fields} for r in records))
+            LOGGER.info("Wrote %s reviews to %s", len(records), file_path)
 
     @staticmethod
     def _serialise_record(record: ReviewRecord) -> dict:
-        """Convert dataclass into JSON-friendly dict."""
-        serialised = asdict(record)
-        serialised["date"] = record.date.isoformat()
-        if record.product_tag is None:
-            serialised.pop("product_tag", None)
-        if record.author is None:
-            serialised.pop("author", None)
+        """Convert dataclass into a dict ready for orjson encoding."""
+        serialised = {
+            "review_id": record.review_id,
+            "title": record.title,
+            "text": record.text,
+            "rating": record.rating,
+            "date": record.date,  # orjson writes datetimes as ISO 8601 natively
+        }
+        if record.author is not None:
+            serialised["author"] = record.author
+        if record.product_tag is not None:
+            serialised["product_tag"] = record.product_tag
         return serialised
 
 
@@ -273,17 +321,29 @@ class PlayStoreReviewFetcher:
         "newest": 2,
         "most_relevant": 1,
     }
-    RESPONSE_PATTERN = re.compile(r"\)\]\}'\n\n(.+)", re.DOTALL)
+    RESPONSE_PREFIX = b")]}'\n\n"
+    # Pre-encoded bytes templates for ``bytes % mapping``; literal URL escapes are doubled (%%5B).
     PAYLOAD_FIRST_PAGE = (
-        "f.req=%5B%5B%5B%22UsvDTd%22%2C%22%5Bnull%2Cnull%2C%5B2%2C{sort}%2C%5B{count}%2Cnull%2Cnull%5D%2Cnull%2C%5Bnull%2C{score}%5D%5D%2C%5B%5C%22{app_id}%5C%22%2C7%5D%5D%22%2Cnull%2C%22generic%22%5D%5D%5D"
+        b"f.req=%%5B%%5B%%5B%%22UsvDTd%%22%%2C%%22%%5Bnull%%2Cnull%%2C%%5B2%%2C%(sort)s%%2C%%5B%(count)s%%2Cnull%%2Cnull%%5D%%2Cnull%%2C%%5Bnull%%2C%(score)s%%5D%%5D%%2C%%5B%%5C%%22%(app_id)s%%5C%%22%%2C7%%5D%%5D%%22%%2Cnull%%2C%%22generic%%22%%5D%%5D%%5D"
     )
     PAYLOAD_PAGINATED_PAGE = (
-        "f.req=%5B%5B%5B%22UsvDTd%22%2C%22%5Bnull%2Cnull%2C%5B2%2C{sort}%2C%5B{count}%2Cnull%2C%5C%22{token}%5C%22%5D%2Cnull%2C%5Bnull%2C{score}%5D%5D%2C%5B%5C%22{app_id}%5C%22%2C7%5D%5D%22%2Cnull%2C%22generic%22%5D%5D%5D"
+        b"f.req=%%5B%%5B%%5B%%22UsvDTd%%22%%2C%%22%%5Bnull%%2Cnull%%2C%%5B2%%2C%(sort)s%%2C%%5B%(count)s%%2Cnull%%2C%%5C%%22%(token)s%%5C%%22%%5D%%2Cnull%%2C%%5Bnull%%2C%(score)s%%5D%%5D%%2C%%5B%%5C%%22%(app_id)s%%5C%%22%%2C7%%5D%%5D%%22%%2Cnull%%2C%%22generic%%22%%5D%%5D%%5D"
     )
 
     def __init__(self, config: ScraperConfig) -> None:
         self.config = config
         self._session = requests.Session()
+        # One host, sequential pages: keep a single warm connection and retry
+        # transient throttling/5xx with a short backoff. The batchexecute read is
+        # idempotent, so POST is allowed to retry.
+        retry = Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=retry))
 
     def fetch(
         self,
@@ -300,6 +360,8 @@ class PlayStoreReviewFetcher:
         active_sort_mode = (sort_mode or self.config.sort_mode or "newest").lower()
         sort_code = self.SORT_CODES.get(active_sort_mode, self.SORT_CODES["newest"])
         max_reviews = self.config.max_reviews
+        newest_first = sort_code == self.SORT_CODES["newest"]
+        start_ts, end_ts = window_start.timestamp(), window_end.timestamp()
 
         collected: List[ReviewRecord] = []
         seen_ids: set[str] = set()
@@ -320,20 +382,26 @@ class PlayStoreReviewFetcher:
             for record in page_records:
                 if record.review_id in seen_ids:
                     continue
-                if record.date > window_end:
+                if record.date_ts > end_ts:
                     continue
                 seen_ids.add(record.review_id)
                 collected.append(record)
                 if 1 <= record.rating <= 5:
                     rating_counts[record.rating] += 1
 
-            if self._targets_met(rating_counts):
+            if self._targets_met(rating_counts, rating_filter):
                 LOGGER.info("Per-rating targets met; stopping fetch.")
                 break
 
             if not next_token:
                 break
 
+            # "newest" pages arrive in descending date order: once a page reaches
+            # past window_start, every later page is outside the window too.
+            if newest_first and min(record.date_ts for record in page_records) < start_ts:
+                LOGGER.info("Reached reviews older than %s; stopping fetch.", window_start.date())
+                break
+
         filtered = self._filter_by_window(collected, window_start, window_end)
         rating_counts = self._count_by_rating(filtered)
         limited = self._limit_per_rating(filtered)
@@ -352,6 +420,8 @@ class PlayStoreReviewFetcher:
                 "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0 Safari/537.36"
             ),
             "x-same-domain": "1",
+            # Advertises br only when a brotli decoder is installed.
+            **make_headers(accept_encoding=True),
         }
 
     def _build_body(
@@ -361,27 +431,18 @@ class PlayStoreReviewFetcher:
         rating_filter: Optional[int],
         page_token: Optional[str],
     ) -> bytes:
-        filter_value = (
-            "null" if rating_filter not in {1, 2, 3, 4, 5} else str(int(rating_filter))
-        )
-        if page_token:
-            # Page tokens may contain characters that need escaping inside the payload.
-            escaped_token = json.dumps(page_token)[1:-1]
-            payload = self.PAYLOAD_PAGINATED_PAGE.format(
-                sort=sort_code,
-                count=count,
-                score=filter_value,
-                app_id=self.config.app_id,
-                token=escaped_token,
-            )
-        else:
-            payload = self.PAYLOAD_FIRST_PAGE.format(
-                sort=sort_code,
-                count=count,
-                score=filter_value,
-                app_id=self.config.app_id,
-            )
-        return payload.encode("utf-8")
+        parts = {
+            b"sort": b"%d" % sort_code,
+            b"count": b"%d" % count,
+            b"score": b"%d" % rating_filter if rating_filter in {1, 2, 3, 4, 5} else b"null",
+            b"app_id": quote(self.config.app_id, safe="").encode("ascii"),
+        }
+        if not page_token:
+            return self.PAYLOAD_FIRST_PAGE % parts
+        # Tokens are spliced into an already URL-encoded body, so percent-encode them
+        # the same way instead of leaving reserved characters ("+", "=", "/") raw.
+        parts[b"token"] = quote(page_token, safe="").encode("ascii")
+        return self.PAYLOAD_PAGINATED_PAGE % parts
 
     def _fetch_page(
         self,
@@ -402,9 +463,8 @@ class PlayStoreReviewFetcher:
             LOGGER.warning("Play Store request failed: %s", exc)
             return [], None
 
-        reviews_raw, token = self._parse_response(resp.text)
-        records = [self._record_from_raw(item) for item in reviews_raw]
-        records = [record for record in records if record is not None]
+        reviews_raw, token = self._parse_response(resp.content)
+        records = [record for item in reviews_raw if (record := self._record_from_raw(item)) is not None]
 
         if isinstance(token, str) and token:
             next_token = token
@@ -413,18 +473,22 @@ class PlayStoreReviewFetcher:
 
         return records, next_token
 
-    def _parse_response(self, payload: str) -> Tuple[List[list], Optional[str]]:
-        match = self.RESPONSE_PATTERN.search(payload)
-        if not match:
+    def _parse_response(self, payload: bytes) -> Tuple[List[list], Optional[str]]:
+        # Locate the anti-XSSI prefix with a plain substring search; no regex capture copy.
+        idx = payload.find(self.RESPONSE_PREFIX)
+        body = payload[idx + len(self.RESPONSE_PREFIX):] if idx >= 0 else ""
+        if not body:
             LOGGER.warning("Unexpected Play Store payload; skipping batch.")
             return [], None
 
-        outer = json.loads(match.group(1))
+        # orjson decodes both envelope layers in C (the inner batch is a JSON string
+        # holding up to MAX_PAGE_SIZE review tuples).
+        outer = orjson.loads(body)
         if not outer or len(outer[0]) < 3:
             return [], None
 
         try:
-            inner = json.loads(outer[0][2])
+            inner = orjson.loads(outer[0][2])
         except (ValueError, TypeError):
             LOGGER.warning("Unable to decode Play Store batch payload.")
             return [], None
@@ -439,36 +503,35 @@ class PlayStoreReviewFetcher:
         return reviews, next_token
 
     def _record_from_raw(self, raw: list) -> Optional[ReviewRecord]:
+        # Review tuples are [id, [author, ...], rating, _, text, [epoch_seconds, nanos], ...].
         try:
-            review_id = raw[0]
-            user_name = (raw[1][0] or "").strip()
-            rating = int(raw[2])
-            text = raw[4] or ""
-            timestamp_info = raw[5]
-            timestamp = timestamp_info[0]
-        except (IndexError, TypeError, ValueError):
+            review_id, author_info, rating, _, text, (timestamp, *_rest) = raw[:6]
+            user_name = (author_info[0] or "").strip() if author_info else ""
+        except (TypeError, ValueError):  # short/malformed tuple
             return None
 
-        if not review_id or not timestamp:
+        if not review_id or not timestamp or type(rating) is not int:
             return None
 
-        review_date = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+        text = text or ""
         title = user_name or text[:80]
-
         return ReviewRecord(
             review_id=review_id,
             title=title or "Play Store Review",
             text=text,
             rating=rating,
-            date=review_date,
+            date=_from_timestamp(timestamp, _UTC),
             author=user_name or None,
             product_tag=None,
         )
 
-    def _targets_met(self, rating_counts: dict[int, int]) -> bool:
+    def _targets_met(self, rating_counts: dict[int, int], rating_filter: Optional[int] = None) -> bool:
         target = self.config.per_rating_target
         if target <= 0:
             return True
+        if rating_filter in rating_counts:
+            # A rating-filtered stream only ever yields that rating.
+            return rating_counts[rating_filter] >= target
         return all(count >= target for count in rating_counts.values())
 
     def _filter_by_window(
@@ -477,30 +540,34 @@ class PlayStoreReviewFetcher:
         window_start: datetime,
         window_end: datetime,
     ) -> List[ReviewRecord]:
-        return [record for record in collected if window_start <= record.date <= window_end]
+        start_ts, end_ts = window_start.timestamp(), window_end.timestamp()
+        return [record for record in collected if start_ts <= record.date_ts <= end_ts]
 
     def _limit_per_rating(self, records: List[ReviewRecord]) -> List[ReviewRecord]:
         if self.config.per_rating_target <= 0:
             return sorted(records, key=lambda r: r.date, reverse=True)
 
-        per_rating_remaining = {score: self.config.per_rating_target for score in range(1, 6)}
-        selected: List[ReviewRecord] = []
-        for record in sorted(records, key=lambda r: r.date, reverse=True):
-            rating = min(max(record.rating, 1), 5)
-            if per_rating_remaining[rating] > 0:
-                selected.append(record)
-                per_rating_remaining[rating] -= 1
-            if all(value == 0 for value in per_rating_remaining.values()):
-                break
-
-        for rating, remaining in per_rating_remaining.items():
-            if remaining > 0:
+        target = self.config.per_rating_target
+        # Partition by rating (O(N)), then keep only the newest `target` per bucket with a
+        # bounded heap instead of sorting every record.
+        by_rating: dict[int, List[Tuple[int, ReviewRecord]]] = {score: [] for score in range(1, 6)}
+        for idx, record in enumerate(records):
+            by_rating[min(max(record.rating, 1), 5)].append((idx, record))
+
+        selected: List[Tuple[int, ReviewRecord]] = []
+        for rating, bucket in by_rating.items():
+            if len(bucket) < target:
                 LOGGER.warning(
                     "Only %s reviews available for rating %s within window.",
-                    self.config.per_rating_target - remaining,
+                    len(bucket),
                     rating,
                 )
-        return selected
+            selected.extend(heapq.nlargest(target, bucket, key=lambda pair: pair[1].date))
+
+        # Newest first; ties keep their input order (matches the previous stable sort).
+        selected.sort(key=lambda pair: pair[0])
+        selected.sort(key=lambda pair: pair[1].date, reverse=True)
+        return [record for _, record in selected]
 
     @staticmethod
     def _count_by_rating(records: Iterable[ReviewRecord]) -> dict[int, int]:
@@ -529,7 +596,7 @@ class PlayStoreReviewFetcher:
             LOGGER.error("Unable to read fixture HTML at %s: %s", fixture_path, exc)
             return FetchStats([], self._empty_rating_counts(), sort_mode)
 
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, HTML_PARSER)
         collected: List[ReviewRecord] = []
         seen_ids: set[str] = set()
         for card in soup.select(self.REVIEWS_SELECTOR):
@@ -584,6 +651,16 @@ class PlayStoreReviewFetcher:
             author=author or None,
             product_tag=product_tag or None,
         )
+
+
+def _encode_array(payloads: Iterable[dict]) -> bytes:
+    """Encode ``payloads`` as a JSON array with one record per line."""
+    parts = [orjson.dumps(payload, default=str) for payload in payloads]
+    if not parts:
+        return b"[]"
+    return b"[\n  " + b",\n  ".join(parts) + b"\n]"
+
+
 def compute_weekly_buckets(reviews_list: Iterable[ReviewRecord]) -> List[dict]:
     """
     Group reviews by ISO calendar week for downstream batching.
@@ -591,20 +668,35 @@ def compute_weekly_buckets(reviews_list: Iterable[ReviewRecord]) -> List[dict]:
     Returns:
         List of dictionaries with week metadata and review IDs.
     """
-    buckets = {}
-    for record in reviews_list:
-        week_start, week_end = record.week_bucket()
-        key = week_start.date().isoformat()
-        buckets.setdefault(
-            key,
-            {
-                "week_start": week_start.date().isoformat(),
-                "week_end": week_end.date().isoformat(),
-                "review_ids": [],
-            },
-        )
-        buckets[key]["review_ids"].append(record.review_id)
-    return list(buckets.values())
+    return [
+        {
+            "week_start": week_start.isoformat(),
+            "week_end": (week_start + timedelta(days=6)).isoformat(),
+            "review_ids": [record.review_id for record in records],
+        }
+        for week_start, records in _group_by_week(list(reviews_list))
+    ]
+
+
+def _group_by_week(records: List[ReviewRecord]) -> List[Tuple[date, List[ReviewRecord]]]:
+    """
+    Group records by their Monday-aligned week in one vectorised pass.
+
+    Weeks come back in first-seen order and records keep their input order within
+    a week, matching ``ReviewRecord.week_bucket``.
+    """
+    if not records:
+        return []
+
+    # Proleptic ordinals put Monday at ordinal % 7 == 1, so the week start is a plain subtraction.
+    days = np.fromiter((record.date.toordinal() for record in records), dtype=np.int64, count=len(records))
+    week_starts = days - (days - 1) % 7
+    weeks, first_seen, inverse = np.unique(week_starts, return_index=True, return_inverse=True)
+    members = np.split(np.argsort(inverse, kind="stable"), np.cumsum(np.bincount(inverse))[:-1])
+    return [
+        (date.fromordinal(int(weeks[idx])), [records[i] for i in members[idx]])
+        for idx in np.argsort(first_seen)
+    ]
 
 
 def _ensure_utc(dt: datetime) -> datetime:
@@ -626,8 +718,6 @@ def _parse_date(value: Optional[str]) -> Optional[datetime]:
 def _parse_rating(aria_label: Optional[str]) -> int:
     if not aria_label:
         return 0
-    for token in aria_label.split():
-        if token.isdigit():
-            return int(token)
-    return 0
+    match = _RATING_RE.search(aria_label)
+    return int(match.group(1)) if match else 0
 
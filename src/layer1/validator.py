@@ -5,9 +5,9 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable, List, Sequence, Tuple
+from typing import Iterable, Iterator, List, Sequence, Tuple
 
-from pydantic import BaseModel, Field, ValidationError, field_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
 
 from .scraper import ReviewRecord
 
@@ -17,6 +17,9 @@ LOGGER = logging.getLogger(__name__)
 class ReviewModel(BaseModel):
     """Pydantic representation of a validated review."""
 
+    # Sanitisation rewrites title/text in place; skip re-validation on assignment.
+    model_config = ConfigDict(frozen=False, validate_assignment=False)
+
     review_id: str = Field(min_length=1)
     title: str = Field(default="")
     text: str = Field(min_length=1)
@@ -77,10 +80,25 @@ def validate_reviews(reviews: Iterable[ReviewRecord]) -> Tuple[List[ReviewModel]
     Returns:
         (validated reviews, summary)
     """
-    validated: List[ReviewModel] = []
-    rejected = 0
+    summary = ValidationSummary(total=0, accepted=0, rejected=0)
+    validated = list(iter_validated_reviews(reviews, summary))
+    LOGGER.info("Validation summary: %s", summary)
+    return validated, summary
+
+
+def iter_validated_reviews(
+    reviews: Iterable[ReviewRecord],
+    summary: ValidationSummary | None = None,
+) -> Iterator[ReviewModel]:
+    """
+    Lazily validate ReviewRecord instances, yielding only the accepted ones.
 
+    When ``summary`` is given its counters are updated as records are consumed,
+    so it is complete once the iterator is exhausted.
+    """
     for record in reviews:
+        if summary is not None:
+            summary.total += 1
         try:
             model = ReviewModel(
                 review_id=record.review_id,
@@ -91,14 +109,14 @@ def validate_reviews(reviews: Iterable[ReviewRecord]) -> Tuple[List[ReviewModel]
                 author=record.author,
                 product_tag=record.product_tag,
             )
-            validated.append(model)
         except ValidationError as exc:
-            rejected += 1
+            if summary is not None:
+                summary.rejected += 1
             LOGGER.warning("Dropping invalid review %s: %s", record.review_id, exc)
-
-    summary = ValidationSummary(total=rejected + len(validated), accepted=len(validated), rejected=rejected)
-    LOGGER.info("Validation summary: %s", summary)
-    return validated, summary
+            continue
+        if summary is not None:
+            summary.accepted += 1
+        yield model
 
 
 def dump_validated_reviews(validated: Sequence[ReviewModel], output_path: str | None = None) -> List[dict]:
@@ -0,0 +1,68 @@
+"""Stateless per-review/per-batch helpers of the theme classifier.
+
+Kept free of classifier state and optional dependencies, with concrete type
+annotations throughout, so the module can be compiled ahead of time (e.g. with
+``mypyc src/layer2/_fastpath.py``) and imported in place of the pure-Python copy.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+from functools import lru_cache
+from itertools import starmap
+from operator import attrgetter
+from typing import Sequence
+
+from ..layer1.validator import ReviewModel
+
+# Prompt sizes are budgeted in UTF-8 bytes, a tokenizer-free proxy for tokens: English
+# runs ~4 bytes per token, while emoji/CJK take 3-4 bytes per char and similarly more
+# tokens, so a byte cap holds roughly the same token count whatever the script.
+BYTES_PER_TOKEN = 4
+REVIEW_PREVIEW_TOKENS = 100  # Review text is truncated to about this many tokens in prompts
+REVIEW_PREVIEW_BYTES = REVIEW_PREVIEW_TOKENS * BYTES_PER_TOKEN
+REVIEW_SEPARATOR = "\n---\n"
+
+# Markdown code fence some model replies wrap their JSON in (```json ... ```).
+FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+# (review_id, title, text) per review, pulled in C so formatting a batch is map/starmap
+# over field tuples rather than a Python-level loop doing attribute lookups.
+_PROMPT_FIELDS = attrgetter("review_id", "title", "text")
+
+
+def preview_size(text: str) -> int:
+    """UTF-8 size of ``text`` as it appears in a prompt block (after truncation)."""
+    size = len(text) if text.isascii() else len(text.encode("utf-8"))
+    return min(size, REVIEW_PREVIEW_BYTES + 3)
+
+
+@lru_cache(maxsize=4096)
+def format_review_block(review_id: str, title: str, text: str) -> str:
+    """One review's prompt block; cached since retries and the second pass resend the same reviews."""
+    # Truncate text to avoid token limits; most reviews are short and pass through unsliced.
+    if text.isascii():
+        if len(text) > REVIEW_PREVIEW_BYTES:
+            text = text[:REVIEW_PREVIEW_BYTES] + "..."
+    else:
+        encoded = text.encode("utf-8")
+        if len(encoded) > REVIEW_PREVIEW_BYTES:
+            # Cut on the byte budget; a split multi-byte char at the end is dropped.
+            text = encoded[:REVIEW_PREVIEW_BYTES].decode("utf-8", "ignore") + "..."
+    return f"review_id: {review_id}\ntitle: {title}\ntext: {text}"
+
+
+def format_reviews_for_prompt(reviews: Sequence[ReviewModel]) -> str:
+    """Format reviews as text for prompt."""
+    return REVIEW_SEPARATOR.join(starmap(format_review_block, map(_PROMPT_FIELDS, reviews)))
+
+
+def strip_code_fence(payload: str) -> str:
+    """``payload`` without surrounding whitespace and markdown code fences."""
+    return FENCE_RE.sub("", payload.strip())
+
+
+def backoff_delay(attempt: int, base_seconds: float) -> float:
+    """Full-jitter backoff: uniform between 0 and ``base_seconds * 2**attempt``."""
+    return random.uniform(0.0, base_seconds * (2 ** attempt))
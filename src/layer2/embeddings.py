@@ -3,12 +3,12 @@
 from __future__ import annotations
 
 import hashlib
-import json
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Sequence, Tuple
 
 import numpy as np
+import orjson
 from sentence_transformers import SentenceTransformer
 
 from ..layer1.validator import ReviewModel
@@ -43,12 +43,11 @@ class EmbeddingCache:
 
     def flush(self) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open("w", encoding="utf-8") as fh:
-            json.dump(self._data, fh)
+        self.path.write_bytes(orjson.dumps(self._data))
 
     def _load(self) -> None:
         if self.path.exists():
-            self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._data = orjson.loads(self.path.read_bytes())
 
 
 class EmbeddingService:
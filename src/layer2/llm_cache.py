@@ -0,0 +1,46 @@
+"""SQLite-backed cache of raw LLM replies, keyed by model and prompt."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+LOGGER = logging.getLogger(__name__)
+
+
+def response_cache_key(model_name: str, prompt: str) -> str:
+    """Stable key for one (model, prompt) request."""
+    return hashlib.blake2b(f"{model_name}|{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LLMResponseCache:
+    """Reply text per request key, persisted across runs.
+
+    Writes go straight to the database (WAL mode, so readers are not blocked), and
+    one connection is shared by the classifier's worker threads under a lock.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, text TEXT NOT NULL)")
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, text: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO responses (key, text) VALUES (?, ?)", (key, text))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -2,28 +2,80 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import hashlib
 import logging
 import os
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Mapping
+from itertools import starmap
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping
 import re
 
+import numpy as np
+import orjson
 from google import generativeai as genai
 
+try:  # Optional dependency: newer SDK exposing the Batch API (batch_mode)
+    from google import genai as google_genai  # type: ignore
+except ImportError:  # pragma: no cover - optional
+    google_genai = None  # type: ignore
+
+try:  # Optional dependency: Aho-Corasick automaton for the literal heuristic keywords
+    import ahocorasick  # type: ignore
+except ImportError:  # pragma: no cover - optional
+    ahocorasick = None  # type: ignore
+
+try:  # Optional dependency: typed JSON decoding of the model output
+    import msgspec  # type: ignore
+except ImportError:  # pragma: no cover - optional
+    msgspec = None  # type: ignore
+
 from ..layer1.validator import ReviewModel
-from .theme_config import DEFAULT_THEME_ID, FIXED_THEMES, ThemeDefinition, get_theme_by_id, get_all_theme_ids
+from .llm_cache import LLMResponseCache, response_cache_key
+from ._fastpath import (
+    backoff_delay,
+    format_reviews_for_prompt,
+    preview_size,
+    strip_code_fence,
+)
+from .theme_config import DEFAULT_THEME_ID, FIXED_THEMES, ThemeDefinition, get_theme_by_id, get_theme_by_id_lc, get_all_theme_ids
 from .theme_discovery import DiscoveredTheme
 
 LOGGER = logging.getLogger(__name__)
 
+if msgspec is not None:
+
+    class _LLMItem(msgspec.Struct):
+        """One classification object as returned by the model.
+
+        Decoded straight from the JSON bytes (no intermediate dict). ``get`` mirrors
+        the dict lookups used for payloads that fall back to the generic orjson path.
+        """
+
+        review_id: str = ""
+        chosen_theme: str = ""
+        short_reason: str = "No reason provided"
+        suggested_theme_name: str = ""
+        suggested_theme_description: str = ""
+
+        def get(self, key: str, default=None):
+            return getattr(self, key, default)
+
+    _LLM_ITEMS_DECODER = msgspec.json.Decoder(List[_LLMItem])
+
 # Expanded heuristic patterns to reduce "unclassified" assignments.
 # These are deliberately broad so that in absence of LLM output we still
 # map reviews into one of the fixed business themes.
+# Patterns are lowercase and only ever run on lowercased text, so they are
+# compiled case-sensitively (no per-character case folding while matching).
 HEURISTIC_PATTERNS: Dict[str, List[re.Pattern]] = {
     "customer_support": [
-        re.compile(pattern, re.IGNORECASE)
+        re.compile(pattern)
         for pattern in [
             r"customer support",
             r"support team",
@@ -56,7 +108,7 @@ HEURISTIC_PATTERNS: Dict[str, List[re.Pattern]] = {
         ]
     ],
     "payments": [
-        re.compile(pattern, re.IGNORECASE)
+        re.compile(pattern)
         for pattern in [
             r"payment",
             r"payout",
@@ -90,7 +142,7 @@ HEURISTIC_PATTERNS: Dict[str, List[re.Pattern]] = {
         ]
     ],
     "fees": [
-        re.compile(pattern, re.IGNORECASE)
+        re.compile(pattern)
         for pattern in [
             r"fee",
             r"fees",
@@ -109,7 +161,7 @@ HEURISTIC_PATTERNS: Dict[str, List[re.Pattern]] = {
         ]
     ],
     "glitches": [
-        re.compile(pattern, re.IGNORECASE)
+        re.compile(pattern)
         for pattern in [
             r"bug",
             r"error",
@@ -134,7 +186,7 @@ HEURISTIC_PATTERNS: Dict[str, List[re.Pattern]] = {
         ]
     ],
     "slow": [
-        re.compile(pattern, re.IGNORECASE)
+        re.compile(pattern)
         for pattern in [
             r"slow",
             r"lag",
@@ -155,71 +207,327 @@ HEURISTIC_PATTERNS: Dict[str, List[re.Pattern]] = {
     ],
 }
 
-CLASSIFICATION_PROMPT_TEMPLATE = """You are tagging reviews into themes.
+# One alternation per theme so a review costs a single search() per theme
+# instead of one per pattern. Dict order keeps the theme priority above.
+HEURISTIC_COMBINED: Dict[str, re.Pattern] = {
+    theme_id: re.compile("|".join(f"(?:{pattern.pattern})" for pattern in patterns))
+    for theme_id, patterns in HEURISTIC_PATTERNS.items()
+}
 
-Available predefined themes:
-{themes_list}
+# All themes in one alternation with a named group per theme, so a single scan
+# finds the leftmost hit; ``lastgroup`` is the highest-priority theme matching there.
+HEURISTIC_SCAN = re.compile(
+    "|".join(f"(?P<{theme_id}>{combined.pattern})" for theme_id, combined in HEURISTIC_COMBINED.items())
+)
+HEURISTIC_PRIORITY: List[str] = list(HEURISTIC_COMBINED)
+HEURISTIC_RANKS: Dict[str, int] = {theme_id: rank for rank, theme_id in enumerate(HEURISTIC_PRIORITY)}
+# (theme_id, combined pattern) pairs in priority order, for loops that test every theme.
+HEURISTIC_THEME_ORDER: tuple[tuple[str, re.Pattern], ...] = tuple(HEURISTIC_COMBINED.items())
+
+
+class _ThemeIdMatcher:
+    """Fuzzy theme-id lookup: the first id (in order) that contains, or is contained
+    in, a queried id - the same answer as an ordered ``a in b or b in a`` scan.
+
+    "Inside an id" is one dict lookup in a precomputed substring index; "contains an
+    id" is one Aho-Corasick pass when pyahocorasick is installed (else a scan of the
+    ids ahead of the first hit).
+    """
+
+    __slots__ = ("ids", "_inside", "_automaton")
+
+    def __init__(self, theme_ids: Iterable[str]) -> None:
+        self.ids: List[str] = list(theme_ids)
+        self._inside: Dict[str, int] = {}
+        for position, theme_id in enumerate(self.ids):
+            for start in range(len(theme_id) + 1):
+                for end in range(start, len(theme_id) + 1):
+                    self._inside.setdefault(theme_id[start:end], position)
+        self._automaton = None
+        if ahocorasick is not None and self.ids and all(self.ids):
+            automaton = ahocorasick.Automaton()
+            for position, theme_id in enumerate(self.ids):
+                if not automaton.exists(theme_id):
+                    automaton.add_word(theme_id, position)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def match(self, theme_id: str) -> int | None:
+        """Position of the matching id in ``ids``, or None."""
+        best = self._inside.get(theme_id)
+        limit = len(self.ids) if best is None else best
+        if self._automaton is not None:
+            for _end, position in self._automaton.iter(theme_id):
+                if position < limit:
+                    limit = best = position
+            return best
+        for position in range(limit):
+            if self.ids[position] in theme_id:
+                return position
+        return best
+
+
+FIXED_THEME_MATCHER = _ThemeIdMatcher(FIXED_THEMES)
+
+
+_REGEX_METACHARS = frozenset("\\[](){}?*+|^$.")
+
+
+def _build_keyword_automaton():
+    """Split the heuristics into an Aho-Corasick automaton over the plain-literal
+    patterns (value = the ranks of every theme listing it, ascending) and, per rank,
+    an alternation of the rest."""
+    if ahocorasick is None:
+        return None, []
+    literal_ranks: Dict[str, List[int]] = {}
+    regex_only: List[re.Pattern | None] = []
+    for rank, patterns in enumerate(HEURISTIC_PATTERNS.values()):
+        residual: List[str] = []
+        for pattern in patterns:
+            if _REGEX_METACHARS.isdisjoint(pattern.pattern):
+                ranks = literal_ranks.setdefault(pattern.pattern, [])
+                if rank not in ranks:
+                    ranks.append(rank)
+            else:
+                residual.append(f"(?:{pattern.pattern})")
+        regex_only.append(re.compile("|".join(residual)) if residual else None)
+    automaton = ahocorasick.Automaton()
+    for keyword, ranks in literal_ranks.items():
+        automaton.add_word(keyword, tuple(ranks))
+    automaton.make_automaton()
+    return automaton, regex_only
+
+
+# Literal patterns match exactly where their substring occurs (text is lowercased),
+# so one automaton pass covers them; only the few real regexes still go through re.
+HEURISTIC_AUTOMATON, HEURISTIC_REGEX_ONLY = _build_keyword_automaton()
+
+
+def _automaton_rank(text: str, limit: int) -> int | None:
+    """``_heuristic_rank`` via the keyword automaton plus the regex-only leftovers."""
+    best = limit
+    for _end, ranks in HEURISTIC_AUTOMATON.iter(text):
+        if ranks[0] < best:
+            best = ranks[0]
+            if best == 0:
+                return 0
+    for rank in range(best):  # only themes that would outrank the literal hit
+        residual = HEURISTIC_REGEX_ONLY[rank]
+        if residual is not None and residual.search(text):
+            return rank
+    return best if best < limit else None
+
+
+def _heuristic_hits(text: str) -> List[str]:
+    """Every heuristic theme matching ``text``, in priority order."""
+    if HEURISTIC_AUTOMATON is None:
+        return [theme_id for theme_id, combined in HEURISTIC_THEME_ORDER if combined.search(text)]
+    # One automaton pass finds the literal hits; regexes only run for themes it missed.
+    ranks = {rank for _end, keyword_ranks in HEURISTIC_AUTOMATON.iter(text) for rank in keyword_ranks}
+    return [
+        theme_id
+        for rank, theme_id in enumerate(HEURISTIC_PRIORITY)
+        if rank in ranks or (HEURISTIC_REGEX_ONLY[rank] is not None and HEURISTIC_REGEX_ONLY[rank].search(text))
+    ]
+
+
+def _heuristic_rank(text: str, below: int | None = None) -> int | None:
+    """Priority rank of the best heuristic theme in ``text``, considering only ranks < ``below``."""
+    limit = len(HEURISTIC_PRIORITY) if below is None else below
+    if HEURISTIC_AUTOMATON is not None:
+        return _automaton_rank(text, limit)
+    match = HEURISTIC_SCAN.search(text)
+    if match is None:
+        return None
+    # Nothing matches before match.start(), and no higher-priority theme matches at
+    # it, so only those themes need a (shorter) look further along the text.
+    rank = HEURISTIC_RANKS[match.lastgroup]
+    for higher in range(min(rank, limit)):
+        if HEURISTIC_COMBINED[HEURISTIC_PRIORITY[higher]].search(text, match.start() + 1):
+            return higher
+    return rank if rank < limit else None
 
-IMPORTANT: You can either:
-1. Use one of the predefined themes above (use the exact theme_id: {theme_ids})
-2. Suggest a NEW theme if the review doesn't fit any predefined theme
 
-If suggesting a new theme, provide:
-- chosen_theme: a short, lowercase theme_id with underscores (e.g., "account_issues", "trading_features", "security_concerns")
-- suggested_theme_name: a clear 2-4 word name (e.g., "Account Issues", "Trading Features", "Security Concerns")
-- suggested_theme_description: a brief 1-2 sentence description of what this theme covers
+# Prompts are laid out as a static prefix (instructions + theme list, fixed for a
+# classifier instance) followed by the per-batch reviews, so every call after the
+# first shares an identical prefix that Gemini's implicit context caching can reuse.
+CLASSIFICATION_PROMPT_TEMPLATE = """Tag each review with one theme.
 
-For each review, output:
-- review_id: the exact review_id from the input
-- chosen_theme: either a predefined theme_id OR a new suggested theme_id
-- short_reason: 1 sentence explaining why this theme was chosen (no PII, no personal information)
-- suggested_theme_name: (only if chosen_theme is new) the theme name
-- suggested_theme_description: (only if chosen_theme is new) the theme description
+Themes (theme_id: scope):
+{themes_list}
 
-Return valid JSON array with one object per review. Format:
-[
-  {{"review_id": "...", "chosen_theme": "...", "short_reason": "...", "suggested_theme_name": "...", "suggested_theme_description": "..."}},
-  {{"review_id": "...", "chosen_theme": "...", "short_reason": "..."}}
-]
+chosen_theme is one of the theme_ids above, or a new lowercase snake_case id if none fits.
+For a new id also give suggested_theme_name (2-4 words) and suggested_theme_description (1 sentence).
+short_reason: 1 short sentence (under 80 chars), no PII.
 
-Reviews:
-{reviews_batch}
+Output a JSON array, one object per review:
+[{{"review_id":"...","chosen_theme":"...","short_reason":"..."}}]
 
-Return only the JSON array, no additional text."""
+"""
 
 
-UNCLASSIFIED_REVIEW_PROMPT_TEMPLATE = """You are re-classifying reviews that were previously marked as \"unclassified\".
+UNCLASSIFIED_REVIEW_PROMPT_TEMPLATE = """Re-tag reviews previously marked "unclassified".
 
-Available themes:
+Themes (theme_id: scope):
 {themes_list}
 
-IMPORTANT RULES:
-- You MUST assign every review to the closest theme_id from this list: {theme_ids_no_unclassified}
-- Do NOT use \"unclassified\" as chosen_theme.
-- If the review is ambiguous, choose the theme that is most related to the main issue.
+chosen_theme MUST be one of: {theme_ids_no_unclassified}. Never "unclassified"; if ambiguous pick the closest main issue.
+Hints: login/verification/contacting the company/tickets -> customer_support; deposits/withdrawals/orders/trades/balances -> payments; fees/charges/deductions/penalties/taxes -> fees; bugs/crashes/wrong values/broken features -> glitches; slowness/loading/lag/freezing -> slow.
+short_reason: 1 short sentence (under 80 chars), no PII.
+
+Output a JSON array, one object per review:
+[{{"review_id":"...","chosen_theme":"...","short_reason":"..."}}]
+
+"""
+
+def _fill_omitted(
+    results: List[ReviewClassification | None],
+    retried: List[ReviewClassification],
+) -> List[ReviewClassification]:
+    """Put ``retried`` (in order) into the ``None`` slots ``_build_classifications`` left."""
+    fills = iter(retried)
+    return [next(fills) if result is None else result for result in results]
+
+
+def _is_quota_error(exc: Exception) -> bool:
+    """Whether ``exc`` looks like a Gemini 429 / quota / rate-limit rejection."""
+    message = str(exc)
+    lowered = message.lower()
+    return "429" in message or "quota" in lowered or "rate limit" in lowered
+
+
+class _CircuitBreaker:
+    """Pauses new requests for ``reset_after`` seconds after every ``fail_threshold``
+    consecutive quota errors, so concurrent batches back off together instead of
+    each retrying into the same rate-limit window."""
+
+    __slots__ = ("fail_threshold", "reset_after", "_lock", "_failures", "_open_until")
+
+    def __init__(self, fail_threshold: int = 3, reset_after: float = 60.0) -> None:
+        self.fail_threshold = fail_threshold
+        self.reset_after = reset_after
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+
+    def record_failure(self) -> int:
+        """Count a quota error; returns the number of consecutive ones."""
+        with self._lock:
+            self._failures += 1
+            if self.fail_threshold > 0 and self._failures % self.fail_threshold == 0:
+                self._open_until = time.monotonic() + self.reset_after
+            return self._failures
+
+    def record_success(self) -> None:
+        """A request went through (or the model changed): close the breaker."""
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+
+    def remaining(self) -> float:
+        """Seconds until requests may be sent again (0 when closed)."""
+        return max(0.0, self._open_until - time.monotonic())
+
+
+class _JsonArrayStream:
+    """Incrementally splits a streamed JSON array into its top-level object texts.
+
+    Text before the opening ``[`` (e.g. a code fence) is skipped; each ``{...}`` is
+    yielded as soon as its closing brace arrives, so parsing overlaps generation.
+    """
+
+    __slots__ = ("_started", "_depth", "_in_string", "_escape", "_current")
+
+    def __init__(self) -> None:
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._current: List[str] = []
+
+    def feed(self, text: str) -> List[str]:
+        completed: List[str] = []
+        if not self._started:
+            start = text.find("[")
+            if start < 0:
+                return completed
+            self._started = True
+            text = text[start + 1:]
+        for char in text:
+            if self._depth:
+                self._current.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if not self._depth:
+                    self._current = ["{"]
+                self._depth += 1
+            elif char == "}" and self._depth:
+                self._depth -= 1
+                if not self._depth:
+                    completed.append("".join(self._current))
+        return completed
+
+
+# Structured-output schema for both prompts: Gemini then emits exactly this JSON shape
+# (no prose or extra keys), which keeps output tokens - and decode time - down.
+_STRING = {"type": "string"}
+CLASSIFICATION_RESPONSE_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "review_id": _STRING,
+            "chosen_theme": _STRING,
+            "short_reason": _STRING,
+            "suggested_theme_name": _STRING,
+            "suggested_theme_description": _STRING,
+        },
+        "required": ["review_id", "chosen_theme", "short_reason"],
+    },
+}
+
+
+# Terminal states of a Gemini Batch API job.
+BATCH_JOB_END_STATES = frozenset(
+    {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+)
 
-Use these hints:
-- account access, login, verification, contacting the company, tickets → customer_support
-- deposits, withdrawals, orders, trades, balances, money movement → payments
-- fees, charges, commissions, deductions, penalties, taxes → fees
-- bugs, crashes, wrong values, features not working → glitches
-- slowness, loading issues, lag, freezing, hanging → slow
+REVIEWS_HEADER = "Reviews:\n"
+PROMPT_CHARS_PER_REVIEW = 30  # Field labels and separator around each formatted review
+CACHEABLE_MAX_TEMPERATURE = 0.2  # Above this, repeat calls may legitimately disagree; don't cache
 
-For each review, output:
-- review_id: the exact review_id from the input
-- chosen_theme: one of the allowed theme_ids above (NEVER \"unclassified\")
-- short_reason: 1 sentence explaining why this theme was chosen (no PII, no personal information)
 
-Return valid JSON array with one object per review. Format:
-[
-  {{\"review_id\": \"...\", \"chosen_theme\": \"...\", \"short_reason\": \"...\"}},
-  {{\"review_id\": \"...\", \"chosen_theme\": \"...\", \"short_reason\": \"...\"}}
-]
+class _RequestPacer:
+    """Spaces request starts at least ``60 / requests_per_minute`` seconds apart.
 
-Reviews:
-{reviews_batch}
+    Slots are handed out under a lock, so concurrent batches (threads or tasks)
+    queue up behind each other instead of bursting into the provider's rate limit.
+    """
 
-Return only the JSON array, no additional text."""
+    __slots__ = ("_interval", "_lock", "_next_at")
+
+    def __init__(self, requests_per_minute: int) -> None:
+        self._interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def reserve(self) -> float:
+        """Claim the next request slot; returns how long to wait before sending."""
+        if not self._interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at)
+            self._next_at = start + self._interval
+        return start - now
 
 
 @dataclass(slots=True)
@@ -232,18 +540,69 @@ class ReviewClassification:
     reason: str
 
 
+@dataclass(slots=True)
+class ClassificationBatch:
+    """Column-wise classifications: four parallel lists instead of one object per review.
+
+    Cheaper to hold for large corpora and lets aggregation count ``theme_ids``
+    directly; ``to_list`` rebuilds the per-review objects when needed.
+    """
+
+    review_ids: List[str]
+    theme_ids: List[str]
+    theme_names: List[str]
+    reasons: List[str]
+
+    @classmethod
+    def from_classifications(cls, classifications: Iterable[ReviewClassification]) -> "ClassificationBatch":
+        rows = [(c.review_id, c.theme_id, c.theme_name, c.reason) for c in classifications]
+        if not rows:
+            return cls([], [], [], [])
+        return cls(*map(list, zip(*rows)))
+
+    def __len__(self) -> int:
+        return len(self.review_ids)
+
+    def theme_by_review(self) -> Dict[str, str]:
+        """review_id -> theme_id."""
+        return dict(zip(self.review_ids, self.theme_ids))
+
+    def to_list(self) -> List[ReviewClassification]:
+        return list(starmap(ReviewClassification, zip(self.review_ids, self.theme_ids, self.theme_names, self.reasons)))
+
+
 @dataclass(slots=True)
 class ThemeClassifierConfig:
     """Configuration for theme classifier."""
 
     model_name: str = "models/gemini-2.5-flash"  # Latest stable flash model for fast classification
-    batch_size: int = 8  # Process 8 reviews per LLM call
+    batch_size: int = 24  # Up to 24 reviews per LLM call
+    max_prompt_chars: int = 12000  # Split a batch earlier if its formatted reviews exceed this (UTF-8 bytes, ~3k tokens)
+    use_async: bool = False  # Overlap concurrent batches on an asyncio loop instead of threads
+    batch_mode: bool = False  # Submit all batches as one discounted Gemini Batch API job (slow; for backfills)
+    batch_poll_seconds: float = 30.0  # How often to poll a batch job until it ends
+    heuristic_prefilter: bool = False  # Skip the LLM for reviews whose keywords hit exactly one theme
+    stream_responses: bool = False  # Stream replies and parse each object as it arrives (sync path)
+    heuristic_backstop: bool = True  # Resolve first-pass "unclassified" by keywords before the second LLM pass
+    retry_omitted_reviews: bool = True  # Re-ask once for reviews a batch reply left out (e.g. a mangled review_id)
+    self_consistency_samples: int = 0  # Extra samples to majority-vote on reviews still unclassified (0 = off)
+    self_consistency_temperature: float = 0.7  # Sampling temperature for those extra samples
+    # Output-token cap per review in a batch (0 = no cap). 2.5 models count thinking tokens
+    # against this limit too, so leave headroom when enabling it.
+    max_output_tokens_per_review: int = 0
     temperature: float = 0.1  # Low temperature for consistent classification
     max_retries: int = 3  # Increased for better quota error recovery (4 total attempts)
     use_discovery: bool = False  # Disabled by default; rely on fixed themes
     discovery_sample_size: int = 50  # Reviews to sample for discovery
     min_discovery_confidence: float = 0.6  # Minimum mapping confidence
     max_discovered_themes: int = 4  # Maximum discovered themes to use
+    max_concurrency: int = 1  # Batches in flight at once (1 = sequential with a pause between batches)
+    semantic_cache_threshold: float = 0.95  # Cosine similarity at which reviews share one classification
+    cache_path: str | None = None  # Persist LLM classifications by review content across runs (None = in-memory)
+    response_cache_path: str | None = None  # SQLite cache of raw replies by (model, prompt) across runs (None = off)
+    parallel_models: tuple[str, ...] = ()  # Extra models (own per-model quota) that batches round-robin across
+    model_fallback_after: int = 6  # Consecutive quota errors before switching to the next candidate model (0 = never)
+    requests_per_minute: int = 0  # Pace Gemini calls to this rate (0 = no pacing; fixed 1s gap when sequential)
 
 
 class GeminiThemeClassifier:
@@ -254,12 +613,16 @@ class GeminiThemeClassifier:
         api_key: str | None = None,
         config: ThemeClassifierConfig | None = None,
         discovered_themes: List[DiscoveredTheme] | None = None,
+        embedder=None,
     ) -> None:
+        """``embedder`` (e.g. ``layer2.embeddings.EmbeddingService``) enables the semantic
+        cache: near-duplicate reviews reuse one classification instead of each hitting the LLM."""
         self.config = config or ThemeClassifierConfig()
         api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not api_key:
             raise RuntimeError("GEMINI_API_KEY is not set.")
         genai.configure(api_key=api_key)
+        self._api_key = api_key
         # Use model from env or config, with fallback to stable models
         configured_name = os.getenv("GEMINI_MODEL_NAME", self.config.model_name)
         candidates = [
@@ -269,9 +632,12 @@ class GeminiThemeClassifier:
             "models/gemini-2.0-flash",  # Stable flash fallback
             "models/gemini-2.5-pro",    # Pro version if flash unavailable
         ]
+        self._model_candidates = list(dict.fromkeys(candidates))
+        self._model_lock = threading.Lock()
         for candidate in candidates:
             try:
                 self.model = genai.GenerativeModel(candidate)
+                self.model_name = candidate
                 LOGGER.info("Using Gemini model: %s", candidate)
                 break
             except Exception as exc:
@@ -279,6 +645,26 @@ class GeminiThemeClassifier:
                 continue
         else:
             raise RuntimeError(f"Could not initialize any Gemini model. Tried candidates: {candidates}")
+        # Extra models for parallel slots; batch i starts on slot i % len(pool), where
+        # slot 0 is always the (possibly fallen-back) primary ``self.model``.
+        self._extra_models: List = []
+        self._extra_model_names: List[str] = []
+        for name in dict.fromkeys(self.config.parallel_models):
+            if name == self.model_name:
+                continue
+            try:
+                self._extra_models.append(genai.GenerativeModel(name))
+                self._extra_model_names.append(name)
+                LOGGER.info("Adding Gemini model %s as a parallel slot", name)
+            except Exception as exc:
+                LOGGER.warning("Parallel model %s unavailable: %s", name, exc)
+        # Shared by every batch and retry; the config is never mutated after this.
+        self._gen_config = genai.GenerationConfig(
+            temperature=self.config.temperature,
+            response_mime_type="application/json",
+            response_schema=CLASSIFICATION_RESPONSE_SCHEMA,
+            max_output_tokens=self._max_output_tokens(),
+        )
         
         # Handle discovered themes
         self.discovered_themes = discovered_themes or []
@@ -290,6 +676,14 @@ class GeminiThemeClassifier:
         
         # Track LLM-suggested themes (dynamically created during classification)
         self.llm_suggested_themes: Dict[str, ThemeDefinition] = {}
+        # Self-consistency bookkeeping: reviews re-sampled / settled by the vote, per instance.
+        self.vote_stats: Dict[str, int] = {"sampled": 0, "resolved": 0}
+        self._suggested_lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(max(1, self.config.max_concurrency))
+        self._pacer = _RequestPacer(self.config.requests_per_minute)
+        # One breaker per model name: quota limits are per model, so one model's
+        # successes must not mask another's run of 429s.
+        self._breakers: Dict[str, _CircuitBreaker] = {}
         
         if self.use_discovered:
             # Limit to max_discovered_themes
@@ -305,22 +699,70 @@ class GeminiThemeClassifier:
             self.themes_list = self._build_themes_list()
             self.theme_ids_str = ", ".join(get_all_theme_ids())
 
+        # Lowercase theme_id -> discovered theme; reversed so the first duplicate wins, as a scan would.
+        self._discovered_by_id: Dict[str, DiscoveredTheme] = {
+            t.theme_id.lower(): t for t in reversed(self.discovered_themes)
+        }
+        self._discovered_matcher = _ThemeIdMatcher(t.theme_id for t in self.discovered_themes)
+        # review_id -> (title, text, lowercased "title text") for the heuristics; reset per run.
+        self._lowered_cache: Dict[str, tuple[str, str, str]] = {}
+        # Theme definitions resolved once per classifier rather than per classified review.
+        self._theme_defs: Dict[str, ThemeDefinition] = dict(FIXED_THEMES)
+        if self.use_discovered:
+            for theme_id, discovered in self._discovered_by_id.items():
+                # Use discovered theme if not mapped, otherwise use predefined
+                self._theme_defs[theme_id] = (
+                    get_theme_by_id(discovered.mapped_to_predefined)
+                    if discovered.mapped_to_predefined
+                    else ThemeDefinition(
+                        id=discovered.theme_id,
+                        name=discovered.theme_name,
+                        description=discovered.description,
+                    )
+                )
+
+        # Static prompt prefixes are formatted once; batches only append their reviews.
+        self._classification_prefix = CLASSIFICATION_PROMPT_TEMPLATE.format(themes_list=self.themes_list)
+        self._unclassified_prefix = UNCLASSIFIED_REVIEW_PROMPT_TEMPLATE.format(
+            themes_list=self.themes_list,
+            theme_ids_no_unclassified=", ".join(
+                tid for tid in (t.strip() for t in get_all_theme_ids()) if tid != DEFAULT_THEME_ID
+            ),
+        )
+
+        # Content-addressed cache of LLM results, keyed by model, theme ids, title and
+        # text; only kept when sampling is close enough to deterministic to reuse.
+        self._cache_enabled = self.config.temperature <= CACHEABLE_MAX_TEMPERATURE
+        self._cache_salt = f"{self.model_name}|{self.theme_ids_str}|"
+        self._cache: Dict[str, tuple[str, str, str]] = self._load_cache() if self._cache_enabled else {}
+        self._cache_dirty = False
+        # Whole replies by prompt: also covers second-pass prompts, whose "unclassified"
+        # reviews never enter the per-review cache above.
+        self._response_cache = (
+            LLMResponseCache(Path(self.config.response_cache_path))
+            if self._cache_enabled and self.config.response_cache_path
+            else None
+        )
+        # Semantic cache: unit-norm embeddings of LLM-classified reviews and their results.
+        self._embedder = embedder if self._cache_enabled else None
+        self._semantic_vectors: np.ndarray | None = None
+        self._semantic_labels: List[tuple[str, str, str]] = []
+
+    def _max_output_tokens(self) -> int | None:
+        """Output cap sized for a full batch; one shared config covers every batch."""
+        per_review = self.config.max_output_tokens_per_review
+        return per_review * max(1, self.config.batch_size) if per_review > 0 else None
+
     def _build_themes_list(self) -> str:
         """Build formatted themes list for prompt (predefined themes)."""
-        lines = []
-        for idx, (theme_id, theme) in enumerate(FIXED_THEMES.items(), start=1):
-            lines.append(f"{idx}. {theme.name} ({theme_id}) – {theme.description}")
-        return "\n".join(lines)
+        return "\n".join(f"{theme_id}: {theme.description}" for theme_id, theme in FIXED_THEMES.items())
 
     def _build_discovered_themes_list(self) -> str:
         """Build formatted themes list for prompt (discovered themes)."""
         lines = []
-        for idx, theme in enumerate(self.discovered_themes, start=1):
-            keywords_str = ", ".join(theme.keywords[:3]) if theme.keywords else "N/A"
-            lines.append(
-                f"{idx}. {theme.theme_name} ({theme.theme_id}) – {theme.description} "
-                f"[Keywords: {keywords_str}]"
-            )
+        for theme in self.discovered_themes:
+            keywords = f" [{', '.join(theme.keywords[:3])}]" if theme.keywords else ""
+            lines.append(f"{theme.theme_id}: {theme.description}{keywords}")
         return "\n".join(lines)
 
     def classify_reviews(
@@ -333,26 +775,128 @@ class GeminiThemeClassifier:
             - Normal batching + classification using the main prompt.
         Pass 2:
             - Identify reviews classified as DEFAULT_THEME_ID (\"unclassified\").
-            - Re-classify those reviews with a stricter prompt that forbids
+            - Assign those with a keyword hit via the heuristics (no LLM call).
+            - Re-classify the rest with a stricter prompt that forbids
               using \"unclassified\" and forces the closest theme.
         """
         if not reviews:
             return []
+        self._lowered_cache.clear()
+
+        # Blank texts (e.g. emptied by sanitisation) carry nothing to classify, and
+        # cached reviews were already classified; neither is sent in either pass.
+        empty = [r for r in reviews if not r.text or r.text.isspace()]
+        by_id = {c.review_id: c for c in self._empty_text_classifications(empty)}
+        if self._cache:
+            hits = 0
+            for review in reviews:
+                if review.review_id in by_id:
+                    continue
+                cached = self._cache.get(self._cache_key(review))
+                if cached is not None:
+                    by_id[review.review_id] = ReviewClassification(review.review_id, *cached)
+                    hits += 1
+            if hits:
+                LOGGER.info("Classification cache: %s of %s reviews already classified", hits, len(reviews))
+
+        remaining = [r for r in reviews if r.review_id not in by_id] if by_id else reviews
+        followers: Dict[str, str] = {}
+        if self._embedder is not None and remaining:
+            remaining, followers, rep_vectors = self._semantic_split(remaining, by_id)
+
+        if by_id or followers:
+            by_id.update((c.review_id, c) for c in self._classify_with_llm(remaining))
+            for review_id, rep_id in followers.items():
+                rep_cls = by_id.get(rep_id)
+                if rep_cls is not None:
+                    by_id[review_id] = ReviewClassification(review_id, rep_cls.theme_id, rep_cls.theme_name, rep_cls.reason)
+            classifications = [by_id[r.review_id] for r in reviews if r.review_id in by_id]
+        else:
+            classifications = self._classify_with_llm(reviews)
 
-        # ---------- First pass: standard classification ----------
-        classifications: List[ReviewClassification] = []
-        batches = [
-            reviews[i : i + self.config.batch_size]
-            for i in range(0, len(reviews), self.config.batch_size)
-        ]
+        if self._embedder is not None and remaining:
+            self._index_semantic(remaining, rep_vectors)
+        self._save_cache()
+        return classifications
+
+    def _semantic_split(
+        self,
+        reviews: List[ReviewModel],
+        resolved: Dict[str, ReviewClassification],
+    ) -> tuple[List[ReviewModel], Dict[str, str], np.ndarray]:
+        """Group near-duplicate reviews by embedding similarity.
+
+        Reviews close to an earlier LLM result are written into ``resolved``; reviews
+        close to another review in this call follow it (returned as follower id ->
+        representative id). Returns the representatives, which alone go to the LLM,
+        with their unit-norm vectors.
+        """
+        batch = self._embedder.embed_reviews(reviews)
+        vectors = np.asarray(batch.vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1.0, norms)
+        vector_by_id = dict(zip(batch.review_ids, vectors))
+
+        threshold = self.config.semantic_cache_threshold
+        representatives: List[ReviewModel] = []
+        rep_vectors = np.empty((len(reviews), vectors.shape[1] if vectors.ndim == 2 else 0), dtype=np.float32)
+        followers: Dict[str, str] = {}
+        for review in reviews:
+            vector = vector_by_id.get(review.review_id)
+            if vector is None:
+                representatives.append(review)
+                rep_vectors[len(representatives) - 1] = 0.0
+                continue
+            if self._semantic_labels:
+                sims = self._semantic_vectors @ vector
+                best = int(sims.argmax())
+                if sims[best] >= threshold:
+                    resolved[review.review_id] = ReviewClassification(review.review_id, *self._semantic_labels[best])
+                    continue
+            if representatives:
+                sims = rep_vectors[: len(representatives)] @ vector
+                best = int(sims.argmax())
+                if sims[best] >= threshold:
+                    followers[review.review_id] = representatives[best].review_id
+                    continue
+            rep_vectors[len(representatives)] = vector
+            representatives.append(review)
+
+        if followers or len(representatives) < len(reviews):
+            LOGGER.info(
+                "Semantic cache: %s of %s reviews reuse a near-duplicate's classification",
+                len(reviews) - len(representatives),
+                len(reviews),
+            )
+        return representatives, followers, rep_vectors[: len(representatives)]
+
+    def _index_semantic(self, reviews: List[ReviewModel], vectors: np.ndarray) -> None:
+        """Add LLM-classified reviews (those that made it into the exact cache) to the semantic index."""
+        keep: List[int] = []
+        for idx, review in enumerate(reviews):
+            label = self._cache.get(self._cache_key(review))
+            if label is not None:
+                keep.append(idx)
+                self._semantic_labels.append(label)
+        if not keep:
+            return
+        new_vectors = vectors[keep]
+        self._semantic_vectors = (
+            new_vectors if self._semantic_vectors is None else np.vstack([self._semantic_vectors, new_vectors])
+        )
 
-        for batch_idx, batch in enumerate(batches, start=1):
-            LOGGER.debug("Classifying batch %s/%s (%s reviews)", batch_idx, len(batches), len(batch))
-            batch_classifications = self._classify_batch(batch)
-            classifications.extend(batch_classifications)
-            # Small delay between batches to avoid rate limiting (skip delay after last batch)
-            if batch_idx < len(batches):
-                time.sleep(1)
+    def _classify_with_llm(self, reviews: List[ReviewModel]) -> List[ReviewClassification]:
+        """Run both LLM passes over ``reviews`` (see ``classify_reviews``)."""
+        if not reviews:
+            return []
+
+        # ---------- First pass: standard classification ----------
+        prefiltered, llm_reviews = self._heuristic_prefilter(reviews)
+        batches = self._make_batches(llm_reviews)
+        classifications = self._run_batches(batches, self._classification_prefix, "Classification")
+        if prefiltered:
+            by_id = {c.review_id: c for c in prefiltered + classifications}
+            classifications = [by_id[r.review_id] for r in reviews if r.review_id in by_id]
 
         # Build lookup for first-pass results
         first_pass_by_id: Dict[str, ReviewClassification] = {
@@ -369,18 +913,47 @@ class GeminiThemeClassifier:
         if not unclassified_reviews:
             return classifications
 
-        LOGGER.info(
-            "Second-pass classification: %s reviews previously unclassified",
-            len(unclassified_reviews),
-        )
+        if self.config.heuristic_backstop:
+            # Keyword hits settle most of these locally; only the residue costs LLM calls.
+            residual: List[ReviewModel] = []
+            for review in unclassified_reviews:
+                theme_id = self._heuristic_theme(review)
+                if theme_id is None:
+                    residual.append(review)
+                    continue
+                first_pass_by_id[review.review_id] = ReviewClassification(
+                    review_id=review.review_id,
+                    theme_id=theme_id,
+                    theme_name=get_theme_by_id_lc(theme_id).name,
+                    reason="Heuristic assignment (LLM left unclassified)",
+                )
+            LOGGER.info(
+                "Heuristic backstop assigned %s of %s unclassified reviews",
+                len(unclassified_reviews) - len(residual),
+                len(unclassified_reviews),
+            )
+            unclassified_reviews = residual
 
+        if unclassified_reviews:
+            LOGGER.info(
+                "Second-pass classification: %s reviews previously unclassified",
+                len(unclassified_reviews),
+            )
         second_pass_results = self._classify_unclassified_reviews(unclassified_reviews)
 
         # Merge: only override if the second pass produced a non-default theme
-        for cls in second_pass_results:
-            if cls.theme_id == DEFAULT_THEME_ID:
-                continue
-            first_pass_by_id[cls.review_id] = cls
+        still_unclassified: List[ReviewModel] = []
+        second_by_id = {cls.review_id: cls for cls in second_pass_results}
+        for review in unclassified_reviews:
+            cls = second_by_id.get(review.review_id)
+            if cls is None or cls.theme_id == DEFAULT_THEME_ID:
+                still_unclassified.append(review)
+            else:
+                first_pass_by_id[review.review_id] = cls
+
+        if self.config.self_consistency_samples > 0 and still_unclassified:
+            for cls in self._vote_on_unclassified(still_unclassified):
+                first_pass_by_id[cls.review_id] = cls
 
         # Preserve original order as much as possible
         merged: List[ReviewClassification] = []
@@ -393,6 +966,33 @@ class GeminiThemeClassifier:
 
         return merged
 
+    def _cache_key(self, review: ReviewModel) -> str:
+        return hashlib.sha256(f"{self._cache_salt}{review.title}|{review.text}".encode("utf-8")).hexdigest()
+
+    def _load_cache(self) -> Dict[str, tuple[str, str, str]]:
+        """Read the persisted classification cache, if configured; a bad file starts empty."""
+        if not self.config.cache_path:
+            return {}
+        path = Path(self.config.cache_path)
+        if not path.exists():
+            return {}
+        try:
+            return {key: tuple(value) for key, value in orjson.loads(path.read_bytes()).items()}
+        except (OSError, orjson.JSONDecodeError, AttributeError, TypeError) as exc:
+            LOGGER.warning("Ignoring unreadable classification cache %s: %s", path, exc)
+            return {}
+
+    def _save_cache(self) -> None:
+        """Write the cache back (atomically) when this run added entries."""
+        if not (self._cache_dirty and self.config.cache_path):
+            return
+        path = Path(self.config.cache_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(orjson.dumps(self._cache))
+        os.replace(tmp_path, path)
+        self._cache_dirty = False
+
     def _classify_unclassified_reviews(
         self,
         reviews: List[ReviewModel],
@@ -401,193 +1001,602 @@ class GeminiThemeClassifier:
         if not reviews:
             return []
 
-        results: List[ReviewClassification] = []
-        batches = [
-            reviews[i : i + self.config.batch_size]
-            for i in range(0, len(reviews), self.config.batch_size)
+        batches = self._make_batches(reviews)
+        return self._run_batches(batches, self._unclassified_prefix, "Second-pass classification")
+
+    def _vote_on_unclassified(self, reviews: List[ReviewModel]) -> List[ReviewClassification]:
+        """Self-consistency for the uncertain tail: re-sample the second-pass prompt
+        ``self_consistency_samples`` times at a higher temperature and keep a theme
+        only when it wins a strict majority of all votes, counting the "unclassified"
+        answer already given as one. Reviews without a winner are not returned.
+        """
+        samples = self.config.self_consistency_samples
+        sample_config = genai.GenerationConfig(
+            temperature=self.config.self_consistency_temperature,
+            response_mime_type="application/json",
+            response_schema=CLASSIFICATION_RESPONSE_SCHEMA,
+            max_output_tokens=self._max_output_tokens(),
+        )
+        votes: Dict[str, Counter[str]] = {review.review_id: Counter() for review in reviews}
+        reasons: Dict[tuple[str, str], str] = {}
+        for batch in self._make_batches(reviews):
+            prompt = self._build_prompt(self._unclassified_prefix, batch)
+            for _ in range(samples):
+                try:
+                    items = self._parse_response(self._generate(prompt, generation_config=sample_config).text or "")
+                except Exception as exc:
+                    LOGGER.warning("Self-consistency sample failed: %s", exc)
+                    continue
+                voted: set[str] = set()
+                for item in items:
+                    review_id = item.get("review_id", "")
+                    if review_id not in votes or review_id in voted:
+                        continue
+                    voted.add(review_id)
+                    theme_id = self._validate_theme_id(item.get("chosen_theme", "").lower().strip())
+                    if theme_id != DEFAULT_THEME_ID:
+                        votes[review_id][theme_id] += 1
+                        reasons.setdefault((review_id, theme_id), item.get("short_reason", "No reason provided"))
+
+        resolved: List[ReviewClassification] = []
+        for review in reviews:
+            tally = votes[review.review_id]
+            if not tally:
+                continue
+            theme_id, count = tally.most_common(1)[0]
+            if count * 2 <= samples + 1:
+                continue
+            theme = self._theme_defs.get(theme_id) or get_theme_by_id(theme_id)
+            resolved.append(
+                ReviewClassification(
+                    review_id=review.review_id,
+                    theme_id=theme_id,
+                    theme_name=theme.name,
+                    reason=reasons[(review.review_id, theme_id)],
+                )
+            )
+        self.vote_stats["sampled"] += len(reviews)
+        self.vote_stats["resolved"] += len(resolved)
+        LOGGER.info(
+            "Self-consistency vote settled %s of %s unclassified reviews (%s samples each)",
+            len(resolved),
+            len(reviews),
+            samples,
+        )
+        return resolved
+
+    def _empty_text_classifications(self, reviews: List[ReviewModel]) -> List[ReviewClassification]:
+        """Default-theme classifications for reviews with no text."""
+        theme_name = get_theme_by_id_lc(DEFAULT_THEME_ID).name
+        return [
+            ReviewClassification(
+                review_id=review.review_id,
+                theme_id=DEFAULT_THEME_ID,
+                theme_name=theme_name,
+                reason="Empty text",
+            )
+            for review in reviews
         ]
 
-        for batch_idx, batch in enumerate(batches, start=1):
-            LOGGER.debug(
-                "Second-pass: classifying batch %s/%s (%s reviews)",
-                batch_idx,
-                len(batches),
-                len(batch),
+    def _heuristic_prefilter(
+        self,
+        reviews: List[ReviewModel],
+    ) -> tuple[List[ReviewClassification], List[ReviewModel]]:
+        """Split off reviews whose keywords point at exactly one theme.
+
+        Returns ``(classified, remaining)``; only ``remaining`` goes to the LLM.
+        Reviews matching several themes (or none) are left for the model.
+        """
+        if not self.config.heuristic_prefilter:
+            return [], reviews
+
+        classified: List[ReviewClassification] = []
+        remaining: List[ReviewModel] = []
+        for review in reviews:
+            text = self._lowered(review)
+            hits = _heuristic_hits(text)
+            if len(hits) != 1:
+                remaining.append(review)
+                continue
+            classified.append(
+                ReviewClassification(
+                    review_id=review.review_id,
+                    theme_id=hits[0],
+                    theme_name=get_theme_by_id_lc(hits[0]).name,
+                    reason="High-confidence keyword match",
+                )
+            )
+        LOGGER.info(
+            "Heuristic pre-filter classified %s of %s reviews; %s go to the LLM",
+            len(classified),
+            len(reviews),
+            len(remaining),
+        )
+        return classified, remaining
+
+    def _make_batches(self, reviews: List[ReviewModel]) -> List[List[ReviewModel]]:
+        """Greedily pack reviews into batches of at most ``batch_size`` reviews and
+        roughly ``max_prompt_chars`` of formatted review text."""
+        batch_size = max(1, self.config.batch_size)
+        budget = self.config.max_prompt_chars
+        batches: List[List[ReviewModel]] = []
+        current: List[ReviewModel] = []
+        used = 0
+        for review in reviews:
+            cost = (
+                len(review.review_id)
+                + len(review.title)
+                + preview_size(review.text)
+                + PROMPT_CHARS_PER_REVIEW
+            )
+            if current and (len(current) >= batch_size or used + cost > budget):
+                batches.append(current)
+                current, used = [], 0
+            current.append(review)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _run_batches(
+        self,
+        batches: List[List[ReviewModel]],
+        prompt_prefix: str,
+        label: str,
+    ) -> List[ReviewClassification]:
+        """Classify every batch under ``prompt_prefix``, concatenating results in batch order.
+
+        With ``max_concurrency > 1`` batches overlap their Gemini round-trips, on a
+        thread pool or (``use_async``) on one asyncio event loop; otherwise they run
+        one by one with a short pause between calls to stay under the rate limit
+        (replaced by the request pacer when ``requests_per_minute`` is set).
+        """
+        if self.config.batch_mode and batches:
+            results = self._run_batch_job(batches, prompt_prefix, label)
+            if results is not None:
+                return results
+
+        total = len(batches)
+        workers = min(self.config.max_concurrency, total)
+        if workers > 1 and self.config.use_async:
+            return asyncio.run(self._run_batches_async(batches, prompt_prefix, label, workers))
+
+        def _run(indexed: tuple[int, List[ReviewModel]]) -> List[ReviewClassification]:
+            batch_idx, batch = indexed
+            LOGGER.debug("%s batch %s/%s (%s reviews)", label, batch_idx, total, len(batch))
+            return self._classify_pass(batch, prompt_prefix, label, slot=batch_idx - 1)
+
+        indexed_batches = list(enumerate(batches, start=1))
+        results: List[ReviewClassification] = []
+        if workers <= 1:
+            for batch_idx, batch in indexed_batches:
+                results.extend(_run((batch_idx, batch)))
+                # Small delay between batches to avoid rate limiting (skip delay after last batch)
+                if batch_idx < total and not self.config.requests_per_minute:
+                    time.sleep(1)
+            return results
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for batch_results in executor.map(_run, indexed_batches):
+                results.extend(batch_results)
+        return results
+
+    async def _run_batches_async(
+        self,
+        batches: List[List[ReviewModel]],
+        prompt_prefix: str,
+        label: str,
+        workers: int,
+    ) -> List[ReviewClassification]:
+        """Event-loop variant of ``_run_batches``: gather all batches, ``workers`` in flight."""
+        in_flight = asyncio.Semaphore(workers)
+
+        async def _run(slot: int, batch: List[ReviewModel]) -> List[ReviewClassification]:
+            async with in_flight:
+                return await self._classify_pass_async(batch, prompt_prefix, label, slot=slot)
+
+        batch_results = await asyncio.gather(*(_run(slot, batch) for slot, batch in enumerate(batches)))
+        return [cls for results in batch_results for cls in results]
+
+    def _run_batch_job(
+        self,
+        batches: List[List[ReviewModel]],
+        prompt_prefix: str,
+        label: str,
+    ) -> List[ReviewClassification] | None:
+        """Classify all batches through one inline Gemini Batch API job.
+
+        Returns None (so the caller classifies online) when the SDK is missing or
+        the job does not succeed. Batches whose response is missing or unusable
+        get the heuristic fallback.
+        """
+        if google_genai is None:
+            LOGGER.warning("batch_mode needs the google-genai package; classifying online instead")
+            return None
+
+        client = google_genai.Client(api_key=self._api_key)
+        inline_requests = [
+            {
+                "contents": [{"role": "user", "parts": [{"text": self._build_prompt(prompt_prefix, batch)}]}],
+                "config": {
+                    "temperature": self.config.temperature,
+                    "response_mime_type": "application/json",
+                    "response_schema": CLASSIFICATION_RESPONSE_SCHEMA,
+                    "max_output_tokens": self._max_output_tokens(),
+                },
+            }
+            for batch in batches
+        ]
+        try:
+            job = client.batches.create(
+                model=self.model_name,
+                src=inline_requests,
+                config={"display_name": f"theme-classify-{label.lower().replace(' ', '-')}"},
             )
-            batch_results = self._classify_unclassified_batch(batch)
-            results.extend(batch_results)
-            # Small delay between batches to avoid rate limiting (skip delay after last batch)
-            if batch_idx < len(batches):
-                time.sleep(1)
+            LOGGER.info("%s: submitted batch job %s (%s requests)", label, job.name, len(inline_requests))
+            while job.state.name not in BATCH_JOB_END_STATES:
+                time.sleep(self.config.batch_poll_seconds)
+                job = client.batches.get(name=job.name)
+        except Exception as exc:
+            LOGGER.warning("%s batch job failed (%s); classifying online instead", label, exc)
+            return None
+
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            LOGGER.warning("%s batch job ended in %s; classifying online instead", label, job.state.name)
+            return None
 
+        results: List[ReviewClassification] = []
+        # Inline responses come back in request order.
+        for batch, inline in zip(batches, job.dest.inlined_responses):
+            try:
+                if inline.response is None:
+                    raise ValueError(inline.error or "missing response")
+                results.extend(self._classifications_from_response(inline.response, batch, label))
+            except Exception as exc:
+                LOGGER.warning("%s batch job request failed: %s", label, exc)
+                results.extend(self._fallback_classifications(batch))
         return results
 
-    def _classify_batch(self, reviews: List[ReviewModel]) -> List[ReviewClassification]:
-        """Classify a single batch of reviews."""
-        reviews_text = self._format_reviews_for_prompt(reviews)
-        max_themes = (
-            min(len(self.discovered_themes), self.config.max_discovered_themes)
-            if self.use_discovered
-            else len(FIXED_THEMES)
-        )
-        prompt = CLASSIFICATION_PROMPT_TEMPLATE.format(
-            max_themes=max_themes,
-            themes_list=self.themes_list,
-            theme_ids=self.theme_ids_str,
-            reviews_batch=reviews_text,
-        )
+    def _build_prompt(self, prompt_prefix: str, reviews: List[ReviewModel]) -> str:
+        return f"{prompt_prefix}{REVIEWS_HEADER}{self._format_reviews_for_prompt(reviews)}"
+
+    def _request_wait(self, model=None) -> float:
+        """Seconds to hold off before the next request to ``model`` (default: the
+        primary): its open breaker, then the pacer slot."""
+        return self._breaker_for(self._pool_name(model)).remaining() + self._pacer.reserve()
+
+    def _breaker_for(self, name: str) -> _CircuitBreaker:
+        """The circuit breaker of model ``name``, created on first use."""
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers.setdefault(name, _CircuitBreaker())
+        return breaker
+
+    def _pool_name(self, model=None) -> str:
+        """Name of ``model`` in the pool (None means the primary)."""
+        if model is None or model is self.model:
+            return self.model_name
+        for extra, name in zip(self._extra_models, self._extra_model_names):
+            if extra is model:
+                return name
+        # A primary replaced by the model fallback while this request was in flight.
+        return getattr(model, "model_name", self.model_name)
+
+    def _fall_back_model(self, failed_name: str) -> None:
+        """Switch to the next candidate model after repeated quota errors on ``failed_name``."""
+        with self._model_lock:
+            if self.model_name != failed_name:
+                return  # another batch already switched
+            position = self._model_candidates.index(failed_name) if failed_name in self._model_candidates else -1
+            for candidate in self._model_candidates[position + 1:]:
+                try:
+                    self.model = genai.GenerativeModel(candidate)
+                except Exception as exc:
+                    LOGGER.debug("Model %s failed: %s", candidate, exc)
+                    continue
+                self.model_name = candidate
+                LOGGER.warning("Repeated quota errors on %s; switching to %s", failed_name, candidate)
+                return
+
+    def _model_for(self, slot: int):
+        """Model serving parallel ``slot`` (round-robin over the primary and extra models)."""
+        if not self._extra_models:
+            return self.model
+        slot %= len(self._extra_models) + 1
+        return self.model if slot == 0 else self._extra_models[slot - 1]
+
+    def _generate(self, prompt: str, model=None, generation_config=None):
+        """Call Gemini with the JSON response config, holding an in-flight slot.
+
+        The semaphore caps concurrent requests per classifier at ``max_concurrency``
+        across both passes (and any callers sharing this instance); retry backoff
+        sleeps happen outside it so a throttled batch does not block the others.
+        Pacing waits happen before taking a slot for the same reason.
+        """
+        wait = self._request_wait(model)
+        if wait:
+            time.sleep(wait)
+        with self._in_flight:
+            return (model or self.model).generate_content(
+                prompt, generation_config=generation_config or self._gen_config
+            )
 
+    def _generate_streamed(self, prompt: str, model=None) -> List:
+        """Stream the reply, decoding each classification object as soon as it is complete."""
+        wait = self._request_wait(model)
+        if wait:
+            time.sleep(wait)
+        splitter = _JsonArrayStream()
+        items: List = []
+        chunks: List[str] = []
+        with self._in_flight:
+            for chunk in (model or self.model).generate_content(prompt, generation_config=self._gen_config, stream=True):
+                text = chunk.text or ""
+                chunks.append(text)
+                items.extend(orjson.loads(raw) for raw in splitter.feed(text))
+        # Anything other than a flat array of objects goes through the regular parser.
+        return items or self._parse_response("".join(chunks))
+
+    def _request_items(self, prompt: str, model=None) -> List:
+        """One Gemini call (streamed or not), decoded into classification items.
+
+        With a response cache, a prompt this model has answered before is served from
+        disk; streamed replies are decoded incrementally and are not stored.
+        """
+        key = self._response_key(prompt, model or self.model)
+        cached = self._cached_items(key)
+        if cached is not None:
+            return cached
+        if self.config.stream_responses:
+            return self._generate_streamed(prompt, model)
+        text = self._generate(prompt, model).text or ""
+        return self._store_reply(key, text)
+
+    def _response_key(self, prompt: str, model) -> str | None:
+        if self._response_cache is None:
+            return None
+        return response_cache_key(f"{self._cache_salt}{getattr(model, 'model_name', '')}", prompt)
+
+    def _cached_items(self, key: str | None) -> List | None:
+        """The decoded reply stored under ``key``, or None on a miss (or without a cache)."""
+        if key is None:
+            return None
+        cached = self._response_cache.get(key)
+        return self._parse_response(cached) if cached is not None else None
+
+    def _store_reply(self, key: str | None, text: str) -> List:
+        """Decode a reply, caching its text when it holds items (bad replies are retried, not kept)."""
+        items = self._parse_response(text)
+        if key is not None and items:
+            self._response_cache.put(key, text)
+        return items
+
+    def _classify_pass(
+        self,
+        reviews: List[ReviewModel],
+        prompt_prefix: str,
+        label: str,
+        slot: int = 0,
+        retry_omitted: bool | None = None,
+    ) -> List[ReviewClassification]:
+        """Classify one batch under either pass's prompt, with retries; falls back to
+        heuristics once retries are exhausted. A quota error moves the retry to the
+        next parallel model slot, if any. Reviews the reply leaves out are re-sent
+        once as a smaller batch (``retry_omitted_reviews``)."""
+        if retry_omitted is None:
+            retry_omitted = self.config.retry_omitted_reviews
+        prompt = self._build_prompt(prompt_prefix, reviews)
         for attempt in range(self.config.max_retries + 1):
+            omitted: List[ReviewModel] | None = [] if retry_omitted else None
+            model = self._model_for(slot)
             try:
-                response = self.model.generate_content(
-                    prompt,
-                    generation_config=genai.GenerationConfig(
-                        temperature=self.config.temperature,
-                        response_mime_type="application/json",
-                    ),
-                )
-                parsed = self._parse_response(response.text or "")
-                if not parsed:
-                    raise ValueError("Empty classification payload")
-                return self._build_classifications(parsed, reviews)
+                results = self._accept_items(self._request_items(prompt, model), reviews, label, omitted, model)
             except Exception as exc:
-                error_message = str(exc).lower()
-                is_quota_error = "429" in str(exc) or "quota" in error_message or "rate limit" in error_message
-                
-                if attempt < self.config.max_retries:
-                    if is_quota_error:
-                        # Exponential backoff for quota errors: 30s, 60s, 120s, etc.
-                        delay = 30 * (2 ** attempt)
-                        LOGGER.warning(
-                            "Classification attempt %s failed with quota error: %s. Retrying after %ss...",
-                            attempt + 1, exc, delay
-                        )
-                        time.sleep(delay)
-                    else:
-                        # Shorter delay for other errors: 2s, 4s, 8s
-                        delay = 2 * (2 ** attempt)
-                        LOGGER.warning(
-                            "Classification attempt %s failed: %s. Retrying after %ss...",
-                            attempt + 1, exc, delay
-                        )
-                        time.sleep(delay)
-                else:
-                    LOGGER.error("Classification failed after %s attempts: %s", self.config.max_retries + 1, exc)
-                    return self._fallback_classifications(reviews)
-
-    def _classify_unclassified_batch(
+                delay, slot = self._retry_plan(attempt, exc, label, slot, model)
+                if delay is None:
+                    break
+                time.sleep(delay)
+                continue
+            if omitted:
+                retried = self._classify_pass(omitted, prompt_prefix, label, slot, retry_omitted=False)
+                results = _fill_omitted(results, retried)
+            return results
+        return self._fallback_classifications(reviews)
+
+    async def _classify_pass_async(
         self,
         reviews: List[ReviewModel],
+        prompt_prefix: str,
+        label: str,
+        slot: int = 0,
+        retry_omitted: bool | None = None,
     ) -> List[ReviewClassification]:
-        """Classify a batch of previously unclassified reviews using a stricter prompt."""
-        reviews_text = self._format_reviews_for_prompt(reviews)
-
-        # Build a theme_ids string that excludes the default "unclassified"
-        all_ids = [tid.strip() for tid in get_all_theme_ids()]
-        allowed_ids = [tid for tid in all_ids if tid != DEFAULT_THEME_ID]
-        theme_ids_no_unclassified = ", ".join(allowed_ids)
-
-        prompt = UNCLASSIFIED_REVIEW_PROMPT_TEMPLATE.format(
-            themes_list=self.themes_list,
-            theme_ids_no_unclassified=theme_ids_no_unclassified,
-            reviews_batch=reviews_text,
-        )
-
+        """Async twin of ``_classify_pass`` using ``generate_content_async``."""
+        if retry_omitted is None:
+            retry_omitted = self.config.retry_omitted_reviews
+        prompt = self._build_prompt(prompt_prefix, reviews)
         for attempt in range(self.config.max_retries + 1):
+            omitted: List[ReviewModel] | None = [] if retry_omitted else None
             try:
-                response = self.model.generate_content(
-                    prompt,
-                    generation_config=genai.GenerationConfig(
-                        temperature=self.config.temperature,
-                        response_mime_type="application/json",
-                    ),
-                )
-                parsed = self._parse_response(response.text or "")
-                if not parsed:
-                    raise ValueError("Empty classification payload (second pass)")
-                return self._build_classifications(parsed, reviews)
+                model = self._model_for(slot)
+                key = self._response_key(prompt, model)
+                items = self._cached_items(key)
+                if items is None:
+                    wait = self._request_wait(model)
+                    if wait:
+                        await asyncio.sleep(wait)
+                    response = await model.generate_content_async(prompt, generation_config=self._gen_config)
+                    items = self._store_reply(key, response.text or "")
+                results = self._accept_items(items, reviews, label, omitted, model)
             except Exception as exc:
-                error_message = str(exc).lower()
-                is_quota_error = "429" in str(exc) or "quota" in error_message or "rate limit" in error_message
-                
-                if attempt < self.config.max_retries:
-                    if is_quota_error:
-                        # Exponential backoff for quota errors: 30s, 60s, 120s, etc.
-                        delay = 30 * (2 ** attempt)
-                        LOGGER.warning(
-                            "Second-pass classification attempt %s failed with quota error: %s. Retrying after %ss...",
-                            attempt + 1, exc, delay
-                        )
-                        time.sleep(delay)
-                    else:
-                        # Shorter delay for other errors: 2s, 4s, 8s
-                        delay = 2 * (2 ** attempt)
-                        LOGGER.warning(
-                            "Second-pass classification attempt %s failed: %s. Retrying after %ss...",
-                            attempt + 1, exc, delay
-                        )
-                        time.sleep(delay)
-                else:
-                    LOGGER.error(
-                        "Second-pass classification failed after %s attempts: %s",
-                        self.config.max_retries + 1,
-                        exc,
-                    )
-                    # If second pass fails, fall back to original default/heuristic
-                    return self._fallback_classifications(reviews)
+                delay, slot = self._retry_plan(attempt, exc, label, slot, model)
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+                continue
+            if omitted:
+                retried = await self._classify_pass_async(omitted, prompt_prefix, label, slot, retry_omitted=False)
+                results = _fill_omitted(results, retried)
+            return results
+        return self._fallback_classifications(reviews)
+
+    def _classifications_from_response(
+        self,
+        response,
+        reviews: List[ReviewModel],
+        label: str,
+    ) -> List[ReviewClassification]:
+        return self._accept_items(self._parse_response(response.text or ""), reviews, label)
+
+    def _accept_items(
+        self,
+        parsed: List,
+        reviews: List[ReviewModel],
+        label: str,
+        omitted: List[ReviewModel] | None = None,
+        model=None,
+    ) -> List[ReviewClassification]:
+        """Turn ``model``'s decoded reply into classifications; an empty reply counts as a failed attempt."""
+        if not parsed:
+            raise ValueError(f"Empty {label.lower()} payload")
+        results = self._build_classifications(parsed, reviews, omitted)
+        self._breaker_for(self._pool_name(model)).record_success()
+        return results
+
+    def _retry_plan(
+        self, attempt: int, exc: Exception, label: str, slot: int, model=None
+    ) -> tuple[float | None, int]:
+        """What ``_classify_pass`` and its async twin do after ``model`` failed an attempt:
+        ``(backoff, slot)``, where a quota error moves the retry to the next parallel
+        model slot and the backoff is None once retries are exhausted."""
+        if _is_quota_error(exc):
+            slot += 1
+        return self._retry_delay(attempt, exc, label, model), slot
+
+    def _retry_delay(self, attempt: int, exc: Exception, label: str, model=None) -> float | None:
+        """Log a failed attempt of ``model`` (default: the primary) and return the backoff
+        before the next one (None when out of retries).
+
+        Delays use full jitter (uniform between 0 and the exponential cap) so batches
+        that failed together do not retry together; quota errors also feed the failing
+        model's circuit breaker and, when they persist on the primary, the model fallback.
+        """
+        is_quota_error = _is_quota_error(exc)
+        if is_quota_error:
+            failed_name = self._pool_name(model)
+            consecutive = self._breaker_for(failed_name).record_failure()
+            fallback_after = self.config.model_fallback_after
+            # An extra pool model only rotates out via its own breaker; it never
+            # replaces a healthy primary.
+            is_primary = model is None or model is self.model
+            if is_primary and fallback_after > 0 and consecutive >= fallback_after:
+                self._fall_back_model(failed_name)
+
+        if attempt >= self.config.max_retries:
+            LOGGER.error("%s failed after %s attempts: %s", label, self.config.max_retries + 1, exc)
+            return None
+
+        if is_quota_error:
+            # Quota errors: caps of 30s, 60s, 120s, etc.
+            delay = backoff_delay(attempt, 30.0)
+            LOGGER.warning(
+                "%s attempt %s failed with quota error: %s. Retrying after %.1fs...",
+                label, attempt + 1, exc, delay
+            )
+        else:
+            # Other errors: caps of 2s, 4s, 8s
+            delay = backoff_delay(attempt, 2.0)
+            LOGGER.warning(
+                "%s attempt %s failed: %s. Retrying after %.1fs...",
+                label, attempt + 1, exc, delay
+            )
+        return delay
 
     def _format_reviews_for_prompt(self, reviews: List[ReviewModel]) -> str:
         """Format reviews as text for prompt."""
-        lines = []
-        for review in reviews:
-            # Truncate text to avoid token limits
-            text_preview = review.text[:400] + ("..." if len(review.text) > 400 else "")
-            lines.append(f"review_id: {review.review_id}\ntitle: {review.title}\ntext: {text_preview}")
-        return "\n\n---\n\n".join(lines)
+        return format_reviews_for_prompt(reviews)
 
     def _parse_response(self, payload: str) -> List[Dict]:
-        """Parse LLM JSON response."""
-        cleaned = payload.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.strip("`")
-            if cleaned.startswith("json"):
-                cleaned = cleaned[4:].strip()
-            cleaned = cleaned.split("\n", 1)[-1] if "\n" in cleaned else cleaned
+        """Parse LLM JSON response.
+
+        Structured output (JSON mime type + response schema) returns bare JSON, so the
+        payload is decoded as-is; markdown fences are only stripped if that fails.
+        """
+        items = self._decode_items(payload)
+        if items is not None:
+            return items
+        cleaned = strip_code_fence(payload)
+        items = self._decode_items(cleaned)
+        if items is not None:
+            return items
+        LOGGER.warning("Failed to parse JSON response. Raw: %s", cleaned[:200])
+        return []
+
+    @staticmethod
+    def _decode_items(text: str) -> List[Dict] | None:
+        """Classification items in ``text``, or None if it is not valid JSON."""
+        if msgspec is not None:
+            # Fast path for the expected shape (a JSON array of objects); anything
+            # else (wrapped/single objects, nulls) goes through the generic path.
+            try:
+                return _LLM_ITEMS_DECODER.decode(text)
+            except msgspec.DecodeError:
+                pass
 
         try:
-            data = json.loads(cleaned)
-            if isinstance(data, list):
-                return data
-            if isinstance(data, dict) and "reviews" in data:
-                return data["reviews"]
-            return [data]  # Single object wrapped
-        except json.JSONDecodeError as exc:
-            LOGGER.warning("Failed to parse JSON response: %s. Raw: %s", exc, cleaned[:200])
-            return []
+            data = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return None
+        if isinstance(data, list):
+            return data
+        if isinstance(data, dict) and "reviews" in data:
+            return data["reviews"]
+        return [data]  # Single object wrapped
 
     def _build_classifications(
         self,
         parsed: List[Dict],
         original_reviews: List[ReviewModel],
+        omitted: List[ReviewModel] | None = None,
     ) -> List[ReviewClassification]:
-        """Build ReviewClassification objects from parsed LLM response."""
-        review_lookup = {r.review_id: r for r in original_reviews}
-        classifications: List[ReviewClassification] = []
+        """Build ReviewClassification objects from parsed LLM response, in review order.
 
+        With an ``omitted`` list, reviews missing from the reply are appended to it and
+        left as ``None`` slots for the caller to fill (see ``_fill_omitted``) instead
+        of getting the heuristic fallback.
+        """
+        # First item per review_id wins; repeats in the model output are dropped.
+        parsed_by_id: Dict[str, Dict] = {}
         for item in parsed:
-            review_id = item.get("review_id", "")
-            if not review_id or review_id not in review_lookup:
-                LOGGER.warning("Skipping classification with invalid review_id: %s", review_id)
-                continue
+            parsed_by_id.setdefault(item.get("review_id", ""), item)
 
-            theme_id_raw = item.get("chosen_theme", "").lower().strip()
-            
-            # Check if this is an LLM-suggested theme
-            suggested_name = item.get("suggested_theme_name", "").strip()
-            suggested_desc = item.get("suggested_theme_description", "").strip()
-            
-            if suggested_name and suggested_desc:
-                # This is a new LLM-suggested theme
+        classifications: List[ReviewClassification] = []
+        for review in original_reviews:
+            item = parsed_by_id.pop(review.review_id, None)
+            if item is not None:
+                classifications.append(self._classification_from_item(item, review))
+            elif omitted is not None:
+                omitted.append(review)
+                classifications.append(None)
+            else:
+                classifications.append(self._fallback_for_missing(review))
+
+        for review_id in parsed_by_id:
+            LOGGER.warning("Skipping classification with invalid review_id: %s", review_id)
+        return classifications
+
+    def _classification_from_item(self, item, review: ReviewModel) -> ReviewClassification:
+        """Classification for ``review`` from its item in the model output."""
+        theme_id_raw = item.get("chosen_theme", "").lower().strip()
+        reason = item.get("short_reason", "No reason provided")
+
+        # Check if this is an LLM-suggested theme
+        suggested_name = item.get("suggested_theme_name", "").strip()
+        suggested_desc = item.get("suggested_theme_description", "").strip()
+
+        if suggested_name and suggested_desc:
+            # This is a new LLM-suggested theme (batches may run concurrently)
+            with self._suggested_lock:
                 if theme_id_raw not in self.llm_suggested_themes:
                     self.llm_suggested_themes[theme_id_raw] = ThemeDefinition(
                         id=theme_id_raw,
@@ -599,73 +1608,49 @@ class GeminiThemeClassifier:
                         suggested_name, theme_id_raw, suggested_desc[:80]
                     )
                 theme = self.llm_suggested_themes[theme_id_raw]
-                theme_id = theme_id_raw
-            else:
-                # Use existing validation logic for predefined/discovered themes
-                theme_id = self._validate_theme_id(theme_id_raw)
-                
-                # Get theme definition (discovered or predefined)
-                if self.use_discovered:
-                    discovered = next(
-                        (t for t in self.discovered_themes if t.theme_id.lower() == theme_id),
-                        None
-                    )
-                    if discovered:
-                        # Use discovered theme if not mapped, otherwise use predefined
-                        if discovered.mapped_to_predefined:
-                            theme = get_theme_by_id(discovered.mapped_to_predefined)
-                        else:
-                            # Create a temporary theme definition from discovered theme
-                            theme = ThemeDefinition(
-                                id=discovered.theme_id,
-                                name=discovered.theme_name,
-                                description=discovered.description
-                            )
-                    else:
-                        theme = get_theme_by_id(theme_id)
-                else:
-                    theme = get_theme_by_id(theme_id)
-            
-            reason = item.get("short_reason", "No reason provided")
+            theme_id = theme_id_raw
+        else:
+            # Use existing validation logic for predefined/discovered themes
+            theme_id = self._validate_theme_id(theme_id_raw)
+
+            # Get theme definition (discovered or predefined)
+            theme = self._theme_defs.get(theme_id) or get_theme_by_id(theme_id)
+            # "unclassified" stays uncached so later runs still get the second pass;
+            # suggested themes are left out so they keep being recorded per run.
+            if self._cache_enabled and theme_id != DEFAULT_THEME_ID:
+                self._cache[self._cache_key(review)] = (theme_id, theme.name, reason)
+                self._cache_dirty = True
+
+        return ReviewClassification(
+            review_id=review.review_id,
+            theme_id=theme_id,
+            theme_name=theme.name,
+            reason=reason,
+        )
 
-            classifications.append(
-                ReviewClassification(
-                    review_id=review_id,
-                    theme_id=theme_id,
-                    theme_name=theme.name,
-                    reason=reason,
-                )
+    def _fallback_for_missing(self, review: ReviewModel) -> ReviewClassification:
+        """Heuristic (or default) classification for a review the model output left out."""
+        theme_id = self._heuristic_theme(review) or DEFAULT_THEME_ID
+        theme = get_theme_by_id_lc(theme_id)
+        reason = (
+            "Heuristic assignment (LLM output invalid)"
+            if theme_id != DEFAULT_THEME_ID
+            else "Default assignment (classification failed)"
+        )
+        if theme_id == DEFAULT_THEME_ID:
+            LOGGER.warning("Review %s not classified; using default theme", review.review_id)
+        else:
+            LOGGER.info(
+                "Review %s assigned via heuristic to %s",
+                review.review_id,
+                theme.name,
             )
-
-        # Handle reviews that weren't classified
-        classified_ids = {c.review_id for c in classifications}
-        for review in original_reviews:
-            if review.review_id not in classified_ids:
-                theme_id = self._heuristic_theme(review) or DEFAULT_THEME_ID
-                theme = get_theme_by_id(theme_id)
-                reason = (
-                    "Heuristic assignment (LLM output invalid)"
-                    if theme_id != DEFAULT_THEME_ID
-                    else "Default assignment (classification failed)"
-                )
-                if theme_id == DEFAULT_THEME_ID:
-                    LOGGER.warning("Review %s not classified; using default theme", review.review_id)
-                else:
-                    LOGGER.info(
-                        "Review %s assigned via heuristic to %s",
-                        review.review_id,
-                        theme.name,
-                    )
-                classifications.append(
-                    ReviewClassification(
-                        review_id=review.review_id,
-                        theme_id=theme_id,
-                        theme_name=theme.name,
-                        reason=reason,
-                    )
-                )
-
-        return classifications
+        return ReviewClassification(
+            review_id=review.review_id,
+            theme_id=theme_id,
+            theme_name=theme.name,
+            reason=reason,
+        )
 
     def _validate_theme_id(self, theme_id: str) -> str:
         """Validate and normalize theme ID, with fallback to default."""
@@ -677,10 +1662,7 @@ class GeminiThemeClassifier:
         
         if self.use_discovered:
             # Check if it's a discovered theme
-            discovered = next(
-                (t for t in self.discovered_themes if t.theme_id.lower() == theme_id),
-                None
-            )
+            discovered = self._discovered_by_id.get(theme_id)
             if discovered:
                 # If mapped to predefined, return predefined theme_id
                 if discovered.mapped_to_predefined:
@@ -697,22 +1679,24 @@ class GeminiThemeClassifier:
                 return theme_id
             
             # Try fuzzy matching with discovered themes
-            for discovered_theme in self.discovered_themes:
-                if theme_id in discovered_theme.theme_id or discovered_theme.theme_id in theme_id:
-                    if discovered_theme.mapped_to_predefined:
-                        return discovered_theme.mapped_to_predefined
-                    # Return discovered theme_id even if unmapped
-                    return discovered_theme.theme_id
+            position = self._discovered_matcher.match(theme_id)
+            if position is not None:
+                discovered_theme = self.discovered_themes[position]
+                if discovered_theme.mapped_to_predefined:
+                    return discovered_theme.mapped_to_predefined
+                # Return discovered theme_id even if unmapped
+                return discovered_theme.theme_id
         
         # Fallback to predefined themes
         if theme_id in FIXED_THEMES:
             return theme_id
 
         # Try fuzzy matching with predefined themes
-        for valid_id in FIXED_THEMES.keys():
-            if valid_id in theme_id or theme_id in valid_id:
-                LOGGER.debug("Fuzzy matched theme_id '%s' to '%s'", theme_id, valid_id)
-                return valid_id
+        position = FIXED_THEME_MATCHER.match(theme_id)
+        if position is not None:
+            valid_id = FIXED_THEME_MATCHER.ids[position]
+            LOGGER.debug("Fuzzy matched theme_id '%s' to '%s'", theme_id, valid_id)
+            return valid_id
 
         # If not found in predefined/discovered, check if it's a valid-looking new theme
         # (contains only alphanumeric, underscores, and hyphens, not empty, reasonable length)
@@ -731,7 +1715,7 @@ class GeminiThemeClassifier:
         fallback: List[ReviewClassification] = []
         for review in reviews:
             theme_id = self._heuristic_theme(review) or DEFAULT_THEME_ID
-            theme = get_theme_by_id(theme_id)
+            theme = get_theme_by_id_lc(theme_id)
             reason = (
                 "Heuristic assignment (LLM classification failed)"
                 if theme_id != DEFAULT_THEME_ID
@@ -747,14 +1731,36 @@ class GeminiThemeClassifier:
             )
         return fallback
 
+    def _lowered(self, review: ReviewModel) -> str:
+        """Lowercased ``"title text"`` of a review, built once per run for the
+        pre-filter (``_heuristic_theme`` scans title and text separately instead)."""
+        cached = self._lowered_cache.get(review.review_id)
+        # Reviews are mutable (sanitisation rewrites them), so only reuse an entry
+        # built from the very same title/text strings.
+        if cached is not None and cached[0] is review.title and cached[1] is review.text:
+            return cached[2]
+        lowered = f"{review.title} {review.text}".lower()
+        self._lowered_cache[review.review_id] = (review.title, review.text, lowered)
+        return lowered
+
     def _heuristic_theme(self, review: ReviewModel) -> str | None:
-        text = f"{review.title} {review.text}".lower()
-        for theme_id, compiled_patterns in HEURISTIC_PATTERNS.items():
-            if any(pattern.search(text) for pattern in compiled_patterns):
-                return theme_id
-        return None
+        # Title and text are scanned separately (no concatenated copy); a top-priority
+        # hit in the title skips the text, otherwise the text only needs higher themes.
+        best = _heuristic_rank(review.title.lower()) if review.title else None
+        if best == 0:
+            return HEURISTIC_PRIORITY[0]
+        text_rank = _heuristic_rank(review.text.lower(), below=best)
+        if text_rank is not None:
+            best = text_rank
+        return HEURISTIC_PRIORITY[best] if best is not None else None
 
     def get_llm_suggested_themes(self) -> Dict[str, ThemeDefinition]:
         """Get all LLM-suggested themes from this classification run."""
         return self.llm_suggested_themes.copy()
 
+
+    def close(self) -> None:
+        """Release the reply cache's SQLite connection, if open."""
+        response_cache, self._response_cache = self._response_cache, None
+        if response_cache is not None:
+            response_cache.close()
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
+from functools import cache
+from types import MappingProxyType
 from typing import Dict
 
+from .theme_discovery import DiscoveredTheme
+
 
 @dataclass(slots=True)
 class ThemeDefinition:
@@ -52,10 +57,20 @@ FIXED_THEMES: Dict[str, ThemeDefinition] = {
 # Default theme for invalid/empty classifications
 DEFAULT_THEME_ID = "unclassified"
 
+# Read-only lowercase-ID view of FIXED_THEMES; keys are interned so probes with
+# interned IDs (the constants above, validated model output) match by identity.
+_LC_THEMES = MappingProxyType({sys.intern(theme_id.lower()): theme for theme_id, theme in FIXED_THEMES.items()})
+_DEFAULT_THEME = _LC_THEMES[DEFAULT_THEME_ID]
+
 
 def get_theme_by_id(theme_id: str) -> ThemeDefinition:
     """Get theme definition by ID, with fallback to default."""
-    return FIXED_THEMES.get(theme_id.lower(), FIXED_THEMES[DEFAULT_THEME_ID])
+    return _LC_THEMES.get(theme_id.lower(), _DEFAULT_THEME)
+
+
+def get_theme_by_id_lc(theme_id: str) -> ThemeDefinition:
+    """Like get_theme_by_id, for callers whose ID is already lowercase."""
+    return _LC_THEMES.get(theme_id, _DEFAULT_THEME)
 
 
 def get_all_theme_ids() -> list[str]:
@@ -63,8 +78,9 @@ def get_all_theme_ids() -> list[str]:
     return list(FIXED_THEMES.keys())
 
 
+@cache
 def format_themes_for_prompt() -> str:
-    """Format themes for LLM classification prompt."""
+    """Format themes for LLM classification prompt (built once; FIXED_THEMES is constant)."""
     lines = []
     for idx, (theme_id, theme) in enumerate(FIXED_THEMES.items(), start=1):
         lines.append(f"{idx}. {theme.name} ({theme_id}) – {theme.description}")
@@ -86,10 +102,9 @@ def get_theme_by_id_or_discovered(
         ThemeDefinition (from discovered theme or predefined theme)
     """
     if discovered_themes:
-        from .theme_discovery import DiscoveredTheme
-        
+        wanted = theme_id.lower()
         discovered = next(
-            (t for t in discovered_themes if isinstance(t, DiscoveredTheme) and t.theme_id.lower() == theme_id.lower()),
+            (t for t in discovered_themes if isinstance(t, DiscoveredTheme) and t.theme_id.lower() == wanted),
             None
         )
         if discovered:
@@ -2,21 +2,34 @@
 
 from __future__ import annotations
 
-import json
+import importlib
+import io
 import logging
 import os
-import random
-from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
+import time
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
 
-from google import generativeai as genai
+import numpy as np
+import orjson
 
 from ..layer1.validator import ReviewModel
+from ._fastpath import strip_code_fence
 
 LOGGER = logging.getLogger(__name__)
 
+_GENAI = None
+
+
+def _genai():
+    """``google.generativeai``, imported on first use: parsing, saving and mapping
+    discovered themes (ThemeMapper imports DiscoveredTheme) never pay for grpc/protobuf."""
+    global _GENAI
+    if _GENAI is None:
+        _GENAI = importlib.import_module("google.generativeai")
+    return _GENAI
+
 THEME_DISCOVERY_PROMPT = """Analyze the following app reviews and identify exactly 4 distinct themes/categories.
 
 Reviews sample:
@@ -68,14 +81,22 @@ class DiscoveredTheme:
     confidence: float = 0.0  # Mapping confidence score
 
     def to_dict(self) -> dict:
-        """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        """Convert to dictionary for JSON serialization (``keywords`` is shared, not copied)."""
+        return {
+            "theme_id": self.theme_id,
+            "theme_name": self.theme_name,
+            "description": self.description,
+            "keywords": self.keywords,
+            "mapped_to_predefined": self.mapped_to_predefined,
+            "confidence": self.confidence,
+        }
 
 
 class ThemeDiscovery:
     """Discovers themes from review samples using LLM."""
 
     MAX_THEMES = 4  # Limit to top 4 themes
+    MAX_PROMPT_CHARS = 15000  # Budget for the formatted review sample; later reviews are dropped
 
     def __init__(
         self,
@@ -85,6 +106,7 @@ class ThemeDiscovery:
         api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not api_key:
             raise RuntimeError("GEMINI_API_KEY is not set for theme discovery.")
+        genai = _genai()
         genai.configure(api_key=api_key)
         model_name = model_name or os.getenv("THEME_DISCOVERY_MODEL", "models/gemini-2.5-flash")
         self.model = genai.GenerativeModel(model_name)
@@ -121,7 +143,7 @@ class ThemeDiscovery:
         try:
             response = self.model.generate_content(
                 prompt,
-                generation_config=genai.GenerationConfig(
+                generation_config=_genai().GenerationConfig(
                     temperature=0.3,  # Slightly higher for creativity
                     response_mime_type="application/json",
                 ),
@@ -157,55 +179,53 @@ class ThemeDiscovery:
         if len(reviews) <= sample_size:
             return reviews
 
-        # Group by rating
-        by_rating: dict[int, List[ReviewModel]] = {}
-        for review in reviews:
-            rating = review.rating
-            if rating not in by_rating:
-                by_rating[rating] = []
-            by_rating[rating].append(review)
+        # Work on index arrays: per-rating buckets are masks, and the fill-up below is a
+        # set difference instead of a membership scan over the sampled reviews.
+        rng = np.random.default_rng()
+        ratings = np.fromiter((review.rating for review in reviews), dtype=np.int8, count=len(reviews))
 
         # Sample proportionally from each rating
-        sampled: List[ReviewModel] = []
-        for rating in sorted(by_rating.keys()):
-            rating_reviews = by_rating[rating]
-            proportion = len(rating_reviews) / len(reviews)
-            count = max(1, int(sample_size * proportion))
-            count = min(count, len(rating_reviews))
-            sampled.extend(random.sample(rating_reviews, count))
+        picked_parts: List[np.ndarray] = []
+        for rating in np.unique(ratings):
+            indices = np.flatnonzero(ratings == rating)
+            proportion = len(indices) / len(reviews)
+            count = min(max(1, int(sample_size * proportion)), len(indices))
+            picked_parts.append(rng.choice(indices, size=count, replace=False))
+        picked = np.concatenate(picked_parts)
 
         # If we still need more, fill randomly
-        if len(sampled) < sample_size:
-            remaining = [r for r in reviews if r not in sampled]
-            needed = sample_size - len(sampled)
-            if remaining:
-                sampled.extend(random.sample(remaining, min(needed, len(remaining))))
+        if len(picked) < sample_size:
+            remaining = np.setdiff1d(np.arange(len(reviews)), picked, assume_unique=True)
+            needed = min(sample_size - len(picked), len(remaining))
+            picked = np.concatenate([picked, rng.choice(remaining, size=needed, replace=False)])
 
-        return sampled[:sample_size]
+        return [reviews[index] for index in picked[:sample_size]]
 
     def _format_reviews(self, reviews: List[ReviewModel]) -> str:
-        """Format reviews as text for the discovery prompt."""
-        lines = []
+        """Format reviews as text for the discovery prompt, within ``MAX_PROMPT_CHARS``."""
+        buffer = io.StringIO()
+        total = 0
         for idx, review in enumerate(reviews, start=1):
             # Truncate text to avoid token limits
             text_preview = review.text[:300] + ("..." if len(review.text) > 300 else "")
-            lines.append(f"Review {idx} (Rating: {review.rating}/5):\n{text_preview}")
-        return "\n\n".join(lines)
+            piece = f"Review {idx} (Rating: {review.rating}/5):\n{text_preview}"
+            cost = len(piece) + (2 if total else 0)
+            if total + cost > self.MAX_PROMPT_CHARS:
+                LOGGER.info("Discovery prompt budget reached; using %s of %s sampled reviews", idx - 1, len(reviews))
+                break
+            if total:
+                buffer.write("\n\n")
+            buffer.write(piece)
+            total += cost
+        return buffer.getvalue()
 
     def _parse_themes(self, payload: str) -> List[DiscoveredTheme]:
         """Parse LLM JSON response into DiscoveredTheme objects."""
-        cleaned = payload.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.strip("`")
-            if cleaned.startswith("json"):
-                cleaned = cleaned[4:].strip()
-            # Remove first line if it's just "json"
-            if "\n" in cleaned:
-                cleaned = cleaned.split("\n", 1)[-1]
+        cleaned = strip_code_fence(payload)
 
         try:
-            data = json.loads(cleaned)
-        except json.JSONDecodeError as exc:
+            data = orjson.loads(cleaned)
+        except orjson.JSONDecodeError as exc:
             LOGGER.error("Failed to parse theme discovery JSON: %s. Raw: %s", exc, cleaned[:200])
             return []
 
@@ -255,15 +275,16 @@ class ThemeDiscovery:
         return discovered
 
     def save_discovered_themes(self, themes: List[DiscoveredTheme], output_path: Path) -> None:
-        """Save discovered themes for analysis."""
+        """Save discovered themes for analysis (atomically, via a temp file and rename)."""
         output_path.parent.mkdir(parents=True, exist_ok=True)
         data = {
-            "discovered_at": datetime.now(timezone.utc).isoformat(),
+            "discovered_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
             "theme_count": len(themes),
             "themes": [theme.to_dict() for theme in themes],
         }
-        with output_path.open("w", encoding="utf-8") as fh:
-            json.dump(data, fh, ensure_ascii=False, indent=2)
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, output_path)
         LOGGER.info("Saved %s discovered themes to %s", len(themes), output_path)
 
 
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-import json
 import os
 from dataclasses import dataclass
 from typing import Dict, List, Mapping
 
+import orjson
 from google import generativeai as genai
 
 from ..layer1.validator import ReviewModel
+from ._fastpath import strip_code_fence
 from .clustering import ClusterSummary
 
 PROMPT_TEMPLATE = """You are an insights analyst. Summarize the core theme expressed in the user feedback below.
@@ -91,13 +92,10 @@ class GeminiThemeLabeler:
 
     @staticmethod
     def _parse_response(payload: str) -> Dict:
-        cleaned = payload.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.strip("`")
-            cleaned = cleaned.split("\n", 1)[-1]
+        cleaned = strip_code_fence(payload)
         try:
-            return json.loads(cleaned)
-        except json.JSONDecodeError:
+            return orjson.loads(cleaned)
+        except orjson.JSONDecodeError:
             return {
                 "theme_name": cleaned[:50],
                 "summary": cleaned[:150],
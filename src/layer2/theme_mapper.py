@@ -4,13 +4,65 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+try:  # Optional dependency: JIT-compiled Jaccard kernel
+    import numba  # type: ignore
+except ImportError:  # pragma: no cover - optional
+    numba = None  # type: ignore
 
 from .theme_config import FIXED_THEMES, ThemeDefinition
 from .theme_discovery import DiscoveredTheme
 
 LOGGER = logging.getLogger(__name__)
 
+# Simple keyword extraction (words of 3+ characters)
+_WORD_RE = re.compile(r"\b\w{3,}\b")
+# Common stop words dropped from the predefined keyword indexes
+_STOP_WORDS = frozenset({
+    "the", "and", "for", "are", "but", "not", "you", "all", "can", "her", "was",
+    "one", "our", "out", "day", "get", "has", "him", "his", "how", "its", "may",
+    "new", "now", "old", "see", "two", "way", "who", "boy", "did", "she", "use",
+})
+
+_bitwise_count = getattr(np, "bitwise_count", None)  # NumPy >= 2.0
+
+
+def _row_popcounts(bits: np.ndarray) -> np.ndarray:
+    """Set bits per row of a packed (uint8) bit matrix."""
+    if _bitwise_count is not None:
+        return _bitwise_count(bits).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(bits, axis=1).sum(axis=1, dtype=np.int64)
+
+
+if numba is not None:
+    _POPCOUNT8 = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.int64)
+
+    @numba.njit(cache=True)
+    def _jaccard_kernel(masks, query, sizes, query_size, popcount8):  # pragma: no cover - optional
+        scores = np.zeros(masks.shape[0])
+        for row in range(masks.shape[0]):
+            intersection = 0
+            for col in range(masks.shape[1]):
+                intersection += popcount8[masks[row, col] & query[col]]
+            union = query_size + sizes[row] - intersection
+            if union > 0:
+                scores[row] = intersection / union
+        return scores
+
+
+def _jaccard_scores(masks: np.ndarray, query: np.ndarray, sizes: np.ndarray, query_size: int) -> np.ndarray:
+    """Jaccard similarity of the packed ``query`` row against every packed row of ``masks``."""
+    if numba is not None:
+        # One fused loop per row instead of the temporaries of the numpy expression.
+        return _jaccard_kernel(masks, query, sizes, query_size, _POPCOUNT8)
+    intersection = _row_popcounts(masks & query)
+    # Words outside the shared vocabulary still count towards the union.
+    union = query_size + sizes - intersection
+    return np.divide(intersection, union, out=np.zeros(len(union)), where=union > 0)
+
 
 class ThemeMapper:
     """Maps discovered themes to predefined themes using multiple strategies."""
@@ -21,22 +73,39 @@ class ThemeMapper:
         self._build_keyword_indexes()
 
     def _build_keyword_indexes(self) -> None:
-        """Build keyword indexes from predefined theme descriptions."""
+        """Build keyword indexes from predefined theme descriptions.
+
+        The predefined side never changes, so its word sets are tokenized once here
+        and ``_match_all`` only does set operations per predefined theme. Description
+        words are also packed into one bitmask row per theme over their shared
+        vocabulary, so Jaccard scores for all themes are a single numpy expression.
+        """
         self.keyword_indexes: Dict[str, List[str]] = {}
+        self._keyword_sets: Dict[str, FrozenSet[str]] = {}
+        self._description_words: Dict[str, FrozenSet[str]] = {}
+        self._names: Dict[str, str] = {}
+        self._name_words: Dict[str, FrozenSet[str]] = {}
         for theme_id, theme in self.predefined.items():
             # Extract keywords from description and name
-            text = f"{theme.name} {theme.description}".lower()
-            # Simple keyword extraction (words of 3+ characters)
-            words = re.findall(r"\b\w{3,}\b", text)
-            # Remove common stop words
-            stop_words = {
-                "the", "and", "for", "are", "but", "not", "you", "all", "can", "her", "was",
-                "one", "our", "out", "day", "get", "has", "him", "his", "how", "its", "may",
-                "new", "now", "old", "see", "two", "way", "who", "boy", "did", "she", "use",
-            }
-            keywords = [w for w in words if w not in stop_words]
+            name = theme.name.lower()
+            text = f"{name} {theme.description.lower()}"
+            words = _WORD_RE.findall(text)
+            keywords = [w for w in words if w not in _STOP_WORDS]
             # Take top 10 most relevant keywords
             self.keyword_indexes[theme_id] = keywords[:10]
+            self._keyword_sets[theme_id] = frozenset(keywords[:10])
+            self._description_words[theme_id] = frozenset(words)
+            self._names[theme_id] = name
+            self._name_words[theme_id] = frozenset(name.split())
+
+        self._theme_order: List[str] = list(self.predefined)
+        vocab = sorted(frozenset().union(*self._description_words.values()))
+        self._vocab: Dict[str, int] = {word: index for index, word in enumerate(vocab)}
+        dense = np.zeros((len(self._theme_order), len(vocab)), dtype=bool)
+        for row, theme_id in enumerate(self._theme_order):
+            dense[row, [self._vocab[word] for word in self._description_words[theme_id]]] = True
+        self._description_masks = np.packbits(dense, axis=1)
+        self._description_sizes = dense.sum(axis=1, dtype=np.int64)
 
     def map_theme(self, discovered: DiscoveredTheme) -> Tuple[Optional[str], float]:
         """
@@ -48,9 +117,10 @@ class ThemeMapper:
         Returns:
             Tuple of (predefined_theme_id, confidence_score) or (None, 0.0)
         """
+        keyword_match, desc_match, name_match = self._match_all(discovered)
+
         # Strategy 1: Keyword matching (highest priority)
-        keyword_match = self._match_by_keywords(discovered)
-        if keyword_match and keyword_match[1] > 0.7:
+        if keyword_match[0] and keyword_match[1] > 0.7:
             LOGGER.debug(
                 "Mapped '%s' to '%s' via keywords (confidence: %.2f)",
                 discovered.theme_id, keyword_match[0], keyword_match[1]
@@ -58,8 +128,7 @@ class ThemeMapper:
             return keyword_match
 
         # Strategy 2: Description similarity
-        desc_match = self._match_by_description(discovered)
-        if desc_match and desc_match[1] > 0.6:
+        if desc_match[0] and desc_match[1] > 0.6:
             LOGGER.debug(
                 "Mapped '%s' to '%s' via description (confidence: %.2f)",
                 discovered.theme_id, desc_match[0], desc_match[1]
@@ -67,8 +136,7 @@ class ThemeMapper:
             return desc_match
 
         # Strategy 3: Fuzzy string matching on theme names
-        name_match = self._match_by_name_fuzzy(discovered)
-        if name_match and name_match[1] > 0.5:
+        if name_match[0] and name_match[1] > 0.5:
             LOGGER.debug(
                 "Mapped '%s' to '%s' via name fuzzy match (confidence: %.2f)",
                 discovered.theme_id, name_match[0], name_match[1]
@@ -78,94 +146,65 @@ class ThemeMapper:
         LOGGER.debug("No mapping found for discovered theme '%s'", discovered.theme_id)
         return None, 0.0
 
-    def _match_by_keywords(self, discovered: DiscoveredTheme) -> Tuple[Optional[str], float]:
-        """Match discovered theme to predefined theme using keywords."""
-        best_match: Optional[str] = None
-        best_score = 0.0
-
+    def _match_all(
+        self, discovered: DiscoveredTheme
+    ) -> Tuple[Tuple[Optional[str], float], Tuple[Optional[str], float], Tuple[Optional[str], float]]:
+        """Best (theme_id, score) per strategy - keywords, description, fuzzy name -
+        from one pass over the predefined themes, tokenizing the discovered theme once."""
         discovered_keywords = [kw.lower() for kw in discovered.keywords]
-        discovered_text = f"{discovered.theme_name} {discovered.description}".lower()
-        discovered_words = set(re.findall(r"\b\w{3,}\b", discovered_text))
-        discovered_words.update(discovered_keywords)
-
-        for theme_id, theme in self.predefined.items():
-            # Count keyword overlaps
-            predefined_keywords = set(self.keyword_indexes.get(theme_id, []))
-            overlap = len(discovered_words.intersection(predefined_keywords))
-            if overlap == 0:
-                continue
-
-            # Calculate confidence score (0.0 to 1.0)
-            # Based on overlap ratio and keyword importance
-            max_possible = max(len(discovered_words), len(predefined_keywords))
-            score = overlap / max_possible if max_possible > 0 else 0.0
-
-            # Boost score if discovered keywords directly match
-            keyword_boost = sum(1 for kw in discovered_keywords if kw in predefined_keywords)
-            if keyword_boost > 0:
-                score = min(1.0, score + (keyword_boost * 0.1))
-
-            if score > best_score:
-                best_score = score
-                best_match = theme_id
-
-        return best_match, best_score
-
-    def _match_by_description(self, discovered: DiscoveredTheme) -> Tuple[Optional[str], float]:
-        """Match discovered theme to predefined theme using description similarity."""
-        best_match: Optional[str] = None
-        best_score = 0.0
-
-        discovered_text = f"{discovered.theme_name} {discovered.description}".lower()
-        discovered_words = set(re.findall(r"\b\w{3,}\b", discovered_text))
-
-        for theme_id, theme in self.predefined.items():
-            predefined_text = f"{theme.name} {theme.description}".lower()
-            predefined_words = set(re.findall(r"\b\w{3,}\b", predefined_text))
-
-            # Calculate Jaccard similarity
-            intersection = len(discovered_words.intersection(predefined_words))
-            union = len(discovered_words.union(predefined_words))
-            score = intersection / union if union > 0 else 0.0
-
-            if score > best_score:
-                best_score = score
-                best_match = theme_id
-
-        return best_match, best_score
-
-    def _match_by_name_fuzzy(self, discovered: DiscoveredTheme) -> Tuple[Optional[str], float]:
-        """Match discovered theme to predefined theme using fuzzy name matching."""
-        best_match: Optional[str] = None
-        best_score = 0.0
-
         discovered_name = discovered.theme_name.lower()
-        discovered_words = set(discovered_name.split())
-
-        for theme_id, theme in self.predefined.items():
-            predefined_name = theme.name.lower()
-            predefined_words = set(predefined_name.split())
-
-            # Check for exact word matches
-            word_overlap = len(discovered_words.intersection(predefined_words))
-            if word_overlap == 0:
-                continue
-
-            # Calculate score based on word overlap
-            max_words = max(len(discovered_words), len(predefined_words))
-            score = word_overlap / max_words if max_words > 0 else 0.0
-
-            # Check for substring matches (e.g., "ui_ux" contains "ui")
-            if any(word in predefined_name for word in discovered_words):
-                score = min(1.0, score + 0.2)
-            if any(word in discovered_name for word in predefined_words):
-                score = min(1.0, score + 0.2)
-
-            if score > best_score:
-                best_score = score
-                best_match = theme_id
-
-        return best_match, best_score
+        discovered_text = f"{discovered_name} {discovered.description.lower()}"
+        text_words = frozenset(_WORD_RE.findall(discovered_text))
+        keyword_words = text_words.union(discovered_keywords)
+        name_words = frozenset(discovered_name.split())
+
+        best_keyword: Tuple[Optional[str], float] = (None, 0.0)
+        best_desc = self._match_description(text_words)
+        best_name: Tuple[Optional[str], float] = (None, 0.0)
+
+        for theme_id in self.predefined:
+            # Keywords: overlap ratio, boosted by direct keyword hits
+            predefined_keywords = self._keyword_sets[theme_id]
+            overlap = len(keyword_words.intersection(predefined_keywords))
+            if overlap:
+                score = overlap / max(len(keyword_words), len(predefined_keywords))
+                keyword_boost = sum(1 for kw in discovered_keywords if kw in predefined_keywords)
+                if keyword_boost > 0:
+                    score = min(1.0, score + (keyword_boost * 0.1))
+                if score > best_keyword[1]:
+                    best_keyword = (theme_id, score)
+                    if score >= 1.0:
+                        # Nothing can beat it, and it clears the keyword threshold.
+                        break
+
+            # Name: word overlap plus substring bonuses (e.g., "ui_ux" contains "ui")
+            predefined_name_words = self._name_words[theme_id]
+            word_overlap = len(name_words.intersection(predefined_name_words))
+            if word_overlap:
+                predefined_name = self._names[theme_id]
+                score = word_overlap / max(len(name_words), len(predefined_name_words))
+                if any(word in predefined_name for word in name_words):
+                    score = min(1.0, score + 0.2)
+                if any(word in discovered_name for word in predefined_name_words):
+                    score = min(1.0, score + 0.2)
+                if score > best_name[1]:
+                    best_name = (theme_id, score)
+
+        return best_keyword, best_desc, best_name
+
+    def _match_description(self, words: FrozenSet[str]) -> Tuple[Optional[str], float]:
+        """Best Jaccard similarity between ``words`` and every predefined description,
+        via popcounts over the packed description bitmasks."""
+        if not self._theme_order:
+            return None, 0.0
+        columns = [self._vocab[word] for word in words if word in self._vocab]
+        query = np.zeros(len(self._vocab), dtype=bool)
+        query[columns] = True
+        scores = _jaccard_scores(self._description_masks, np.packbits(query), self._description_sizes, len(words))
+        best = int(np.argmax(scores))  # first theme among equal scores
+        if scores[best] <= 0.0:
+            return None, 0.0
+        return self._theme_order[best], float(scores[best])
 
     def map_all_themes(self, discovered_themes: List[DiscoveredTheme]) -> List[DiscoveredTheme]:
         """
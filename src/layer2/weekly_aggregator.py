@@ -2,16 +2,17 @@
 
 from __future__ import annotations
 
-import json
 import logging
-from collections import defaultdict
+from collections import Counter, defaultdict
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List
 
+import orjson
+
 from ..layer1.validator import ReviewModel
-from .theme_classifier import ReviewClassification
+from .theme_classifier import ClassificationBatch, ReviewClassification
 from .theme_config import FIXED_THEMES
 
 LOGGER = logging.getLogger(__name__)
@@ -42,12 +43,15 @@ class WeeklyThemeAggregator:
     def aggregate(
         self,
         reviews: List[ReviewModel],
-        classifications: List[ReviewClassification],
+        classifications: List[ReviewClassification] | ClassificationBatch,
         weekly_dir: Path,
     ) -> ThemeAggregationResult:
         """Aggregate theme counts by week from weekly JSON files."""
-        # Build lookup: review_id -> classification
-        classification_lookup = {c.review_id: c for c in classifications}
+        # Build lookup: review_id -> theme_id
+        if isinstance(classifications, ClassificationBatch):
+            classification_lookup = classifications.theme_by_review()
+        else:
+            classification_lookup = {c.review_id: c.theme_id for c in classifications}
 
         # Load weekly files and group reviews by week
         weekly_data: Dict[str, List[ReviewModel]] = defaultdict(list)
@@ -72,17 +76,13 @@ class WeeklyThemeAggregator:
 
         # Build weekly counts
         weekly_counts: List[WeeklyThemeCounts] = []
-        overall_counts: Dict[str, int] = defaultdict(int)
+        overall_counts: Counter[str] = Counter()
 
         for week_key in sorted(weekly_data.keys()):
             week_reviews = weekly_data[week_key]
-            theme_counts: Dict[str, int] = defaultdict(int)
-
-            for review in week_reviews:
-                classification = classification_lookup.get(review.review_id)
-                if classification:
-                    theme_counts[classification.theme_id] += 1
-                    overall_counts[classification.theme_id] += 1
+            # Only classified reviews were grouped above, so every lookup hits.
+            theme_counts = Counter(classification_lookup[review.review_id] for review in week_reviews)
+            overall_counts.update(theme_counts)
 
             # Extract week dates from first review or week_key
             week_start, week_end = self._parse_week_key(week_key)
@@ -106,8 +106,7 @@ class WeeklyThemeAggregator:
 
     def _load_weekly_file(self, week_file: Path) -> List[ReviewModel]:
         """Load reviews from a weekly JSON file."""
-        with week_file.open("r", encoding="utf-8") as fh:
-            data = json.load(fh)
+        data = orjson.loads(week_file.read_bytes())
         reviews = []
         for item in data:
             try:
@@ -137,14 +136,14 @@ class WeeklyThemeAggregator:
         # Get Monday of the week
         days_since_monday = date.weekday()
         monday = date.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days_since_monday)
-        return monday.strftime("%Y-%m-%d")
+        return monday.date().isoformat()
 
     def _parse_week_key(self, week_key: str) -> tuple[str, str]:
         """Parse week key into start and end dates."""
         try:
-            week_start = datetime.strptime(week_key, "%Y-%m-%d")
+            week_start = datetime.fromisoformat(week_key).date()
             week_end = week_start + timedelta(days=6)
-            return week_start.strftime("%Y-%m-%d"), week_end.strftime("%Y-%m-%d")
+            return week_start.isoformat(), week_end.isoformat()
         except Exception:
             return week_key, week_key
 
@@ -156,7 +155,6 @@ class WeeklyThemeAggregator:
             "overall_counts": result.overall_counts,
             "top_themes": [{"theme_id": tid, "count": count} for tid, count in result.top_themes],
         }
-        with output_path.open("w", encoding="utf-8") as fh:
-            json.dump(data, fh, ensure_ascii=False, indent=2)
+        output_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         LOGGER.info("Saved theme aggregation to %s", output_path)
 
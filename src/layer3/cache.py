@@ -4,11 +4,13 @@ Simple JSON-backed cache for Layer 3 chunk summaries.
 
 from __future__ import annotations
 
-import json
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Optional
 
+import orjson
+
 from .models import ChunkSummary
 
 LOGGER = logging.getLogger(__name__)
@@ -21,6 +23,9 @@ class ChunkSummaryCache:
         self.cache_path = cache_path
         self._store: Dict[str, Dict] = {}
         self._dirty = False
+        self._dir_ready = False
+        # Weeks are summarized on worker threads that share one cache.
+        self._lock = threading.Lock()
         self._load()
 
     def get(self, key: str) -> Optional[ChunkSummary]:
@@ -35,29 +40,31 @@ class ChunkSummaryCache:
         )
 
     def set(self, key: str, summary: ChunkSummary) -> None:
-        self._store[key] = {
-            "theme_id": summary.theme_id,
-            "theme_name": summary.theme_name,
-            "key_points": summary.key_points,
-            "candidate_quotes": summary.candidate_quotes,
-        }
-        self._dirty = True
+        with self._lock:
+            self._store[key] = {
+                "theme_id": summary.theme_id,
+                "theme_name": summary.theme_name,
+                "key_points": summary.key_points,
+                "candidate_quotes": summary.candidate_quotes,
+            }
+            self._dirty = True
 
     def persist(self) -> None:
-        if not self._dirty:
-            return
-        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.cache_path.open("w", encoding="utf-8") as fh:
-            json.dump(self._store, fh, ensure_ascii=False, indent=2)
-        LOGGER.debug("Persisted Layer 3 chunk cache to %s", self.cache_path)
-        self._dirty = False
+        with self._lock:
+            if not self._dirty:
+                return
+            if not self._dir_ready:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                self._dir_ready = True
+            self.cache_path.write_bytes(orjson.dumps(self._store, option=orjson.OPT_INDENT_2))
+            LOGGER.debug("Persisted Layer 3 chunk cache to %s", self.cache_path)
+            self._dirty = False
 
     def _load(self) -> None:
         if not self.cache_path.exists():
             return
         try:
-            with self.cache_path.open("r", encoding="utf-8") as fh:
-                self._store = json.load(fh)
+            self._store = orjson.loads(self.cache_path.read_bytes())
         except Exception as exc:
             LOGGER.warning("Failed to load chunk cache %s: %s", self.cache_path, exc)
             self._store = {}
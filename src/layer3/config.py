@@ -6,17 +6,23 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=None)
 def _env_int(var_name: str, default: int) -> int:
     """Read integer configuration from environment variables."""
+    raw = os.environ.get(var_name)
+    if raw is None:
+        return default
     try:
-        return int(os.getenv(var_name, default))
-    except (TypeError, ValueError):
+        return int(raw)
+    except ValueError:
         return default
 
 
+@lru_cache(maxsize=None)
 def _env_str(var_name: str, default: str) -> str:
     """Return default when env var is unset or blank."""
     value = os.getenv(var_name)
@@ -25,6 +31,7 @@ def _env_str(var_name: str, default: str) -> str:
     return value.strip()
 
 
+@lru_cache(maxsize=None)
 def _env_bool(var_name: str, default: bool) -> bool:
     value = os.getenv(var_name)
     if value is None:
@@ -32,13 +39,25 @@ def _env_bool(var_name: str, default: bool) -> bool:
     return value.strip().lower() in {"1", "true", "yes", "on"}
 
 
-@dataclass(slots=True)
+def clear_config_cache() -> None:
+    """Forget env values read so far; the next Layer3Config() re-reads the environment."""
+    _env_int.cache_clear()
+    _env_str.cache_clear()
+    _env_bool.cache_clear()
+
+
+_DEFAULT_WEEKLY_DIR = Path("data/raw/weekly")
+_DEFAULT_CLASSIFICATIONS_PATH = Path("data/processed/review_classifications.json")
+_DEFAULT_OUTPUT_DIR = Path("data/processed/weekly_pulse")
+
+
+@dataclass(frozen=True, slots=True)
 class Layer3Config:
     """Runtime configuration for Layer 3 summarization."""
 
-    weekly_dir: Path = field(default_factory=lambda: Path("data/raw/weekly"))
-    classifications_path: Path = field(default_factory=lambda: Path("data/processed/review_classifications.json"))
-    output_dir: Path = field(default_factory=lambda: Path("data/processed/weekly_pulse"))
+    weekly_dir: Path = _DEFAULT_WEEKLY_DIR
+    classifications_path: Path = _DEFAULT_CLASSIFICATIONS_PATH
+    output_dir: Path = _DEFAULT_OUTPUT_DIR
 
     chunk_size: int = field(default_factory=lambda: _env_int("LAYER3_CHUNK_SIZE", 20))
     max_key_points: int = field(default_factory=lambda: _env_int("LAYER3_MAX_KEY_POINTS", 5))
@@ -52,7 +71,8 @@ class Layer3Config:
     enable_chunk_cache: bool = field(default_factory=lambda: _env_bool("LAYER3_ENABLE_CACHE", True))
     skip_existing_notes: bool = field(default_factory=lambda: _env_bool("LAYER3_SKIP_EXISTING_NOTES", True))
     force_recent_weeks: int = field(default_factory=lambda: max(0, _env_int("LAYER3_FORCE_RECENT_WEEKS", 2)))
-    cache_path: Path = field(default_factory=lambda: Path(os.getenv("LAYER3_CACHE_PATH", "data/processed/layer3_chunk_cache.json")))
+    max_parallel_weeks: int = field(default_factory=lambda: max(1, _env_int("LAYER3_MAX_PARALLEL_WEEKS", 4)))
+    cache_path: Path = field(default_factory=lambda: Path(_env_str("LAYER3_CACHE_PATH", "data/processed/layer3_chunk_cache.json")))
 
     def ensure_output_dir(self) -> Path:
         """Create the output directory if it does not exist."""
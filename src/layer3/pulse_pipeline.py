@@ -4,22 +4,29 @@ High-level orchestration for generating weekly pulse notes.
 
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
-from datetime import datetime
+
+import orjson
 
 from .config import Layer3Config
 from .models import ThemeInsight, WeeklyPulseNote
 from .renderers import render_markdown
 from .review_loader import WeeklyReviewLoader
-from .theme_chunker import build_theme_chunks, select_top_theme_ids
+from .theme_chunker import build_theme_chunks_from_groups, group_reviews_by_theme, select_top_theme_ids_from_groups
 from .topic_summarizer import GeminiTopicSummarizer
 from .weekly_reducer import GeminiWeeklyReducer
 
 LOGGER = logging.getLogger(__name__)
 
+# Week file stems are "week_YYYY-MM-DD"; ISO dates sort chronologically as strings.
+_WEEK_STEM_RE = re.compile(r"week_(\d{4}-\d{2}-\d{2})")
+
 
 class WeeklyPulsePipeline:
     """Coordinates review loading, chunk summarization, and weekly note generation."""
@@ -50,22 +57,34 @@ class WeeklyPulsePipeline:
         if force_recent > 0:
             sorted_by_date = sorted(
                 week_files,
-                key=self._week_start_datetime,
+                key=self._week_start_key,
                 reverse=True,
             )
             force_set = set(sorted_by_date[:force_recent])
 
+        # One directory read instead of two stat() calls per week file.
+        with os.scandir(self.config.output_dir) as entries:
+            existing = frozenset(entry.name for entry in entries)
+        to_process: List[Path] = []
         for week_file in week_files:
             force_process = week_file in force_set
-            if self.config.skip_existing_notes and not force_process and self._note_exists(week_file):
+            note_exists = self._note_exists(week_file, existing)
+            if self.config.skip_existing_notes and not force_process and note_exists:
                 LOGGER.info("Skipping %s because weekly pulse already exists.", week_file.name)
                 continue
-            if force_process and self._note_exists(week_file):
+            if force_process and note_exists:
                 LOGGER.info("Rebuilding latest-week pulse for %s.", week_file.name)
-            note = self._process_week_file(week_file)
-            if note:
-                notes.append(note)
-                self._save_note(week_file, note)
+            to_process.append(week_file)
+
+        if to_process:
+            # Weeks are independent and dominated by Gemini latency, so their calls overlap;
+            # notes are saved here on the calling thread, in week order.
+            workers = min(self.config.max_parallel_weeks, len(to_process))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for week_file, note in zip(to_process, executor.map(self._process_week_file, to_process)):
+                    if note:
+                        notes.append(note)
+                        self._save_note(week_file, note)
         flush = getattr(self.topic_summarizer, "flush_cache", None)
         if callable(flush):
             flush()
@@ -78,13 +97,15 @@ class WeeklyPulsePipeline:
             LOGGER.info("Skipping %s (%s reviews < min %s).", week_file, len(reviews), self.config.min_reviews_per_week)
             return None
 
-        top_theme_ids = select_top_theme_ids(reviews, self.config.max_themes)
+        # One pass over the week's reviews serves both theme ranking and chunking.
+        grouped = group_reviews_by_theme(reviews)
+        top_theme_ids = select_top_theme_ids_from_groups(grouped, self.config.max_themes)
         if not top_theme_ids:
             LOGGER.info("No classified themes for %s; skipping.", week_file)
             return None
         LOGGER.info("Selected top themes for %s: %s", week_file.name, ", ".join(top_theme_ids))
 
-        chunks = build_theme_chunks(reviews, top_theme_ids, self.config.chunk_size)
+        chunks = build_theme_chunks_from_groups(grouped, top_theme_ids, self.config.chunk_size)
         if not chunks:
             LOGGER.info("No chunks generated for %s; skipping.", week_file)
             return None
@@ -104,43 +125,46 @@ class WeeklyPulsePipeline:
 
     def _save_note(self, week_file: Path, note: WeeklyPulseNote) -> Path:
         output_path = self._note_json_path(week_file)
-        with output_path.open("w", encoding="utf-8") as fh:
-            json.dump(note.as_dict(), fh, ensure_ascii=False, indent=2)
-        markdown = render_markdown(note)
+        note_dict = note.as_dict()
+        output_path.write_bytes(orjson.dumps(note_dict, option=orjson.OPT_INDENT_2))
         markdown_path = output_path.with_suffix(".md")
-        with markdown_path.open("w", encoding="utf-8") as fh:
-            fh.write(markdown)
-        LOGGER.info("Saved weekly pulse to %s (JSON) and %s (Markdown)", output_path, markdown_path)
+        # The Markdown ends with a hash of the note it was rendered from; a rebuilt week
+        # whose note came out unchanged keeps its file instead of re-rendering it.
+        digest = hashlib.blake2b(orjson.dumps(note_dict, option=orjson.OPT_SORT_KEYS), digest_size=8).hexdigest()
+        marker = f"<!-- note-hash: {digest} -->\n"
+        try:
+            up_to_date = markdown_path.read_text(encoding="utf-8").endswith(marker)
+        except OSError:
+            up_to_date = False
+        if up_to_date:
+            LOGGER.info("Saved weekly pulse to %s (JSON); %s is up to date", output_path, markdown_path)
+        else:
+            markdown_path.write_text(f"{render_markdown(note)}\n{marker}", encoding="utf-8")
+            LOGGER.info("Saved weekly pulse to %s (JSON) and %s (Markdown)", output_path, markdown_path)
         return output_path
 
     def _note_json_path(self, week_file: Path) -> Path:
-        output_filename = week_file.stem.replace("week_", "pulse_") + ".json"
-        return self.config.output_dir / output_filename
+        return self.config.output_dir / f"{self._note_stem(week_file)}.json"
+
+    @staticmethod
+    def _note_stem(week_file: Path) -> str:
+        return week_file.stem.replace("week_", "pulse_")
 
-    def _note_exists(self, week_file: Path) -> bool:
-        json_path = self._note_json_path(week_file)
-        markdown_path = json_path.with_suffix(".md")
-        return json_path.exists() and markdown_path.exists()
+    def _note_exists(self, week_file: Path, existing: frozenset[str]) -> bool:
+        """Whether both the JSON and Markdown note are in ``existing`` (the output directory's listing)."""
+        stem = self._note_stem(week_file)
+        return f"{stem}.json" in existing and f"{stem}.md" in existing
 
     @staticmethod
-    def _week_start_datetime(week_file: Path) -> datetime:
-        stem = week_file.stem
-        if stem.startswith("week_"):
-            try:
-                return datetime.strptime(stem[5:], "%Y-%m-%d")
-            except ValueError:
-                pass
-        return datetime.min
+    def _week_start_key(week_file: Path) -> str:
+        """Sort key in week-start order without parsing dates; unrecognized names sort first."""
+        match = _WEEK_STEM_RE.fullmatch(week_file.stem)
+        return match.group(1) if match else ""
 
     def _filter_insights(self, insights: List[ThemeInsight]) -> List[ThemeInsight]:
-        filtered: List[ThemeInsight] = []
-        for insight in insights:
-            if not insight.key_points:
-                LOGGER.info("Dropping theme %s: no key points.", insight.theme_name)
-                continue
-            if not insight.quotes:
-                LOGGER.info("Dropping theme %s: no quotes.", insight.theme_name)
-                continue
-            filtered.append(insight)
+        filtered = [insight for insight in insights if insight.key_points and insight.quotes]
+        if len(filtered) != len(insights):
+            dropped = [insight.theme_name for insight in insights if not (insight.key_points and insight.quotes)]
+            LOGGER.info("Dropped %s theme(s) without key points or quotes: %s", len(dropped), ", ".join(dropped))
         return filtered
 
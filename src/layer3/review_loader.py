@@ -4,12 +4,14 @@ Load weekly review slices and merge with Layer 2 classifications.
 
 from __future__ import annotations
 
-import json
 import logging
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Iterable, List, Tuple
 
+import orjson
+
 from ..layer1.validator import ReviewModel
 from .models import ClassifiedReview
 
@@ -22,6 +24,7 @@ class WeeklyReviewLoader:
     def __init__(self, weekly_dir: Path, classifications_path: Path) -> None:
         self.weekly_dir = weekly_dir
         self.classifications_path = classifications_path
+        # Parsed once here and joined against by every load_week call.
         self._classification_lookup = self._load_classifications()
 
     def list_week_files(self) -> List[Path]:
@@ -32,8 +35,7 @@ class WeeklyReviewLoader:
 
     def load_week(self, week_file: Path) -> Tuple[str, str, List[ClassifiedReview]]:
         """Load reviews for a given weekly file and attach classification metadata."""
-        with week_file.open("r", encoding="utf-8") as fh:
-            data = json.load(fh)
+        data = orjson.loads(week_file.read_bytes())
 
         week_start = data[0].get("week_start_date") if data else None
         week_end = data[0].get("week_end_date") if data else None
@@ -63,29 +65,32 @@ class WeeklyReviewLoader:
                     text=review.text,
                     rating=review.rating,
                     date=review.date,
-                    theme_id=classification["theme_id"],
-                    theme_name=classification["theme_name"],
+                    theme_id=classification[0],
+                    theme_name=classification[1],
                 )
             )
 
         return week_start or "", week_end or "", classified_reviews
 
-    def _load_classifications(self) -> Dict[str, Dict[str, str]]:
+    def _load_classifications(self) -> Dict[str, Tuple[str, str]]:
+        """(theme_id, theme_name) per review ID; the few distinct theme strings are
+        interned so the lookup holds one copy of each rather than one per review."""
         if not self.classifications_path.exists():
             LOGGER.warning("Classification file %s not found; Layer 3 will be skipped.", self.classifications_path)
             return {}
 
-        with self.classifications_path.open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
+        payload = orjson.loads(self.classifications_path.read_bytes())
 
-        lookup: Dict[str, Dict[str, str]] = {}
+        lookup: Dict[str, Tuple[str, str]] = {}
         for item in payload:
             review_id = item.get("review_id")
             if not review_id:
                 continue
-            lookup[review_id] = {
-                "theme_id": item.get("theme_id") or item.get("chosen_theme"),
-                "theme_name": item.get("theme_name") or item.get("theme_id"),
-            }
+            theme_id = item.get("theme_id") or item.get("chosen_theme")
+            theme_name = item.get("theme_name") or item.get("theme_id")
+            lookup[review_id] = (
+                sys.intern(theme_id) if isinstance(theme_id, str) else theme_id,
+                sys.intern(theme_name) if isinstance(theme_name, str) else theme_name,
+            )
         return lookup
 
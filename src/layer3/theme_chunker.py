@@ -4,6 +4,7 @@ Utilities for selecting top themes and chunking reviews for map-stage prompts.
 
 from __future__ import annotations
 
+import heapq
 from collections import Counter, defaultdict
 from typing import Dict, List
 
@@ -17,6 +18,11 @@ def select_top_theme_ids(reviews: List[ClassifiedReview], max_themes: int) -> Li
     return [theme_id for theme_id, _ in most_common]
 
 
+def select_top_theme_ids_from_groups(grouped: Dict[str, List[ClassifiedReview]], max_themes: int) -> List[str]:
+    """select_top_theme_ids over an existing grouping (ties keep first-seen order, as there)."""
+    return heapq.nlargest(max_themes, grouped, key=lambda theme_id: len(grouped[theme_id]))
+
+
 def group_reviews_by_theme(reviews: List[ClassifiedReview]) -> Dict[str, List[ClassifiedReview]]:
     grouped: Dict[str, List[ClassifiedReview]] = defaultdict(list)
     for review in reviews:
@@ -30,7 +36,15 @@ def build_theme_chunks(
     chunk_size: int,
 ) -> List[ThemeChunk]:
     """Split reviews for selected themes into manageable chunks."""
-    grouped = group_reviews_by_theme(reviews)
+    return build_theme_chunks_from_groups(group_reviews_by_theme(reviews), selected_theme_ids, chunk_size)
+
+
+def build_theme_chunks_from_groups(
+    grouped: Dict[str, List[ClassifiedReview]],
+    selected_theme_ids: List[str],
+    chunk_size: int,
+) -> List[ThemeChunk]:
+    """build_theme_chunks over reviews already grouped by group_reviews_by_theme."""
     chunks: List[ThemeChunk] = []
 
     for theme_id in selected_theme_ids:
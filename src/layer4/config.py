@@ -30,8 +30,11 @@ class Layer4Config:
     email_sender: str = field(default_factory=lambda: _env_or_default("EMAIL_SENDER", "noreply@example.com"))
     transport: str = field(default_factory=lambda: _env_or_default("EMAIL_TRANSPORT", "smtp"))  # smtp|gmail
     log_path: Path = field(default_factory=lambda: Path(os.getenv("LAYER4_EMAIL_LOG", "data/processed/email_logs.csv")))
+    log_flush_each_row: bool = field(default_factory=lambda: _env_bool("LAYER4_EMAIL_LOG_FLUSH_EACH_ROW", True))
     pulses_dir: Path = field(default_factory=lambda: Path(os.getenv("LAYER4_PULSES_DIR", os.getenv("LAYER3_OUTPUT_DIR", "data/processed/weekly_pulse"))))
     dry_run: bool = field(default_factory=lambda: _env_bool("EMAIL_DRY_RUN", True))
+    draft_cache_enabled: bool = field(default_factory=lambda: _env_bool("LAYER4_DRAFT_CACHE", True))  # Under pulses_dir/.draft_cache
+    max_parallel_drafts: int = field(default_factory=lambda: max(1, int(os.getenv("LAYER4_MAX_PARALLEL_DRAFTS", "4"))))
 
     # LLM configuration
     email_model_name: str = field(default_factory=lambda: _env_or_default("LAYER4_EMAIL_MODEL_NAME", _env_or_default("GEMINI_MODEL_NAME", "models/gemini-2.5-flash")))
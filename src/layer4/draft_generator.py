@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
 import time
 from dataclasses import asdict
+from pathlib import Path
 from typing import Tuple
 
+import orjson
 from google import generativeai as genai
 
 from .config import Layer4Config
@@ -30,12 +33,28 @@ class EmailDraftGenerator:
             raise RuntimeError("GEMINI_API_KEY is required for Layer 4.")
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(config.email_model_name)
+        self.cache_dir: Path | None = config.pulses_dir / ".draft_cache" if config.draft_cache_enabled else None
+        self._cache_dir_ready = False
 
     def generate(
         self,
         note: WeeklyPulseNote,
     ) -> Tuple[str, str]:
-        """Return (subject, body) text for the email."""
+        """Return (subject, body) text for the email.
+
+        LLM-written drafts are cached on disk by note content (and the model, product
+        and subject template), so a rerun for an unchanged note skips the LLM call.
+        Fallback-template drafts are not cached; a rerun tries the LLM again.
+        """
+        cache_path = self._cache_path(note) if self.cache_dir else None
+        if cache_path is not None and cache_path.exists():
+            try:
+                cached = orjson.loads(cache_path.read_bytes())
+                LOGGER.info("Reusing cached email draft for week %s-%s.", note.week_start, note.week_end)
+                return cached["subject"], cached["body"]
+            except (orjson.JSONDecodeError, KeyError, TypeError) as exc:
+                LOGGER.warning("Ignoring unreadable draft cache entry %s: %s", cache_path, exc)
+
         sanitized_note = sanitize_note(note)
         note_json = json.dumps(asdict(sanitized_note), ensure_ascii=False, indent=2)
         prompt = EMAIL_BODY_PROMPT.format(
@@ -54,6 +73,7 @@ class EmailDraftGenerator:
             LOGGER.error("Gemini email generation failed (%s); using fallback template.", exc)
             body = self._render_fallback_email(sanitized_note)
             body = self._scrub_pii(body, allow_llm=False)
+            cache_path = None
 
         if len(body.split()) > 350:
             LOGGER.warning("Email body exceeds 350 words; truncating softly.")
@@ -66,7 +86,33 @@ class EmailDraftGenerator:
             week_end=sanitized_note.week_end,
             title=sanitized_note.title,
         )
-        return subject.strip(), body
+        subject = subject.strip()
+        if cache_path is not None:
+            self._store_draft(cache_path, subject, body)
+        return subject, body
+
+    def _cache_path(self, note: WeeklyPulseNote) -> Path:
+        material = orjson.dumps(
+            {
+                "note": asdict(note),
+                "model": self.config.email_model_name,
+                "product": self.config.product_name,
+                "subject_template": self.config.subject_template,
+            },
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return self.cache_dir / f"{hashlib.blake2b(material, digest_size=16).hexdigest()}.json"
+
+    def _store_draft(self, cache_path: Path, subject: str, body: str) -> None:
+        try:
+            if not self._cache_dir_ready:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                self._cache_dir_ready = True
+            tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+            tmp_path.write_bytes(orjson.dumps({"subject": subject, "body": body}))
+            os.replace(tmp_path, cache_path)
+        except OSError as exc:
+            LOGGER.warning("Failed to cache email draft at %s: %s", cache_path, exc)
 
     def _invoke_model(self, prompt: str, retry: bool = True) -> str:
         try:
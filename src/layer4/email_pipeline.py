@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from typing import List
 
+import orjson
+
 from .config import Layer4Config
 from .draft_generator import EmailDraftGenerator
 from .email_models import EmailDraft, WeeklyPulseNote
@@ -14,6 +17,8 @@ from .email_sender import EmailSender
 
 LOGGER = logging.getLogger(__name__)
 
+NOTE_READ_WORKERS = 8  # Pulse files read concurrently by _load_notes
+
 
 class WeeklyEmailPipeline:
     """Reads weekly pulse notes and sends emails."""
@@ -50,32 +55,41 @@ class WeeklyEmailPipeline:
 
         drafts: List[EmailDraft] = []
         successful_sends = 0
-        for note in notes:
-            try:
-                subject, body = self.draft_generator.generate(note)
-                draft = EmailDraft(
-                    subject=subject,
-                    body=body,
-                    recipient=self.config.email_recipient,
-                    week_start=note.week_start,
-                    week_end=note.week_end,
-                    product_name=self.config.product_name,
-                )
-                drafts.append(draft)
-                self.sender.send(draft)
-                successful_sends += 1
-            except Exception as exc:
-                LOGGER.error(
-                    "Failed to generate/send email for week %s-%s: %s",
-                    note.week_start,
-                    note.week_end,
-                    exc,
-                    exc_info=True,
-                )
-                # Re-raise to ensure the pipeline fails if email sending fails
-                raise RuntimeError(
-                    f"Failed to send email for week {note.week_start}-{note.week_end}: {exc}"
-                ) from exc
+        # Drafts (one LLM call each) are generated concurrently. Gmail sends then go out
+        # together as a batched request; otherwise each draft is sent on this thread, in
+        # week order, as soon as it is ready. Sends stay off the worker threads because
+        # the Gmail client and the CSV send log are not safe to share across threads.
+        batch_send = not self.config.dry_run and self.config.transport.lower() == "gmail"
+        executor = ThreadPoolExecutor(max_workers=min(self.config.max_parallel_drafts, len(notes)))
+        try:
+            futures = [executor.submit(self._build_draft, note) for note in notes]
+            for note, future in zip(notes, futures):
+                try:
+                    draft = future.result()
+                    drafts.append(draft)
+                    if not batch_send:
+                        self.sender.send(draft)
+                        successful_sends += 1
+                except Exception as exc:
+                    LOGGER.error(
+                        "Failed to generate/send email for week %s-%s: %s",
+                        note.week_start,
+                        note.week_end,
+                        exc,
+                        exc_info=True,
+                    )
+                    # Re-raise to ensure the pipeline fails if email sending fails
+                    raise RuntimeError(
+                        f"Failed to send email for week {note.week_start}-{note.week_end}: {exc}"
+                    ) from exc
+            if batch_send and drafts:
+                successful_sends = len(self.sender.send_batch(drafts))
+        finally:
+            # On failure, drafts that have not started yet are dropped.
+            executor.shutdown(wait=True, cancel_futures=True)
+            close = getattr(self.sender, "close", None)
+            if callable(close):
+                close()
         
         if successful_sends == 0 and drafts:
             raise RuntimeError("Layer 4 generated drafts but failed to send any emails.")
@@ -87,15 +101,31 @@ class WeeklyEmailPipeline:
         )
         return drafts
 
+    def _build_draft(self, note: WeeklyPulseNote) -> EmailDraft:
+        subject, body = self.draft_generator.generate(note)
+        return EmailDraft(
+            subject=subject,
+            body=body,
+            recipient=self.config.email_recipient,
+            week_start=note.week_start,
+            week_end=note.week_end,
+            product_name=self.config.product_name,
+        )
+
     def _load_notes(self) -> List[WeeklyPulseNote]:
         if not self.pulses_dir.exists():
             LOGGER.warning("Pulse directory %s does not exist.", self.pulses_dir)
             return []
         notes: List[WeeklyPulseNote] = []
-        for json_file in sorted(self.pulses_dir.glob("pulse_*.json")):
+        files = sorted(self.pulses_dir.glob("pulse_*.json"))
+        if not files:
+            return notes
+        # Reads overlap on a small pool; parsing (CPU-bound) stays on this thread.
+        with ThreadPoolExecutor(max_workers=min(NOTE_READ_WORKERS, len(files))) as executor:
+            reads = [executor.submit(json_file.read_bytes) for json_file in files]
+        for json_file, read in zip(files, reads):
             try:
-                with json_file.open("r", encoding="utf-8") as fh:
-                    payload = json.load(fh)
+                payload = orjson.loads(read.result())
                 note = WeeklyPulseNote(
                     week_start=payload["week_start"],
                     week_end=payload["week_end"],
@@ -112,8 +142,6 @@ class WeeklyEmailPipeline:
 
     @staticmethod
     def _select_latest_note(notes: List[WeeklyPulseNote]) -> WeeklyPulseNote:
-        from datetime import datetime
-
         def _parse(date_str: str) -> datetime:
             try:
                 return datetime.fromisoformat(date_str)
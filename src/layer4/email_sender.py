@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-import csv
 import logging
 import smtplib
 import base64
 from datetime import datetime, timezone
+from email.header import Header
 from email.message import EmailMessage
+from email.utils import formataddr, getaddresses
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Dict, List, Optional, Sequence
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -22,6 +24,75 @@ from .email_models import EmailDraft, EmailLogEntry
 LOGGER = logging.getLogger(__name__)
 
 GMAIL_SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
+LOG_HEADER = ("timestamp", "week_start", "week_end", "recipient", "subject", "status", "transport")
+_CSV_SPECIAL = frozenset(',"\r\n')
+GMAIL_BATCH_SIZE = 50  # Gmail caps batch requests at 100 calls and advises at most 50
+
+
+@lru_cache(maxsize=4)
+def _build_gmail_service(credentials_location: str, token_location: str):
+    """Authorized Gmail API client, built once per (credentials, token) pair and shared by
+    every EmailSender in the process. Failures are not cached, so the next call retries;
+    the client's credentials refresh themselves when the access token expires."""
+    creds = None
+    token_path = Path(token_location)
+    credentials_path = Path(credentials_location)
+
+    # Check if credentials file exists
+    if not credentials_path.exists():
+        raise RuntimeError(
+            f"Gmail credentials file not found at {credentials_path}. "
+            f"Please ensure GMAIL_CREDENTIALS_PATH is set or GMAIL_CREDENTIALS_JSON is provided."
+        )
+
+    # Try to load existing token (stat'ed once; the error path below reuses the result)
+    token_exists = token_path.exists()
+    if token_exists:
+        try:
+            creds = Credentials.from_authorized_user_file(str(token_path), GMAIL_SCOPES)
+        except Exception as exc:
+            LOGGER.warning("Failed to load existing Gmail token: %s", exc)
+
+    # Refresh or create new credentials
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            try:
+                LOGGER.info("Refreshing expired Gmail token...")
+                creds.refresh(Request())
+                LOGGER.info("Gmail token refreshed successfully.")
+            except Exception as exc:
+                raise RuntimeError(
+                    f"Failed to refresh expired Gmail token: {exc}. "
+                    f"Token may need to be regenerated. In CI/CD, ensure GMAIL_TOKEN_JSON secret is up to date."
+                ) from exc
+        else:
+            # Interactive OAuth flow (not suitable for CI/CD)
+            if not token_exists:
+                raise RuntimeError(
+                    f"Gmail token file not found at {token_path} and cannot perform interactive OAuth flow in CI/CD. "
+                    f"Please provide GMAIL_TOKEN_JSON secret or generate token manually."
+                )
+            else:
+                raise RuntimeError(
+                    f"Gmail credentials are invalid and token refresh failed. "
+                    f"Please regenerate GMAIL_TOKEN_JSON secret."
+                )
+
+    # Save refreshed token
+    if not creds.valid:
+        raise RuntimeError("Gmail credentials are not valid after refresh attempt.")
+    
+    token_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with token_path.open("w", encoding="utf-8") as token_file:
+            token_file.write(creds.to_json())
+    except Exception as exc:
+        LOGGER.warning("Failed to save refreshed token: %s", exc)
+
+    try:
+        return build("gmail", "v1", credentials=creds, cache_discovery=False)
+    except Exception as exc:
+        raise RuntimeError(f"Failed to build Gmail service: {exc}") from exc
 
 
 class EmailSender:
@@ -30,6 +101,8 @@ class EmailSender:
     def __init__(self, config: Layer4Config) -> None:
         self.config = config
         self._gmail_service = None
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._log_fh: Optional[BinaryIO] = None
 
     def send(self, draft: EmailDraft) -> EmailLogEntry:
         timestamp = datetime.now(timezone.utc)
@@ -43,6 +116,51 @@ class EmailSender:
                 self._send_via_smtp(draft)
             status = "sent"
 
+        return self._log_send(draft, timestamp, status)
+
+    def send_batch(self, drafts: List[EmailDraft]) -> List[EmailLogEntry]:
+        """Send several drafts; over the Gmail API they go out as batched HTTP requests
+        (one round trip per GMAIL_BATCH_SIZE messages) instead of one request each.
+
+        Every message is attempted; a RuntimeError naming the failed weeks is raised
+        afterwards if any send failed. Dry runs and SMTP go through ``send`` per draft.
+        """
+        if self.config.dry_run or self.config.transport.lower() != "gmail":
+            return [self.send(draft) for draft in drafts]
+
+        service = self._get_gmail_service()
+        if service is None:
+            raise RuntimeError("Unable to initialize Gmail service.")
+
+        timestamp = datetime.now(timezone.utc)
+        failures: Dict[str, Exception] = {}
+
+        def _on_sent(request_id: str, _response, exception: Exception | None) -> None:
+            if exception is not None:
+                failures[request_id] = exception
+
+        for start in range(0, len(drafts), GMAIL_BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=_on_sent)
+            for index in range(start, min(start + GMAIL_BATCH_SIZE, len(drafts))):
+                body = {"raw": self._gmail_raw_message(drafts[index])}
+                batch.add(service.users().messages().send(userId="me", body=body), request_id=str(index))
+            batch.execute()
+
+        entries: List[EmailLogEntry] = []
+        failed_weeks: List[str] = []
+        for index, draft in enumerate(drafts):
+            exc = failures.get(str(index))
+            if exc is not None:
+                LOGGER.error("Gmail batch send failed for week %s-%s: %s", draft.week_start, draft.week_end, exc)
+                failed_weeks.append(f"{draft.week_start}-{draft.week_end}")
+                continue
+            LOGGER.info("Email sent to %s via Gmail API (batched).", draft.recipient)
+            entries.append(self._log_send(draft, timestamp, "sent"))
+        if failed_weeks:
+            raise RuntimeError(f"Failed to send email for week(s) {', '.join(failed_weeks)} via Gmail API.")
+        return entries
+
+    def _log_send(self, draft: EmailDraft, timestamp: datetime, status: str) -> EmailLogEntry:
         entry = EmailLogEntry(
             timestamp=timestamp,
             week_start=draft.week_start,
@@ -62,105 +180,113 @@ class EmailSender:
         msg["Subject"] = draft.subject
         msg.set_content(draft.body)
 
-        with smtplib.SMTP(self.config.smtp_host, self.config.smtp_port) as server:
+        self._get_smtp().send_message(msg)
+        LOGGER.info("Email sent to %s via SMTP.", draft.recipient)
+
+    def _get_smtp(self) -> smtplib.SMTP:
+        """SMTP connection shared by this sender's sends; connects (STARTTLS, login) on
+        first use and again if the server has dropped the previous connection."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close()
+
+        server = smtplib.SMTP(self.config.smtp_host, self.config.smtp_port)
+        try:
             if self.config.smtp_use_tls:
                 server.starttls()
             if self.config.smtp_user and self.config.smtp_password:
                 server.login(self.config.smtp_user, self.config.smtp_password)
-            server.send_message(msg)
-        LOGGER.info("Email sent to %s via SMTP.", draft.recipient)
+        except Exception:
+            server.close()
+            raise
+        self._smtp = server
+        return server
+
+    def close(self) -> None:
+        """Release the shared SMTP connection and the send log, if open."""
+        log_fh, self._log_fh = self._log_fh, None
+        if log_fh is not None:
+            log_fh.close()
+        server, self._smtp = self._smtp, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
 
     def _send_via_gmail(self, draft: EmailDraft) -> None:
         service = self._get_gmail_service()
         if service is None:
             raise RuntimeError("Unable to initialize Gmail service.")
 
-        message = EmailMessage()
-        message["From"] = self.config.email_sender or self.config.gmail_user
-        message["To"] = draft.recipient
-        message["Subject"] = draft.subject
-        message.set_content(draft.body)
-
-        encoded_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
-
+        encoded_message = self._gmail_raw_message(draft)
         service.users().messages().send(userId="me", body={"raw": encoded_message}).execute()
         LOGGER.info("Email sent to %s via Gmail API.", draft.recipient)
 
-    def _get_gmail_service(self):
-        if self._gmail_service is not None:
-            return self._gmail_service
-
-        creds = None
-        token_path = self.config.gmail_token_path
-        credentials_path = self.config.gmail_credentials_path
-
-        # Check if credentials file exists
-        if not credentials_path.exists():
-            raise RuntimeError(
-                f"Gmail credentials file not found at {credentials_path}. "
-                f"Please ensure GMAIL_CREDENTIALS_PATH is set or GMAIL_CREDENTIALS_JSON is provided."
-            )
+    def _gmail_raw_message(self, draft: EmailDraft) -> str:
+        """The draft as a base64url-encoded RFC 2822 message, as the Gmail API expects.
 
-        # Try to load existing token
-        if token_path.exists():
-            try:
-                creds = Credentials.from_authorized_user_file(str(token_path), GMAIL_SCOPES)
-            except Exception as exc:
-                LOGGER.warning("Failed to load existing Gmail token: %s", exc)
-
-        # Refresh or create new credentials
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                try:
-                    LOGGER.info("Refreshing expired Gmail token...")
-                    creds.refresh(Request())
-                    LOGGER.info("Gmail token refreshed successfully.")
-                except Exception as exc:
-                    raise RuntimeError(
-                        f"Failed to refresh expired Gmail token: {exc}. "
-                        f"Token may need to be regenerated. In CI/CD, ensure GMAIL_TOKEN_JSON secret is up to date."
-                    ) from exc
+        Bodies are plain text, so the message bytes are assembled directly rather than
+        through EmailMessage and its generator: the body goes out base64-encoded
+        (safe for any UTF-8 text and line length), non-ASCII subjects and display names
+        RFC 2047-encoded.
+        """
+        headers = (
+            ("From", self.config.email_sender or self.config.gmail_user),
+            ("To", draft.recipient),
+            ("Subject", draft.subject),
+        )
+        lines = []
+        for name, value in headers:
+            if "\r" in value or "\n" in value:
+                raise ValueError(f"Header {name} contains a line break: {value!r}")
+            if value.isascii():
+                lines.append(f"{name}: {value}")
+                continue
+            if name == "Subject":
+                value = Header(value, "utf-8").encode(linesep="\r\n")
             else:
-                # Interactive OAuth flow (not suitable for CI/CD)
-                if not token_path.exists():
-                    raise RuntimeError(
-                        f"Gmail token file not found at {token_path} and cannot perform interactive OAuth flow in CI/CD. "
-                        f"Please provide GMAIL_TOKEN_JSON secret or generate token manually."
-                    )
-                else:
-                    raise RuntimeError(
-                        f"Gmail credentials are invalid and token refresh failed. "
-                        f"Please regenerate GMAIL_TOKEN_JSON secret."
-                    )
-
-        # Save refreshed token
-        if not creds.valid:
-            raise RuntimeError("Gmail credentials are not valid after refresh attempt.")
-        
-        token_path.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            with token_path.open("w", encoding="utf-8") as token_file:
-                token_file.write(creds.to_json())
-        except Exception as exc:
-            LOGGER.warning("Failed to save refreshed token: %s", exc)
+                # Only display names may be RFC 2047-encoded; the addresses stay bare.
+                value = ", ".join(formataddr(pair, charset="utf-8") for pair in getaddresses([value]))
+            lines.append(f"{name}: {value}")
+        lines += [
+            "MIME-Version: 1.0",
+            'Content-Type: text/plain; charset="utf-8"',
+            "Content-Transfer-Encoding: base64",
+        ]
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("ascii")
+        raw = head + base64.encodebytes(draft.body.encode("utf-8"))
+        return base64.urlsafe_b64encode(raw).decode("ascii")
 
-        try:
-            service = build("gmail", "v1", credentials=creds, cache_discovery=False)
-            self._gmail_service = service
-            return service
-        except Exception as exc:
-            raise RuntimeError(f"Failed to build Gmail service: {exc}") from exc
+    def _get_gmail_service(self):
+        if self._gmail_service is None:
+            self._gmail_service = _build_gmail_service(
+                str(self.config.gmail_credentials_path), str(self.config.gmail_token_path)
+            )
+        return self._gmail_service
 
-    def _append_log(self, entry: EmailLogEntry) -> None:
-        log_path: Path = self.config.log_path
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        is_new = not log_path.exists()
-        with log_path.open("a", newline="", encoding="utf-8") as fh:
-            writer = csv.writer(fh)
+    def _ensure_log(self) -> BinaryIO:
+        """Send log opened for binary append (and given its header if new) on first use
+        and kept open until ``close``."""
+        if self._log_fh is None:
+            log_path: Path = self.config.log_path
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            is_new = not log_path.exists()
+            self._log_fh = log_path.open("ab")
             if is_new:
-                writer.writerow(["timestamp", "week_start", "week_end", "recipient", "subject", "status", "transport"])
-            writer.writerow(
-                [
+                self._log_fh.write(_csv_row(LOG_HEADER))
+        return self._log_fh
+
+    def _append_log(self, entry: EmailLogEntry) -> None:
+        log_fh = self._ensure_log()
+        log_fh.write(
+            _csv_row(
+                (
                     entry.timestamp.isoformat(),
                     entry.week_start,
                     entry.week_end,
@@ -168,6 +294,20 @@ class EmailSender:
                     entry.subject,
                     entry.status,
                     entry.transport,
-                ]
+                )
             )
+        )
+        if self.config.log_flush_each_row:
+            log_fh.flush()
+
+
+def _csv_row(fields: Sequence[str]) -> bytes:
+    """One UTF-8 CSV line, quoted exactly as ``csv.writer``'s default (excel) dialect would."""
+    return (",".join(map(_csv_field, fields)) + "\r\n").encode("utf-8")
+
+
+def _csv_field(value: str) -> str:
+    if _CSV_SPECIAL.isdisjoint(value):
+        return value
+    return '"' + value.replace('"', '""') + '"'
 
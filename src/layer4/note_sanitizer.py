@@ -28,6 +28,12 @@ SENSITIVE_PATTERNS = [
     re.compile(r"\bthreat(en|ening)?\b", re.IGNORECASE),
 ]
 SENSITIVE_TOKEN = "[customer urgency noted]"
+# All phrases share one replacement token, so a single alternation rewrites them in
+# one pass; the words never overlap each other or the token, so the result is the
+# same as applying the patterns one after another.
+SENSITIVE_COMBINED = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern in SENSITIVE_PATTERNS), re.IGNORECASE
+)
 
 MONETARY_PATTERN = re.compile(r"(?:₹|rs\.?|inr|\$)\s*\d[\d,]*(?:\.\d+)?", re.IGNORECASE)
 PERCENT_PATTERN = re.compile(r"\b\d{1,3}%\b")
@@ -40,6 +46,9 @@ BLOCKED_QUOTE_PATTERNS = [
     re.compile(r"\b(?:lost|loss)\s+\d", re.IGNORECASE),
     re.compile(r"\b(?:deducted|debited)\s+\d", re.IGNORECASE),
 ]
+BLOCKED_QUOTE_COMBINED = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern in BLOCKED_QUOTE_PATTERNS), re.IGNORECASE
+)
 MAX_QUOTES = 3
 
 
@@ -73,9 +82,7 @@ def _sanitize_text(text: str) -> str:
     cleaned = clean_text(text)
     if not cleaned:
         return ""
-    sanitized = _aggressive_scrub(cleaned)
-    for pattern in SENSITIVE_PATTERNS:
-        sanitized = pattern.sub(SENSITIVE_TOKEN, sanitized)
+    sanitized = SENSITIVE_COMBINED.sub(SENSITIVE_TOKEN, _aggressive_scrub(cleaned))
     return sanitized.strip()
 
 
@@ -85,7 +92,7 @@ def _sanitize_quotes(quotes: List[str]) -> List[str]:
         sanitized = _sanitize_text(quote)
         if not sanitized:
             continue
-        if any(pattern.search(sanitized) for pattern in BLOCKED_QUOTE_PATTERNS):
+        if BLOCKED_QUOTE_COMBINED.search(sanitized):
             LOGGER.debug("Dropping quote for safety reasons: %s", sanitized[:80])
             continue
         sanitized_quotes.append(sanitized)
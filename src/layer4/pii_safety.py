@@ -17,11 +17,15 @@ PATTERNS = [
     ACCOUNT_PATTERN,
 ]
 
+# Presence check only: one alternation answers "does any pattern match" in a single search.
+# Masking keeps the ordered per-pattern passes, since the patterns overlap.
+ANY_PII_PATTERN: Pattern[str] = re.compile("|".join(f"(?:{pattern.pattern})" for pattern in PATTERNS))
+
 MASK_TOKEN = "***"
 
 
 def contains_pii(text: str) -> bool:
-    return any(pattern.search(text) for pattern in PATTERNS)
+    return ANY_PII_PATTERN.search(text) is not None
 
 
 def mask_pii(text: str) -> str:
@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import sys
 
@@ -6,8 +6,8 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.layer1.scraper import GrowwReviewScraper, ScraperConfig
-from src.layer1.validator import validate_reviews
+from src.layer1.scraper import GrowwReviewScraper, ReviewRecord, ScraperConfig, compute_weekly_buckets
+from src.layer1.validator import ValidationSummary, iter_validated_reviews, validate_reviews
 from src.layer1.pii_detector import PIIDetector
 from src.layer1.deduplicator import DeduplicationConfig, deduplicate_reviews
 
@@ -49,3 +49,110 @@ def test_layer1_pipeline_from_fixture(tmp_path):
     deduped, dedup_summary = deduplicate_reviews(cleaned_models, DeduplicationConfig())
     assert dedup_summary.dropped == 1
     assert len(deduped) == 3
+
+
+def test_iter_validated_reviews_streams_and_counts():
+    now = datetime(2025, 11, 20, tzinfo=timezone.utc)
+    records = [
+        ReviewRecord(review_id="r1", title="Good", text="Works well", rating=5, date=now),
+        ReviewRecord(review_id="r2", title="", text="   ", rating=3, date=now),
+        ReviewRecord(review_id="r3", title="", text="Too many charges", rating=9, date=now),
+        ReviewRecord(review_id="r4", title="", text="Crashes on login", rating=1, date=now),
+    ]
+    summary = ValidationSummary(total=0, accepted=0, rejected=0)
+
+    stream = iter_validated_reviews(records, summary)
+    assert summary.total == 0  # nothing consumed yet
+
+    accepted = [model.review_id for model in stream]
+    assert accepted == ["r1", "r4"]
+    assert (summary.total, summary.accepted, summary.rejected) == (4, 2, 2)
+
+
+def test_review_record_is_slotted():
+    # Multi-window backfills hold many records at once; keep them free of a per-instance __dict__.
+    record = ReviewRecord(
+        review_id="r1", title="", text="Works well", rating=5, date=datetime(2025, 11, 20, tzinfo=timezone.utc)
+    )
+    assert not hasattr(record, "__dict__")
+
+
+def test_fetch_reviews_fans_out_per_rating_stream(tmp_path, monkeypatch):
+    from src.layer1.scraper import FetchStats, PlayStoreReviewFetcher
+
+    config = ScraperConfig(
+        app_id="com.nextbillion.groww",
+        per_rating_target=1,
+        output_dir=tmp_path / "raw",
+        weekly_output_dir=tmp_path / "weekly",
+        enable_rating_filters=True,
+        rating_filter_order=(5, 1),
+    )
+    scraper = GrowwReviewScraper(config)
+    day = datetime(2025, 11, 18, tzinfo=timezone.utc)
+    calls = []
+    sessions = {}
+
+    def fake_fetch(self, window_start, window_end, sort_mode=None, rating_filter=None):
+        calls.append(rating_filter)
+        sessions[rating_filter] = self._session
+        record = ReviewRecord(
+            review_id=f"r{rating_filter}", title="", text="Some review text", rating=rating_filter, date=day
+        )
+        return FetchStats([record], {}, sort_mode or "newest")
+
+    monkeypatch.setattr(PlayStoreReviewFetcher, "fetch", fake_fetch)
+    records = scraper.fetch_reviews(start_date=day - timedelta(days=3), end_date=day)
+
+    assert sorted(calls) == [1, 5]
+    assert {record.review_id for record in records} == {"r1", "r5"}
+    # Each rating stream paginates over its own HTTP session.
+    assert sessions[1] is not sessions[5]
+
+
+def test_fetch_stops_paging_once_newest_sort_passes_window_start(tmp_path):
+    from src.layer1.scraper import PlayStoreReviewFetcher
+
+    config = ScraperConfig(
+        app_id="com.nextbillion.groww",
+        per_rating_target=50,
+        output_dir=tmp_path / "raw",
+        weekly_output_dir=tmp_path / "weekly",
+        sort_mode="newest",
+    )
+    fetcher = PlayStoreReviewFetcher(config)
+    window_end = datetime(2025, 11, 24, tzinfo=timezone.utc)
+    window_start = window_end - timedelta(days=7)
+    calls = []
+
+    def fake_page(sort_code, count, rating_filter, page_token):
+        page = len(calls)
+        calls.append(page_token)
+        day = window_end - timedelta(days=8 * page + 1)
+        record = ReviewRecord(review_id=f"p{page}", title="", text="Some review text", rating=4, date=day)
+        return [record], f"token-{page + 1}"
+
+    fetcher._fetch_page = fake_page
+    stats = fetcher.fetch(window_start, window_end)
+
+    assert len(calls) == 2  # the second page already predates window_start
+    assert [record.review_id for record in stats.records] == ["p0"]
+
+
+def test_compute_weekly_buckets_matches_week_bucket():
+    base = datetime(2025, 11, 2, 23, 30, tzinfo=timezone.utc)  # a Sunday
+    records = [
+        ReviewRecord(review_id=f"r{i}", title="", text="Some review text", rating=3, date=base + timedelta(days=i))
+        for i in (9, 1, 0, 8, 2)
+    ]
+
+    buckets = compute_weekly_buckets(records)
+
+    assert buckets == [
+        {"week_start": "2025-11-10", "week_end": "2025-11-16", "review_ids": ["r9", "r8"]},
+        {"week_start": "2025-11-03", "week_end": "2025-11-09", "review_ids": ["r1", "r2"]},
+        {"week_start": "2025-10-27", "week_end": "2025-11-02", "review_ids": ["r0"]},
+    ]
+    for record in records:
+        week_start, _ = record.week_bucket()
+        assert any(b["week_start"] == week_start.date().isoformat() and record.review_id in b["review_ids"] for b in buckets)
@@ -4,6 +4,7 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 import json
+import re
 import sys
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -258,6 +259,116 @@ class TestGeminiThemeClassifier:
         # Should have been called twice (2 batches)
         assert mock_gemini_model.generate_content.call_count == 2
 
+    @patch("src.layer2.theme_classifier.genai")
+    def test_classify_reviews_concurrent_batches_keep_order(self, mock_genai, mock_gemini_model):
+        """Test that concurrent batch dispatch returns results in review order."""
+        reviews = [
+            ReviewModel(
+                review_id=f"review-{i}",
+                title=f"Review {i}",
+                text=f"Review text {i}",
+                rating=3,
+                date=datetime.now(timezone.utc),
+            )
+            for i in range(20)
+        ]
+
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.return_value = mock_gemini_model
+
+        def mock_response_side_effect(prompt, **kwargs):
+            # Echo back every review_id present in this batch's prompt
+            ids = [line.split(": ", 1)[1] for line in prompt.splitlines() if line.startswith("review_id: ")]
+            mock_resp = Mock()
+            mock_resp.text = json.dumps(
+                [{"review_id": rid, "chosen_theme": "glitches", "short_reason": "Test"} for rid in ids]
+            )
+            return mock_resp
+
+        mock_gemini_model.generate_content.side_effect = mock_response_side_effect
+
+        config = ThemeClassifierConfig(batch_size=4, max_concurrency=3)
+        classifier = GeminiThemeClassifier(api_key="test-key", config=config)
+
+        classifications = classifier.classify_reviews(reviews)
+
+        assert [c.review_id for c in classifications] == [r.review_id for r in reviews]
+        assert mock_gemini_model.generate_content.call_count == 5
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_classify_reviews_async_batches_keep_order(self, mock_genai, mock_gemini_model):
+        """With use_async, batches are gathered on an event loop and results keep batch order."""
+        from unittest.mock import AsyncMock
+
+        reviews = [
+            ReviewModel(
+                review_id=f"review-{i}",
+                title=f"Review {i}",
+                text=f"Review text {i}",
+                rating=3,
+                date=datetime.now(timezone.utc),
+            )
+            for i in range(10)
+        ]
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.return_value = mock_gemini_model
+
+        async def respond(prompt, **kwargs):
+            ids = [line.split(": ", 1)[1] for line in prompt.splitlines() if line.startswith("review_id: ")]
+            return Mock(text=json.dumps([{"review_id": rid, "chosen_theme": "fees", "short_reason": "Test"} for rid in ids]))
+
+        mock_gemini_model.generate_content_async = AsyncMock(side_effect=respond)
+        config = ThemeClassifierConfig(batch_size=3, max_concurrency=4, use_async=True)
+        classifier = GeminiThemeClassifier(api_key="test-key", config=config)
+
+        classifications = classifier.classify_reviews(reviews)
+
+        assert [c.review_id for c in classifications] == [r.review_id for r in reviews]
+        assert mock_gemini_model.generate_content_async.await_count == 4
+        assert mock_gemini_model.generate_content.call_count == 0
+
+    @patch("src.layer2.theme_classifier.google_genai")
+    @patch("src.layer2.theme_classifier.genai")
+    def test_classify_reviews_batch_mode_submits_one_job(self, mock_genai, mock_google_genai, mock_gemini_model):
+        """batch_mode sends every batch in one Batch API job and maps responses back in order."""
+        reviews = [
+            ReviewModel(
+                review_id=f"review-{i}",
+                title=f"Review {i}",
+                text=f"Review text {i}",
+                rating=3,
+                date=datetime.now(timezone.utc),
+            )
+            for i in range(5)
+        ]
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.return_value = mock_gemini_model
+
+        def inline(ids):
+            payload = [{"review_id": rid, "chosen_theme": "fees", "short_reason": "Test"} for rid in ids]
+            return Mock(response=Mock(text=json.dumps(payload)), error=None)
+
+        running = Mock(state=Mock()); running.name = "batches/1"; running.state.name = "JOB_STATE_RUNNING"
+        done = Mock(state=Mock()); done.name = "batches/1"; done.state.name = "JOB_STATE_SUCCEEDED"
+        done.dest.inlined_responses = [
+            inline(["review-0", "review-1"]),
+            inline(["review-2", "review-3"]),
+            Mock(response=None, error="quota"),
+        ]
+        client = mock_google_genai.Client.return_value
+        client.batches.create.return_value = running
+        client.batches.get.return_value = done
+
+        config = ThemeClassifierConfig(batch_size=2, batch_mode=True, batch_poll_seconds=0)
+        classifier = GeminiThemeClassifier(api_key="test-key", config=config)
+        classifications = classifier.classify_reviews(reviews)
+
+        assert [c.review_id for c in classifications] == [r.review_id for r in reviews]
+        assert [c.theme_id for c in classifications[:4]] == ["fees"] * 4
+        first_job = client.batches.create.call_args_list[0]
+        assert len(first_job.kwargs["src"]) == 3
+        assert mock_gemini_model.generate_content.call_count == 0
+
     @patch("src.layer2.theme_classifier.genai")
     def test_classify_reviews_invalid_theme_fallback(self, mock_genai, sample_reviews):
         """Test that invalid theme IDs fallback to default."""
@@ -398,6 +509,528 @@ class TestGeminiThemeClassifier:
         # Should match to "glitches" via fuzzy matching
         assert classifications[0].theme_id == "glitches"
 
+    @patch("src.layer2.theme_classifier.genai")
+    def test_heuristic_prefilter_skips_llm_for_single_theme_hits(self, mock_genai, mock_gemini_model):
+        """Reviews whose keywords hit exactly one theme bypass the LLM; the rest keep their order."""
+        now = datetime.now(timezone.utc)
+        reviews = [
+            ReviewModel(review_id="r1", title="Hidden brokerage", text="Too much brokerage", rating=1, date=now),
+            ReviewModel(review_id="r2", title="Nice", text="Love the interface", rating=5, date=now),
+            ReviewModel(review_id="r3", title="Slow", text="App is slow and crashes", rating=2, date=now),
+        ]
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.return_value = mock_gemini_model
+        mock_gemini_model.generate_content.return_value = Mock(
+            text=json.dumps(
+                [
+                    {"review_id": "r2", "chosen_theme": "glitches", "short_reason": "Test"},
+                    {"review_id": "r3", "chosen_theme": "slow", "short_reason": "Test"},
+                ]
+            )
+        )
+
+        classifier = GeminiThemeClassifier(
+            api_key="test-key", config=ThemeClassifierConfig(heuristic_prefilter=True)
+        )
+        classifications = classifier.classify_reviews(reviews)
+
+        assert [c.review_id for c in classifications] == ["r1", "r2", "r3"]
+        assert classifications[0].theme_id == "fees"
+        assert classifications[0].reason == "High-confidence keyword match"
+        assert mock_gemini_model.generate_content.call_count == 1
+        prompt = mock_gemini_model.generate_content.call_args.args[0]
+        assert "review_id: r1" not in prompt and "review_id: r3" in prompt
+
+    def test_request_pacer_spaces_reservations(self):
+        """Each reservation starts one interval after the previous; 0 rpm never waits."""
+        from src.layer2.theme_classifier import _RequestPacer
+
+        pacer = _RequestPacer(requests_per_minute=60)
+        waits = [pacer.reserve() for _ in range(3)]
+        assert waits[0] == 0.0
+        assert waits[1] == pytest.approx(1.0, abs=0.05)
+        assert waits[2] == pytest.approx(2.0, abs=0.05)
+        assert _RequestPacer(requests_per_minute=0).reserve() == 0.0
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_quota_errors_trip_breaker_and_fall_back_model(self, mock_genai):
+        """Repeated quota errors pause requests and move on to the next candidate model."""
+        mock_genai.configure = Mock()
+        classifier = GeminiThemeClassifier(
+            api_key="test-key", config=ThemeClassifierConfig(model_fallback_after=4, max_retries=5)
+        )
+        first_model = classifier.model_name
+        quota_error = Exception("429 quota exceeded")
+
+        for attempt in range(2):
+            delay = classifier._retry_delay(attempt, quota_error, "Classification")
+            assert 0 <= delay <= 30 * (2 ** attempt)
+        assert classifier._breaker_for(first_model).remaining() == 0
+
+        classifier._retry_delay(2, quota_error, "Classification")
+        assert classifier._breaker_for(first_model).remaining() > 0  # third in a row opens the breaker
+        assert classifier.model_name == first_model
+
+        classifier._retry_delay(3, quota_error, "Classification")
+        assert classifier.model_name != first_model
+        assert classifier._request_wait() == 0  # the new primary has its own, closed breaker
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_quota_errors_on_extra_model_keep_the_primary(self, mock_genai, sample_reviews):
+        """429s from an extra pool model open only that model's breaker; the primary stays."""
+        models = {}
+
+        def make_model(name):
+            model = Mock()
+            model.generate_content.return_value = Mock(
+                text=json.dumps([{"review_id": sample_reviews[0].review_id, "chosen_theme": "slow", "short_reason": name}])
+            )
+            models[name] = model
+            return model
+
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.side_effect = make_model
+        classifier = GeminiThemeClassifier(
+            api_key="test-key",
+            config=ThemeClassifierConfig(
+                parallel_models=("models/gemini-2.0-flash",),
+                model_fallback_after=2,
+                max_retries=1,
+                requests_per_minute=0,
+            ),
+        )
+        primary = classifier.model_name
+        models["models/gemini-2.0-flash"].generate_content.side_effect = Exception("429 quota exceeded")
+
+        with patch("src.layer2.theme_classifier.time.sleep"):
+            for _ in range(4):
+                results = classifier._classify_pass(
+                    sample_reviews[:1], classifier._classification_prefix, "Classification", slot=1
+                )
+                assert results[0].reason == primary  # retried on the primary
+
+        assert classifier.model_name == primary
+        assert classifier._request_wait() == 0
+        assert classifier._breaker_for("models/gemini-2.0-flash").remaining() > 0
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_breakers_are_kept_per_model(self, mock_genai, sample_reviews):
+        """A success on one model neither closes nor shares another model's breaker."""
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.side_effect = lambda name: Mock()
+        classifier = GeminiThemeClassifier(
+            api_key="test-key",
+            config=ThemeClassifierConfig(parallel_models=("models/gemini-2.0-flash",), requests_per_minute=0),
+        )
+        extra = classifier._extra_models[0]
+        for _ in range(3):
+            classifier._breaker_for("models/gemini-2.0-flash").record_failure()
+        assert classifier._request_wait(extra) > 0
+        assert classifier._request_wait() == 0
+
+        reply = [{"review_id": sample_reviews[0].review_id, "chosen_theme": "slow", "short_reason": "Lag"}]
+        classifier._accept_items(reply, sample_reviews[:1], "Classification")
+        assert classifier._request_wait(extra) > 0
+        classifier._accept_items(reply, sample_reviews[:1], "Classification", model=extra)
+        assert classifier._request_wait(extra) == 0
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_empty_text_reviews_skip_the_llm(self, mock_genai, mock_gemini_model):
+        """Reviews left blank (e.g. after sanitisation) get the default theme with no request."""
+        now = datetime.now(timezone.utc)
+        kept = ReviewModel(review_id="r1", title="Slow", text="App is slow", rating=2, date=now)
+        blank = kept.model_copy(update={"review_id": "r2", "text": "   "})
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.return_value = mock_gemini_model
+        mock_gemini_model.generate_content.return_value = Mock(
+            text=json.dumps([{"review_id": "r1", "chosen_theme": "slow", "short_reason": "Test"}])
+        )
+
+        classifier = GeminiThemeClassifier(api_key="test-key")
+        classifications = classifier.classify_reviews([blank, kept])
+
+        assert [(c.review_id, c.theme_id) for c in classifications] == [("r2", DEFAULT_THEME_ID), ("r1", "slow")]
+        assert classifications[0].reason == "Empty text"
+        assert mock_gemini_model.generate_content.call_count == 1
+        assert "review_id: r2" not in mock_gemini_model.generate_content.call_args.args[0]
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_classification_cache_skips_llm_on_rerun(self, mock_genai, mock_gemini_model, tmp_path):
+        """Reviews classified in an earlier run are served from the persisted cache."""
+        now = datetime.now(timezone.utc)
+        reviews = [
+            ReviewModel(review_id="r1", title="Slow", text="App is slow", rating=2, date=now),
+            ReviewModel(review_id="r2", title="Fees", text="Too many charges", rating=1, date=now),
+        ]
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.return_value = mock_gemini_model
+        mock_gemini_model.generate_content.return_value = Mock(
+            text=json.dumps(
+                [
+                    {"review_id": "r1", "chosen_theme": "slow", "short_reason": "Slow app"},
+                    {"review_id": "r2", "chosen_theme": "fees", "short_reason": "Charges"},
+                ]
+            )
+        )
+        config = ThemeClassifierConfig(cache_path=str(tmp_path / "cache.json"))
+
+        first = GeminiThemeClassifier(api_key="test-key", config=config).classify_reviews(reviews)
+        assert mock_gemini_model.generate_content.call_count == 1
+
+        second = GeminiThemeClassifier(api_key="test-key", config=config).classify_reviews(reviews)
+        assert mock_gemini_model.generate_content.call_count == 1
+        assert second == first
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_response_cache_replays_replies_on_rerun(self, mock_genai, mock_gemini_model, tmp_path):
+        """Replies are stored by (model, prompt), so a rerun repeats neither pass."""
+        now = datetime.now(timezone.utc)
+        reviews = [ReviewModel(review_id="r1", title="", text="Nice colours", rating=4, date=now)]
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.return_value = mock_gemini_model
+        mock_gemini_model.model_name = "models/test"
+        mock_gemini_model.generate_content.return_value = Mock(
+            text=json.dumps([{"review_id": "r1", "chosen_theme": DEFAULT_THEME_ID, "short_reason": "Vague"}])
+        )
+        config = ThemeClassifierConfig(response_cache_path=str(tmp_path / "replies.sqlite"))
+
+        classifier = GeminiThemeClassifier(api_key="test-key", config=config)
+        first = classifier.classify_reviews(reviews)
+        assert mock_gemini_model.generate_content.call_count == 2  # both passes
+        classifier.close()
+        classifier.close()  # idempotent
+        assert classifier._response_cache is None
+
+        classifier = GeminiThemeClassifier(api_key="test-key", config=config)
+        second = classifier.classify_reviews(reviews)
+        classifier.close()
+        assert mock_gemini_model.generate_content.call_count == 2
+        assert second == first
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_semantic_cache_shares_results_between_near_duplicates(self, mock_genai, mock_gemini_model):
+        """Near-duplicate reviews (by embedding) reuse one LLM classification."""
+        import numpy as np
+
+        vectors = {"r1": [1.0, 0.0], "r2": [0.0, 1.0], "r3": [0.99, 0.05], "r4": [0.98, 0.02]}
+
+        class FakeEmbedder:
+            def embed_reviews(self, reviews):
+                return Mock(
+                    review_ids=[r.review_id for r in reviews],
+                    vectors=np.array([vectors[r.review_id] for r in reviews]),
+                )
+
+        now = datetime.now(timezone.utc)
+        texts = {"r1": "App is slow", "r2": "Too many charges", "r3": "So slow app", "r4": "Slow app!!"}
+        reviews = [
+            ReviewModel(review_id=rid, title="", text=texts[rid], rating=2, date=now) for rid in ("r1", "r2", "r3")
+        ]
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.return_value = mock_gemini_model
+        mock_gemini_model.generate_content.return_value = Mock(
+            text=json.dumps(
+                [
+                    {"review_id": "r1", "chosen_theme": "slow", "short_reason": "Slow app"},
+                    {"review_id": "r2", "chosen_theme": "fees", "short_reason": "Charges"},
+                ]
+            )
+        )
+
+        classifier = GeminiThemeClassifier(api_key="test-key", embedder=FakeEmbedder())
+        classifications = classifier.classify_reviews(reviews)
+
+        assert [(c.review_id, c.theme_id) for c in classifications] == [("r1", "slow"), ("r2", "fees"), ("r3", "slow")]
+        assert "review_id: r3" not in mock_gemini_model.generate_content.call_args.args[0]
+
+        later = classifier.classify_reviews(
+            [ReviewModel(review_id="r4", title="", text=texts["r4"], rating=2, date=now)]
+        )
+        assert [(c.review_id, c.theme_id) for c in later] == [("r4", "slow")]
+        assert mock_gemini_model.generate_content.call_count == 1
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_heuristic_backstop_shrinks_second_pass(self, mock_genai, mock_gemini_model):
+        """First-pass "unclassified" reviews with a keyword hit skip the second LLM pass."""
+        now = datetime.now(timezone.utc)
+        reviews = [
+            ReviewModel(review_id="r1", title="", text="App is slow", rating=2, date=now),
+            ReviewModel(review_id="r2", title="", text="Love it", rating=5, date=now),
+        ]
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.return_value = mock_gemini_model
+        mock_gemini_model.generate_content.side_effect = [
+            Mock(
+                text=json.dumps(
+                    [
+                        {"review_id": "r1", "chosen_theme": "unclassified", "short_reason": "Test"},
+                        {"review_id": "r2", "chosen_theme": "unclassified", "short_reason": "Test"},
+                    ]
+                )
+            ),
+            Mock(text=json.dumps([{"review_id": "r2", "chosen_theme": "glitches", "short_reason": "Test"}])),
+        ]
+
+        classifier = GeminiThemeClassifier(api_key="test-key")
+        classifications = classifier.classify_reviews(reviews)
+
+        assert [(c.review_id, c.theme_id) for c in classifications] == [("r1", "slow"), ("r2", "glitches")]
+        assert mock_gemini_model.generate_content.call_count == 2
+        second_prompt = mock_gemini_model.generate_content.call_args.args[0]
+        assert "review_id: r1" not in second_prompt and "review_id: r2" in second_prompt
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_streamed_responses_parse_objects_across_chunks(self, mock_genai, mock_gemini_model):
+        """Streamed replies are split into objects as chunks arrive, whatever the chunk boundaries."""
+        now = datetime.now(timezone.utc)
+        reviews = [
+            ReviewModel(review_id="r1", title="", text="App is slow", rating=2, date=now),
+            ReviewModel(review_id="r2", title="", text="Too many charges", rating=1, date=now),
+        ]
+        payload = "```json\n" + json.dumps(
+            [
+                {"review_id": "r1", "chosen_theme": "slow", "short_reason": 'Says "slow {always}"'},
+                {"review_id": "r2", "chosen_theme": "fees", "short_reason": "Charges"},
+            ]
+        ) + "\n```"
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.return_value = mock_gemini_model
+        mock_gemini_model.generate_content.return_value = [
+            Mock(text=payload[i:i + 7]) for i in range(0, len(payload), 7)
+        ]
+
+        classifier = GeminiThemeClassifier(api_key="test-key", config=ThemeClassifierConfig(stream_responses=True))
+        classifications = classifier.classify_reviews(reviews)
+
+        assert [(c.review_id, c.theme_id) for c in classifications] == [("r1", "slow"), ("r2", "fees")]
+        assert classifications[0].reason == 'Says "slow {always}"'
+        assert mock_gemini_model.generate_content.call_args.kwargs["stream"] is True
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_reviews_omitted_from_reply_are_re_requested_once(self, mock_genai, mock_gemini_model):
+        """A review the batch reply leaves out is re-sent alone instead of going to the heuristics."""
+        now = datetime.now(timezone.utc)
+        reviews = [
+            ReviewModel(review_id="r1", title="", text="App is slow", rating=2, date=now),
+            ReviewModel(review_id="r2", title="", text="Nice colours", rating=5, date=now),
+        ]
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.return_value = mock_gemini_model
+        mock_gemini_model.generate_content.side_effect = [
+            Mock(text=json.dumps([{"review_id": "r1", "chosen_theme": "slow", "short_reason": "Slow"}])),
+            Mock(text=json.dumps([{"review_id": "r2", "chosen_theme": "ui_ux", "short_reason": "Looks"}])),
+        ]
+
+        classifier = GeminiThemeClassifier(api_key="test-key")
+        classifications = classifier.classify_reviews(reviews)
+
+        assert [(c.review_id, c.theme_id) for c in classifications] == [("r1", "slow"), ("r2", "ui_ux")]
+        retry_prompt = mock_gemini_model.generate_content.call_args_list[1].args[0]
+        assert "review_id: r2" in retry_prompt and "review_id: r1" not in retry_prompt
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_self_consistency_vote_settles_unclassified_reviews(self, mock_genai, mock_gemini_model):
+        """Reviews both passes leave unclassified are re-sampled and kept only on a strict majority."""
+        now = datetime.now(timezone.utc)
+        reviews = [
+            ReviewModel(review_id="r1", title="", text="Nice colours", rating=4, date=now),
+            ReviewModel(review_id="r2", title="", text="Meh", rating=3, date=now),
+        ]
+
+        def reply(r1_theme, r2_theme):
+            return Mock(text=json.dumps([
+                {"review_id": "r1", "chosen_theme": r1_theme, "short_reason": r1_theme},
+                {"review_id": "r2", "chosen_theme": r2_theme, "short_reason": r2_theme},
+            ]))
+
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.return_value = mock_gemini_model
+        mock_gemini_model.generate_content.side_effect = [
+            reply(DEFAULT_THEME_ID, DEFAULT_THEME_ID),  # first pass
+            reply(DEFAULT_THEME_ID, DEFAULT_THEME_ID),  # second pass
+            reply("ui_ux", "fees"),  # samples
+            reply("ui_ux", DEFAULT_THEME_ID),
+        ]
+
+        config = ThemeClassifierConfig(self_consistency_samples=2)
+        classifier = GeminiThemeClassifier(api_key="test-key", config=config)
+        classifications = classifier.classify_reviews(reviews)
+
+        assert [(c.review_id, c.theme_id) for c in classifications] == [("r1", "ui_ux"), ("r2", DEFAULT_THEME_ID)]
+        assert classifier.vote_stats == {"sampled": 2, "resolved": 1}
+        assert mock_gemini_model.generate_content.call_count == 4
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_batches_round_robin_across_parallel_models(self, mock_genai):
+        """Batches alternate between the primary and extra models; a 429 retries on the next one."""
+        now = datetime.now(timezone.utc)
+        reviews = [
+            ReviewModel(review_id=f"r{i}", title="", text="App is slow", rating=2, date=now) for i in range(3)
+        ]
+        models = {}
+
+        def make_model(name):
+            model = Mock()
+            model.generate_content.side_effect = lambda prompt, **kwargs: Mock(
+                text=json.dumps(
+                    [
+                        {"review_id": rid, "chosen_theme": "slow", "short_reason": name}
+                        for rid in ("r0", "r1", "r2")
+                        if f"review_id: {rid}" in prompt
+                    ]
+                )
+            )
+            models[name] = model
+            return model
+
+        mock_genai.configure = Mock()
+        mock_genai.GenerativeModel.side_effect = make_model
+        classifier = GeminiThemeClassifier(
+            api_key="test-key",
+            config=ThemeClassifierConfig(
+                batch_size=1, parallel_models=("models/gemini-2.0-flash",), requests_per_minute=6000
+            ),
+        )
+        primary = classifier.model_name
+        classifications = classifier.classify_reviews(reviews)
+
+        assert [c.reason for c in classifications] == [primary, "models/gemini-2.0-flash", primary]
+
+        models[primary].generate_content.side_effect = Exception("429 quota exceeded")
+        with patch("src.layer2.theme_classifier.time.sleep"):
+            retried = classifier._classify_pass(reviews[:1], classifier._classification_prefix, "Classification")
+        assert retried[0].reason == "models/gemini-2.0-flash"
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_make_batches_respects_prompt_char_budget(self, mock_genai):
+        """Batches split on batch_size or when formatted review text would exceed the budget."""
+        mock_genai.configure = Mock()
+        reviews = [
+            ReviewModel(
+                review_id=f"review-{i}",
+                title="Title",
+                text="x" * 600,  # truncated to ~400 chars in the prompt
+                rating=3,
+                date=datetime.now(timezone.utc),
+            )
+            for i in range(10)
+        ]
+
+        classifier = GeminiThemeClassifier(
+            api_key="test-key", config=ThemeClassifierConfig(batch_size=24, max_prompt_chars=1000)
+        )
+        batches = classifier._make_batches(reviews)
+        assert [r.review_id for batch in batches for r in batch] == [r.review_id for r in reviews]
+        assert [len(batch) for batch in batches] == [2, 2, 2, 2, 2]
+
+        classifier.config = ThemeClassifierConfig(batch_size=4)
+        assert [len(batch) for batch in classifier._make_batches(reviews)] == [4, 4, 2]
+
+    def test_review_preview_is_capped_by_utf8_size(self):
+        """Multi-byte text is cut on the byte budget, so it cannot outgrow ASCII previews in tokens."""
+        from src.layer2._fastpath import REVIEW_PREVIEW_BYTES, format_review_block
+
+        ascii_block = format_review_block("a", "", "x" * 1000)
+        emoji_block = format_review_block("e", "", "\U0001F621" * 1000)
+
+        assert ascii_block.endswith("x" * REVIEW_PREVIEW_BYTES + "...")
+        emoji_text = emoji_block.split("text: ", 1)[1]
+        assert emoji_text == "\U0001F621" * (REVIEW_PREVIEW_BYTES // 4) + "..."
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_generation_config_requests_structured_output(self, mock_genai):
+        """Gemini is asked for the classification schema, with an optional per-batch output cap."""
+        from src.layer2.theme_classifier import CLASSIFICATION_RESPONSE_SCHEMA
+
+        mock_genai.configure = Mock()
+        GeminiThemeClassifier(api_key="test-key")
+        kwargs = mock_genai.GenerationConfig.call_args.kwargs
+        assert kwargs["response_schema"] is CLASSIFICATION_RESPONSE_SCHEMA
+        assert kwargs["max_output_tokens"] is None
+
+        GeminiThemeClassifier(
+            api_key="test-key", config=ThemeClassifierConfig(batch_size=10, max_output_tokens_per_review=60)
+        )
+        assert mock_genai.GenerationConfig.call_args.kwargs["max_output_tokens"] == 600
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_parse_response_items_support_field_lookups(self, mock_genai):
+        """Typed and generic decoding both yield items readable with ``.get``."""
+        mock_genai.configure = Mock()
+        classifier = GeminiThemeClassifier(api_key="test-key")
+
+        array = classifier._parse_response(
+            '```json\n[{"review_id": "r1", "chosen_theme": "app_performance", "extra": 1}]\n```'
+        )
+        wrapped = classifier._parse_response('{"reviews": [{"review_id": "r2", "short_reason": null}]}')
+
+        assert array[0].get("review_id") == "r1"
+        assert array[0].get("chosen_theme", "") == "app_performance"
+        assert array[0].get("short_reason", "No reason provided") == "No reason provided"
+        assert wrapped[0].get("review_id") == "r2"
+        assert classifier._parse_response("not json") == []
+
+    @patch("src.layer2.theme_classifier.genai")
+    def test_prompt_prefix_is_compact_and_complete(self, mock_genai):
+        """The static prompt prefix lists every theme and stays within its size budget."""
+        mock_genai.configure = Mock()
+        classifier = GeminiThemeClassifier(api_key="test-key")
+
+        for prefix in (classifier._classification_prefix, classifier._unclassified_prefix):
+            assert len(prefix) < 1400  # was ~2,100 chars before compaction
+            assert "{" not in prefix.replace('{"review_id"', "")
+            for theme_id in FIXED_THEMES:
+                assert f"{theme_id}:" in prefix
+
+    @pytest.mark.parametrize("use_automaton", [True, False])
+    @patch("src.layer2.theme_classifier.genai")
+    def test_heuristic_theme_matches_per_pattern_scan(self, mock_genai, sample_reviews, use_automaton, monkeypatch):
+        """The single-pass heuristic scan keeps the per-theme priority order, with
+        and without the Aho-Corasick automaton."""
+        from src.layer2 import theme_classifier as tc
+        from src.layer2.theme_classifier import HEURISTIC_PATTERNS, _heuristic_hits
+
+        if use_automaton and tc.HEURISTIC_AUTOMATON is None:
+            pytest.skip("pyahocorasick not installed")
+        if not use_automaton:
+            monkeypatch.setattr(tc, "HEURISTIC_AUTOMATON", None)
+        mock_genai.configure = Mock()
+        classifier = GeminiThemeClassifier(api_key="test-key")
+        texts = [
+            ("Raised a ticket", "no reply from customer care"),
+            ("Charges", "Hidden charge on every trade"),
+            ("Slow", "App keeps loading forever"),
+            ("Great", "Love it"),
+            ("Very slow", "and the fees are high, support never helps"),
+        ]
+        for title, text in texts + [(r.title, r.text) for r in sample_reviews]:
+            review = ReviewModel(review_id="h", title=title, text=text, rating=3, date=sample_reviews[0].date)
+            lowered = f"{title} {text}".lower()
+            expected = next(
+                (
+                    theme_id
+                    for theme_id, patterns in HEURISTIC_PATTERNS.items()
+                    if any(pattern.search(lowered) for pattern in patterns)
+                ),
+                None,
+            )
+            assert classifier._heuristic_theme(review) == expected
+            assert _heuristic_hits(lowered) == [
+                theme_id
+                for theme_id, patterns in HEURISTIC_PATTERNS.items()
+                if any(pattern.search(lowered) for pattern in patterns)
+            ]
+
+    def test_theme_id_matcher_matches_ordered_scan(self):
+        """The precomputed matcher picks the same id as the ordered containment loop."""
+        from src.layer2.theme_classifier import _ThemeIdMatcher
+
+        ids = ["slow_app", "app", "fees_high", "kyc"]
+        matcher = _ThemeIdMatcher(ids)
+        for query in ["app", "slow", "my_slow_app_crash", "fees", "kyc_delay", "high_fees", "", "zzz"]:
+            expected = next((pos for pos, tid in enumerate(ids) if query in tid or tid in query), None)
+            assert matcher.match(query) == expected
+
 
 # ============================================================================
 # Weekly Aggregator Tests
@@ -511,6 +1144,26 @@ class TestWeeklyThemeAggregator:
         assert result.overall_counts["glitches"] == 1
         assert result.overall_counts["ui_ux"] == 1
 
+    def test_aggregate_accepts_columnar_batch(self, sample_reviews, weekly_dir_with_files):
+        """A ClassificationBatch aggregates like the list it was built from and round-trips."""
+        from src.layer2.theme_classifier import ClassificationBatch
+
+        themes = ["glitches", "ui_ux", "payments_statements", "customer_support", "glitches"]
+        classifications = [
+            ReviewClassification(review_id=r.review_id, theme_id=t, theme_name=t, reason="Test")
+            for r, t in zip(sample_reviews, themes)
+        ]
+        batch = ClassificationBatch.from_classifications(classifications)
+
+        aggregator = WeeklyThemeAggregator()
+        from_list = aggregator.aggregate(sample_reviews, classifications, weekly_dir_with_files)
+        from_batch = aggregator.aggregate(sample_reviews, batch, weekly_dir_with_files)
+
+        assert from_batch == from_list
+        assert from_batch.overall_counts["glitches"] == 2
+        assert batch.to_list() == classifications
+        assert len(ClassificationBatch.from_classifications([])) == 0
+
     def test_aggregate_missing_classifications(self, sample_reviews, weekly_dir_with_files):
         """Test aggregation when some reviews don't have classifications."""
         # Only classify 2 out of 5 reviews
@@ -610,6 +1263,110 @@ class TestWeeklyThemeAggregator:
         assert isinstance(data["top_themes"], list)
 
 
+# ============================================================================
+# Theme Mapper Tests
+# ============================================================================
+
+
+def _baseline_map_theme(predefined, discovered):
+    """Reference three-strategy mapping: one plain loop per strategy over raw word sets."""
+    stop_words = {
+        "the", "and", "for", "are", "but", "not", "you", "all", "can", "her", "was",
+        "one", "our", "out", "day", "get", "has", "him", "his", "how", "its", "may",
+        "new", "now", "old", "see", "two", "way", "who", "boy", "did", "she", "use",
+    }
+
+    def words_of(text):
+        return set(re.findall(r"\b\w{3,}\b", text.lower()))
+
+    def best_of(scores):
+        best = (None, 0.0)
+        for theme_id, score in scores:
+            if score > best[1]:
+                best = (theme_id, score)
+        return best
+
+    discovered_keywords = [kw.lower() for kw in discovered.keywords]
+    discovered_text = f"{discovered.theme_name} {discovered.description}"
+    keyword_words = words_of(discovered_text) | set(discovered_keywords)
+    discovered_name = discovered.theme_name.lower()
+    name_words = set(discovered_name.split())
+
+    def keyword_scores():
+        for theme_id, theme in predefined.items():
+            text = f"{theme.name} {theme.description}".lower()
+            predefined_keywords = set([w for w in re.findall(r"\b\w{3,}\b", text) if w not in stop_words][:10])
+            overlap = len(keyword_words & predefined_keywords)
+            if overlap:
+                score = overlap / max(len(keyword_words), len(predefined_keywords))
+                boost = sum(1 for kw in discovered_keywords if kw in predefined_keywords)
+                yield theme_id, min(1.0, score + boost * 0.1) if boost else score
+
+    def description_scores():
+        for theme_id, theme in predefined.items():
+            a, b = words_of(discovered_text), words_of(f"{theme.name} {theme.description}")
+            yield theme_id, len(a & b) / len(a | b) if a | b else 0.0
+
+    def name_scores():
+        for theme_id, theme in predefined.items():
+            predefined_name = theme.name.lower()
+            predefined_words = set(predefined_name.split())
+            overlap = len(name_words & predefined_words)
+            if overlap:
+                score = overlap / max(len(name_words), len(predefined_words))
+                if any(word in predefined_name for word in name_words):
+                    score = min(1.0, score + 0.2)
+                if any(word in discovered_name for word in predefined_words):
+                    score = min(1.0, score + 0.2)
+                yield theme_id, score
+
+    for scores, threshold in ((keyword_scores(), 0.7), (description_scores(), 0.6), (name_scores(), 0.5)):
+        match = best_of(scores)
+        if match[0] and match[1] > threshold:
+            return match
+    return None, 0.0
+
+
+MAPPER_THEMES = [
+    ("kw", "Support delays", "Slow customer support replies", ["support", "callbacks", "resolution"]),
+    ("verbatim", "Slow Performance", "Lag, loading delays, buffering, login slowness, and general performance complaints.", []),
+    ("jaccard", "Defects", "Functional defects and glitches, bugs, crashes, broken features", []),
+    ("name", "Fees and Charges", "Unexpected money taken", []),
+    ("partial", "Glitches", "The app crashes while placing an order", ["crash", "order"]),
+    ("upi", "UPI failures", "Autopay and UPI payments failing", ["upi", "autopay", "deposits"]),
+    ("none", "Dark mode", "Requests for a dark theme", ["dark", "theme"]),
+    ("empty", "", "", []),
+    ("unicode", "Café lag", "Ünïcode words and lag on the café screen", ["lag"]),
+]
+
+
+class TestThemeMapper:
+    """ThemeMapper's fused single-pass scoring against the per-strategy reference."""
+
+    @pytest.mark.parametrize("use_numba", [True, False])
+    def test_map_theme_matches_baseline_strategies(self, use_numba, monkeypatch):
+        from src.layer2 import theme_mapper as tm
+        from src.layer2.theme_discovery import DiscoveredTheme
+
+        if use_numba and tm.numba is None:
+            pytest.skip("numba not installed")
+        if not use_numba:
+            monkeypatch.setattr(tm, "numba", None)
+
+        predefined = {theme_id: theme for theme_id, theme in FIXED_THEMES.items() if theme_id != DEFAULT_THEME_ID}
+        mapper = tm.ThemeMapper(predefined)
+        mapped = set()
+        for theme_id, name, description, keywords in MAPPER_THEMES:
+            discovered = DiscoveredTheme(theme_id=theme_id, theme_name=name, description=description, keywords=keywords)
+            expected = _baseline_map_theme(predefined, discovered)
+            actual = mapper.map_theme(discovered)
+            assert actual[0] == expected[0], theme_id
+            assert actual[1] == pytest.approx(expected[1]), theme_id
+            mapped.add(actual[0])
+        # The fixed set reaches several predefined themes as well as no match at all.
+        assert None in mapped and len(mapped) >= 4
+
+
 # ============================================================================
 # Integration Tests
 # ============================================================================
@@ -1,6 +1,9 @@
 from pathlib import Path
 from datetime import datetime, timezone
 
+import base64
+import email
+import email.policy
 import json
 import sys
 
@@ -96,3 +99,90 @@ def test_email_sender_gmail(monkeypatch, tmp_path):
     sender.send(draft)
     assert called.get("called")
 
+
+
+def test_gmail_raw_message_round_trips_non_ascii_headers(tmp_path):
+    config = Layer4Config(
+        email_recipient="test@example.com",
+        email_sender="Grów Pulse <no-reply@example.com>",
+        dry_run=False,
+        transport="gmail",
+        log_path=tmp_path / "log.csv",
+        gmail_user="user@example.com",
+    )
+    draft = EmailDraft(
+        subject="Weekly Product Pulse – 2025-09-15",
+        body="Body – ₹ fees",
+        recipient="Équipe Produit <team@example.com>",
+        week_start="2025-09-15",
+        week_end="2025-09-21",
+        product_name="Groww App",
+    )
+    raw = base64.urlsafe_b64decode(EmailSender(config)._gmail_raw_message(draft))
+    assert raw.isascii()
+
+    message = email.message_from_bytes(raw, policy=email.policy.default)
+    sender = message["From"].addresses[0]
+    assert (sender.display_name, sender.addr_spec) == ("Grów Pulse", "no-reply@example.com")
+    recipient = message["To"].addresses[0]
+    assert (recipient.display_name, recipient.addr_spec) == ("Équipe Produit", "team@example.com")
+    assert message["Subject"] == draft.subject
+    assert message.get_content() == draft.body
+
+
+
+def test_email_sender_gmail_batch(monkeypatch, tmp_path):
+    config = Layer4Config(
+        email_recipient="test@example.com",
+        email_sender="no-reply@example.com",
+        dry_run=False,
+        transport="gmail",
+        log_path=tmp_path / "log.csv",
+        gmail_user="user@example.com",
+    )
+    sender = EmailSender(config)
+    batches = []
+
+    class FakeBatch:
+        def __init__(self, callback):
+            self.callback = callback
+            self.request_ids = []
+            batches.append(self)
+
+        def add(self, request, request_id):
+            self.request_ids.append(request_id)
+
+        def execute(self):
+            for request_id in self.request_ids:
+                self.callback(request_id, {"id": request_id}, None)
+
+    class FakeService:
+        def new_batch_http_request(self, callback):
+            return FakeBatch(callback)
+
+        def users(self):
+            return self
+
+        def messages(self):
+            return self
+
+        def send(self, userId, body):
+            return body
+
+    monkeypatch.setattr(sender, "_get_gmail_service", lambda: FakeService())
+    drafts = [
+        EmailDraft(
+            subject=f"Subject {idx}",
+            body="Body",
+            recipient="test@example.com",
+            week_start=f"2025-09-{15 + idx}",
+            week_end="2025-09-21",
+            product_name="Groww App",
+        )
+        for idx in range(3)
+    ]
+    entries = sender.send_batch(drafts)
+
+    assert len(batches) == 1
+    assert batches[0].request_ids == ["0", "1", "2"]
+    assert [entry.status for entry in entries] == ["sent"] * 3